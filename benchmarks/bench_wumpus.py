@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+Performance benchmarks for the Wumpus World subsystems.
+
+Times and records peak allocations for world construction, perception setup,
+sensing, knowledge updates, safe-move queries and full headless episodes over
+a range of world sizes with fixed seeds. Results are written as JSON and can
+be compared against a stored baseline to flag regressions.
+
+Examples:
+  python benchmarks/bench_wumpus.py                          # all sizes, print table
+  python benchmarks/bench_wumpus.py --sizes 4 16 --save-baseline benchmarks/baseline.json
+  python benchmarks/bench_wumpus.py --baseline benchmarks/baseline.json   # exit 1 on regression
+  python benchmarks/bench_wumpus.py --cases worker_startup --sizes 8      # cold-process cost
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from typing import Callable
+
+from wumpus.agent import Agent
+from wumpus.array_world import ArrayWorldManager
+from wumpus.cell import Cell
+from wumpus.game_controller import GameController
+from wumpus.knowledge_base import KnowledgeBase
+from wumpus.policy import LogicPolicy
+from wumpus.trace_log import unpack_percepts
+from wumpus.worldmanager import WorldManager
+
+SIZES = (4, 16, 64, 256, 1024)
+SEED = 1234
+QUIET = unpack_percepts(0)
+
+
+# Each case takes n and returns (setup, run): setup builds fresh state outside
+# the timed region, run(state) is the measured work.
+def case_world_construction(n):
+    return (lambda: None), (lambda _: WorldManager(n, SEED))
+
+
+def case_array_world_construction(n):
+    return (lambda: None), (lambda _: ArrayWorldManager(n, SEED))
+
+
+def case_setup_perceptions(n):
+    return (lambda: WorldManager(n, SEED)), (lambda world: world.setup_perceptions())
+
+
+def case_agent_sense(n):
+    def run(agent):
+        for _ in range(1000):
+            agent.sense()
+    return (lambda: Agent(n, SEED)), run
+
+
+def case_kb_update(n):
+    def run(kb):
+        for j in range(min(n, 64)):
+            kb.update_knowledge((0, j), QUIET)
+    return (lambda: KnowledgeBase(n)), run
+
+
+def case_get_safe_moves(n):
+    def setup():
+        kb = KnowledgeBase(n)
+        kb.update_knowledge((0, 0), QUIET)
+        return kb
+
+    def run(kb):
+        for _ in range(1000):
+            kb.get_safe_moves((0, 0), Agent.RIGHT)
+    return setup, run
+
+
+def case_episode(n):
+    return (lambda: GameController(n, SEED)), (lambda c: c.run_episode(LogicPolicy(), max_steps=200))
+
+
+def case_oracle_batch(n):
+    # Same number of cells per batch at every size, so timings compare
+    from wumpus.oracle import seed_planes, solve
+    count = max(1, 16384 // (n * n))
+    return (lambda: seed_planes(n, range(SEED, SEED + count))), solve
+
+
+def case_worker_startup(n):
+    # A fresh interpreter that imports the package and plays one game, as a
+    # short-lived worker process would; includes interpreter startup
+    script = ("from wumpus import GameController, LogicPolicy; "
+              f"GameController({n}, {SEED}).run_episode(LogicPolicy(), max_steps=200)")
+    env = {**os.environ, 'PYTHONPATH': os.pathsep.join(sys.path)}
+    return (lambda: None), (lambda _: subprocess.run([sys.executable, '-c', script], env=env, check=True))
+
+
+CASES: dict[str, Callable] = {
+    'world_construction': case_world_construction,
+    'array_world_construction': case_array_world_construction,
+    'setup_perceptions': case_setup_perceptions,
+    'agent_sense_x1000': case_agent_sense,
+    'kb_update': case_kb_update,
+    'get_safe_moves_x1000': case_get_safe_moves,
+    'episode': case_episode,
+    'oracle_batch': case_oracle_batch,
+    'worker_startup': case_worker_startup,
+}
+
+
+def measure(case: Callable, n: int, repeat: int) -> dict:
+    setup, run = case(n)
+    best = float('inf')
+    for _ in range(repeat):
+        state = setup()
+        gc.collect()
+        start = time.perf_counter()
+        run(state)
+        best = min(best, time.perf_counter() - start)
+        del state
+
+    # Separate pass for allocations; tracemalloc slows the code it watches
+    state = setup()
+    gc.collect()
+    tracemalloc.start()
+    run(state)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {'seconds': best, 'peak_bytes': peak}
+
+
+def run_benchmarks(sizes, cases, repeat: int) -> dict:
+    results = []
+    for name in cases:
+        for n in sizes:
+            record = {'case': name, 'n': n, **measure(CASES[name], n, repeat)}
+            results.append(record)
+            print(f"{name:<26} n={n:<5} {record['seconds'] * 1000:10.3f} ms "
+                  f"{record['peak_bytes'] / 1024:12.1f} KiB", flush=True)
+    return {
+        'meta': {'python': platform.python_version(), 'platform': platform.platform(), 'seed': SEED},
+        'results': results,
+    }
+
+
+def compare(current: dict, baseline: dict, tolerance: float) -> list[str]:
+    """Regression messages for every case slower or hungrier than baseline * (1 + tolerance)"""
+    previous = {(r['case'], r['n']): r for r in baseline['results']}
+    regressions = []
+    for record in current['results']:
+        old = previous.get((record['case'], record['n']))
+        if old is None:
+            continue
+        for metric in ('seconds', 'peak_bytes'):
+            if old[metric] > 0 and record[metric] > old[metric] * (1 + tolerance):
+                regressions.append(
+                    f"{record['case']} n={record['n']}: {metric} {old[metric]:.6g} -> {record[metric]:.6g} "
+                    f"({record[metric] / old[metric]:.2f}x)")
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark Wumpus World subsystems.")
+    parser.add_argument('--sizes', nargs='+', type=int, default=list(SIZES),
+                        help='World sizes (default: 4 16 64 256 1024)')
+    parser.add_argument('--cases', nargs='+', default=list(CASES), choices=list(CASES),
+                        help='Cases to run (default: all)')
+    parser.add_argument('--repeat', type=int, default=3, help='Timed runs per case, best kept (default: 3)')
+    parser.add_argument('--output', default='bench_results.json', help='Where to write results')
+    parser.add_argument('--baseline', help='Baseline JSON to compare against')
+    parser.add_argument('--save-baseline', help='Also write the results to this baseline path')
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help='Allowed slowdown/growth before flagging, as a fraction (default: 0.25)')
+    args = parser.parse_args(argv)
+
+    current = run_benchmarks(args.sizes, args.cases, args.repeat)
+    for path in filter(None, (args.output, args.save_baseline)):
+        with open(path, 'w') as f:
+            json.dump(current, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(current, json.load(f), args.tolerance)
+        for message in regressions:
+            print(f"REGRESSION {message}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,22 +1,63 @@
 """
 Wumpus World - A complete AI agent implementation with logical inference
+
+Public names are imported on first use, so `import wumpus` stays cheap for
+worker processes that only need a few of them.
 """
 
-from .agent import Agent
-from .cell import Cell
-from .worldmanager import WorldManager
-from .knowledge_base import KnowledgeBase
-from .game_controller import GameController
-from .cli_view import CLIView
-from .main import main
+from importlib import import_module
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .agent import Agent
+    from .cell import Cell
+    from .worldmanager import WorldManager
+    from .array_world import ArrayWorldManager
+    from .chunked_world import ChunkedWorldManager
+    from .world_batch import WorldBatch
+    from .world_spec import WorldSpec
+    from .knowledge_base import KnowledgeBase
+    from .logic import LogicKnowledgeBase
+    from .batch_knowledge_base import BatchKnowledgeBase
+    from .game_controller import GameController
+    from .env import VectorEnv
+    from .policy import Policy, LogicPolicy
+    from .cli_view import CLIView
+    from .main import main
 
 __version__ = "1.0.0"
-__all__ = [
-    "Agent",
-    "Cell",
-    "WorldManager",
-    "KnowledgeBase",
-    "GameController",
-    "CLIView",
-    "main"
-]
\ No newline at end of file
+
+# Public name -> submodule defining it
+_EXPORTS = {
+    "Agent": "agent",
+    "Cell": "cell",
+    "WorldManager": "worldmanager",
+    "ArrayWorldManager": "array_world",
+    "ChunkedWorldManager": "chunked_world",
+    "WorldBatch": "world_batch",
+    "WorldSpec": "world_spec",
+    "KnowledgeBase": "knowledge_base",
+    "LogicKnowledgeBase": "logic",
+    "BatchKnowledgeBase": "batch_knowledge_base",
+    "GameController": "game_controller",
+    "VectorEnv": "env",
+    "Policy": "policy",
+    "LogicPolicy": "policy",
+    "CLIView": "cli_view",
+    "main": "main",
+}
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(f".{module}", __name__), name)
+    # Importing .main binds the submodule here; the function takes precedence
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(_EXPORTS))
@@ -2,6 +2,9 @@ from .cell import Cell
 from .worldmanager import WorldManager
 from .sensor import Sensor
 from .knowledge_base import KnowledgeBase
+from .profiling import Stats
+from .topology import get_topology
+from time import perf_counter
 from typing import Tuple, List, Optional
 
 class Agent:
@@ -13,16 +16,23 @@ class Agent:
     GRAB = 5
     SHOOT = 6
 
-    def __init__(self, n: int, seed: Optional[int] = None):
-        self.world_manager = WorldManager(n, seed)
+    def __init__(self, n: int, seed: Optional[int] = None,
+                 world_manager: Optional[WorldManager] = None,
+                 knowledge_base: Optional[KnowledgeBase] = None):
+        self.world_manager = world_manager if world_manager is not None else WorldManager(n, seed)
         self.world: List[List[Cell]] = self.world_manager.get_world()
+        self.topology = get_topology(n)
         self.pos: Tuple[int, int] = WorldManager.STARTPOS
         self.has_arrow: bool = True
         self.orientation: int = Agent.RIGHT
-        self.kb = KnowledgeBase(n)
+        self.kb = knowledge_base if knowledge_base is not None else KnowledgeBase(n)
         self.score: int = 0
         self.alive: bool = True
         self.has_gold: bool = False
+        self.end_reason: Optional[str] = None  # 'gold', 'pit' or 'wumpus' once the game is over
+        # Gold is taken by remembering the cell, so the world is never written
+        # and can be shared by snapshots and lookahead copies
+        self.collected_gold: frozenset[Tuple[int, int]] = frozenset()
         self.sensors: dict[int, bool] = {
             Cell.BREEZE: False,
             Cell.STENCH: False,
@@ -30,35 +40,39 @@ class Agent:
             Cell.GLITTER: False,
             Cell.SCREAM: False
         }
+        self.stats: Optional[Stats] = None
 
     def reset_sensors(self):
         for key in self.sensors:
             self.sensors[key] = False
 
+    def clear_events(self):
+        """Forget BUMP and SCREAM, which only last until the next action"""
+        self.sensors[Cell.BUMP] = False
+        self.sensors[Cell.SCREAM] = False
+
     def sense(self) -> dict[int, bool]:
-        self.reset_sensors()
+        """Read the current cell; BUMP and SCREAM from the last action are kept"""
+        self.sensors[Cell.BREEZE] = False
+        self.sensors[Cell.STENCH] = False
+        self.sensors[Cell.GLITTER] = False
         current_cell = self.world_manager.get_pos(self.pos)
         for flag in current_cell.flags:
             if flag in self.sensors:
                 self.sensors[flag] = True
+        if self.pos in self.collected_gold:
+            self.sensors[Cell.GLITTER] = False
         return self.sensors.copy()
 
     def make_move(self, move: int) -> bool:
         """Returns True if move was successful, False if bumped into wall"""
-        if move in [Agent.LEFT, Agent.RIGHT]:
+        if move in (Agent.TOP, Agent.RIGHT, Agent.BOTTOM, Agent.LEFT):
             self.orientation = move
             self.score -= 1  # Turning costs 1 point
             return True
         elif move == Agent.FORWARD:
-            dx, dy = {
-                Agent.LEFT: (0, -1),
-                Agent.RIGHT: (0, 1),
-                Agent.TOP: (-1, 0),
-                Agent.BOTTOM: (1, 0)
-            }.get(self.orientation, (0, 0))
-
-            new_pos = (self.pos[0] + dx, self.pos[1] + dy)
-            if 0 <= new_pos[0] < len(self.world) and 0 <= new_pos[1] < len(self.world[0]):
+            new_pos = self.topology.forward_pos(self.pos, self.orientation)
+            if new_pos is not None:
                 self.pos = new_pos
                 self.score -= 1  # Moving costs 1 point
                 return True
@@ -68,11 +82,14 @@ class Agent:
                 return False
         return False
 
+    def gold_at(self, pos: Tuple[int, int]) -> bool:
+        """True if pos holds gold the agent has not taken yet"""
+        return pos not in self.collected_gold and self.world_manager.get_pos(pos).check_flag(Cell.GOLD)
+
     def grab_gold(self):
-        current_cell = self.world_manager.get_pos(self.pos)
-        if current_cell.check_flag(Cell.GOLD):
+        if self.gold_at(self.pos):
             self.has_gold = True
-            current_cell.flags.discard(Cell.GOLD)  # Remove gold from cell
+            self.collected_gold = self.collected_gold | {self.pos}
             self.score += 1000  # Grabbing gold gives 1000 points
             return True
         return False
@@ -112,54 +129,95 @@ class Agent:
         return False
 
     def check_game_end(self) -> Optional[str]:
-        """Returns 'win', 'lose', or None"""
+        """Returns 'win', 'lose', or None; end_reason says why"""
         current_cell = self.world_manager.get_pos(self.pos)
 
         if current_cell.check_flag(Cell.WUMPUS) and self.kb.wumpus_alive:
             self.alive = False
             self.score -= 1000  # Dying from wumpus costs 1000 points
+            self.end_reason = 'wumpus'
             return 'lose'
 
         if current_cell.check_flag(Cell.PIT):
             self.alive = False
             self.score -= 1000  # Falling into pit costs 1000 points
+            self.end_reason = 'pit'
             return 'lose'
 
         if self.has_gold:
+            self.end_reason = 'gold'
             return 'win'
 
         return None
 
+    def snapshot(self) -> tuple:
+        """Agent fields plus a KnowledgeBase mark; the world is shared, not copied"""
+        return (self.pos, self.orientation, self.has_arrow, self.score, self.alive, self.has_gold,
+                self.end_reason, self.collected_gold, self.sensors.copy(), self.kb.snapshot())
+
+    def restore(self, snapshot: tuple):
+        (self.pos, self.orientation, self.has_arrow, self.score, self.alive, self.has_gold,
+         self.end_reason, self.collected_gold, sensors, mark) = snapshot
+        self.sensors.update(sensors)
+        self.kb.restore(mark)
+
+    def checkpoint(self) -> tuple:
+        """Agent fields plus the KnowledgeBase itself, for pickling; see trace_log"""
+        return (self.pos, self.orientation, self.has_arrow, self.score, self.alive, self.has_gold,
+                self.end_reason, self.collected_gold, self.sensors.copy(), self.kb)
+
+    def resume(self, checkpoint: tuple):
+        (self.pos, self.orientation, self.has_arrow, self.score, self.alive, self.has_gold,
+         self.end_reason, self.collected_gold, sensors, self.kb) = checkpoint
+        self.sensors.update(sensors)
+        self.kb.stats = self.stats
+
     def update_knowledge(self):
+        stats = self.stats
+        if stats is None:
+            sensors = self.sense()
+            self.kb.update_knowledge(self.pos, sensors)
+            return
+
+        start = perf_counter()
         sensors = self.sense()
+        sensed = perf_counter()
         self.kb.update_knowledge(self.pos, sensors)
+        stats.add_time('sense', sensed - start)
+        stats.add_time('infer', perf_counter() - sensed)
 
     def get_safe_actions(self) -> List[int]:
         return self.kb.get_safe_moves(self.pos, self.orientation)
 
     def display_world(self):
         """Simple text-based display"""
-        print(f"\nScore: {self.score}")
-        print(f"Position: {self.pos}, Orientation: {self.orientation}")
-        print(f"Has Arrow: {self.has_arrow}, Has Gold: {self.has_gold}")
-        print(f"Wumpus Alive: {self.kb.wumpus_alive}")
+        print()
+        for line in self.status_lines():
+            print(line)
 
         for i in range(len(self.world)):
-            row = ""
-            for j in range(len(self.world[i])):
-                cell = self.world[i][j]
-                if (i, j) == self.pos:
-                    row += "A "  # Agent
-                elif cell.check_flag(Cell.WUMPUS) and not self.kb.wumpus_alive:
-                    row += "D "  # Dead wumpus
-                elif cell.check_flag(Cell.GOLD):
-                    row += "G "  # Gold
-                elif cell.check_flag(Cell.PIT):
-                    row += "P "  # Pit
-                elif (i, j) in self.kb.visited:
-                    row += ". "  # Visited safe cell
-                else:
-                    row += "? "  # Unknown
-            print(row)
+            print("".join(self.cell_glyph((i, j)) + " " for j in range(len(self.world[i]))))
         print()
-            
\ No newline at end of file
+
+    def status_lines(self) -> List[str]:
+        return [
+            f"Score: {self.score}",
+            f"Position: {self.pos}, Orientation: {self.orientation}",
+            f"Has Arrow: {self.has_arrow}, Has Gold: {self.has_gold}",
+            f"Wumpus Alive: {self.kb.wumpus_alive}",
+        ]
+
+    def cell_glyph(self, pos: Tuple[int, int]) -> str:
+        """One-character symbol for a cell, as display_world draws it"""
+        if pos == self.pos:
+            return "A"  # Agent
+        cell = self.world_manager.get_pos(pos)
+        if cell.check_flag(Cell.WUMPUS) and not self.kb.wumpus_alive:
+            return "D"  # Dead wumpus
+        if self.gold_at(pos):
+            return "G"  # Gold
+        if cell.check_flag(Cell.PIT):
+            return "P"  # Pit
+        if pos in self.kb.visited:
+            return "."  # Visited safe cell
+        return "?"  # Unknown
@@ -0,0 +1,124 @@
+from .cell import Cell
+from .topology import get_topology
+from .worldmanager import WorldManager
+from .world_spec import WorldSpec
+import numpy as np
+from typing import Iterator, Optional
+
+
+def spread_adjacent(plane: np.ndarray) -> np.ndarray:
+    """Mark every cell orthogonally adjacent to a set cell in the last two axes"""
+    out = np.zeros_like(plane)
+    out[..., 1:, :] |= plane[..., :-1, :]
+    out[..., :-1, :] |= plane[..., 1:, :]
+    out[..., :, 1:] |= plane[..., :, :-1]
+    out[..., :, :-1] |= plane[..., :, 1:]
+    return out
+
+
+class CellView(Cell):
+    """Cell-compatible read/write access to one position of an ArrayWorldManager"""
+
+    def __init__(self, world: 'ArrayWorldManager', i: int, j: int):
+        self._world = world
+        self._i = i
+        self._j = j
+
+    @property
+    def flags(self) -> set[int]:
+        return {flag for flag, plane in self._world.planes.items() if plane[self._i, self._j]}
+
+    def set_flag(self, flag: int):
+        self._world.plane(flag)[self._i, self._j] = True
+
+    def clear_flag(self, flag: int):
+        plane = self._world.planes.get(flag)
+        if plane is not None:
+            plane[self._i, self._j] = False
+
+    def check_flag(self, flag: int):
+        plane = self._world.planes.get(flag)
+        return plane is not None and bool(plane[self._i, self._j])
+
+
+class _RowView:
+    def __init__(self, world: 'ArrayWorldManager', i: int):
+        self._world = world
+        self._i = i
+
+    def __len__(self) -> int:
+        return self._world.n
+
+    def __getitem__(self, j: int) -> CellView:
+        if not 0 <= j < self._world.n:
+            raise IndexError(j)
+        return CellView(self._world, self._i, j)
+
+    def __iter__(self) -> Iterator[CellView]:
+        return (CellView(self._world, self._i, j) for j in range(self._world.n))
+
+
+class _GridView:
+    """Lets `world[i][j]` style code read an ArrayWorldManager"""
+
+    def __init__(self, world: 'ArrayWorldManager'):
+        self._world = world
+
+    def __len__(self) -> int:
+        return self._world.n
+
+    def __getitem__(self, i: int) -> _RowView:
+        if not 0 <= i < self._world.n:
+            raise IndexError(i)
+        return _RowView(self._world, i)
+
+    def __iter__(self) -> Iterator[_RowView]:
+        return (_RowView(self._world, i) for i in range(self._world.n))
+
+
+class ArrayWorldManager(WorldManager):
+    """WorldManager backed by one boolean NumPy plane per flag instead of n² Cell objects"""
+    PLANES = (Cell.WUMPUS, Cell.PIT, Cell.GOLD, Cell.BREEZE, Cell.STENCH)
+
+    def __init__(self, n: int, seed: Optional[int] = None,
+                 rng: Optional[np.random.Generator] = None,
+                 spec: Optional[WorldSpec] = None):
+        self.n = n
+        self.topology = get_topology(n)
+        self.planes: dict[int, np.ndarray] = {
+            flag: np.zeros((n, n), dtype=bool) for flag in self.PLANES
+        }
+        self.world = _GridView(self)
+
+        self.setup(seed, rng, spec)
+        self.setup_perceptions()
+
+    @classmethod
+    def from_planes(cls, planes: dict[int, np.ndarray]) -> 'ArrayWorldManager':
+        """Wrap existing planes (shape (n, n)) without copying or regenerating"""
+        world = cls.__new__(cls)
+        world.n = next(iter(planes.values())).shape[0]
+        world.topology = get_topology(world.n)
+        world.planes = dict(planes)
+        world.world = _GridView(world)
+        return world
+
+    def plane(self, flag: int) -> np.ndarray:
+        if flag not in self.planes:
+            self.planes[flag] = np.zeros((self.n, self.n), dtype=bool)
+        return self.planes[flag]
+
+    def place(self, pos: tuple[int, int], flag: int):
+        self.plane(flag)[pos] = True
+
+    def setup_perceptions(self):
+        self.planes[Cell.STENCH] |= spread_adjacent(self.planes[Cell.WUMPUS])
+        self.planes[Cell.BREEZE] |= spread_adjacent(self.planes[Cell.PIT])
+
+    def get_pos(self, pos: tuple[int, int]):
+        if len(pos) != 2:
+            return
+        return CellView(self, pos[0], pos[1])
+
+    def get_adjacent_cells(self, pos: tuple[int, int]) -> list[Cell]:
+        return [CellView(self, i, j) for i, j in self.topology.adjacent(pos)]
@@ -0,0 +1,123 @@
+from typing import Optional
+import numpy as np
+from .knowledge_base import KnowledgeBase
+
+
+class BatchKnowledgeBase:
+    """B independent KnowledgeBases held as stacked (B, n, n) boolean planes.
+
+    update_knowledge applies one percept per game with array operations that
+    follow KnowledgeBase.update_knowledge: the occupied cell is ruled out, a
+    breeze (stench) keeps only neighbouring pit (wumpus) suspects, no breeze
+    (stench) clears the neighbours, a single remaining suspect becomes
+    definite, and safe is every cell that nothing suspects any more.
+    """
+    TOP = KnowledgeBase.TOP
+    RIGHT = KnowledgeBase.RIGHT
+    BOTTOM = KnowledgeBase.BOTTOM
+    LEFT = KnowledgeBase.LEFT
+
+    def __init__(self, batch_size: int, n: int):
+        self.n = n
+        shape = (batch_size, n, n)
+        self.visited = np.zeros(shape, dtype=bool)
+        self.safe = np.zeros(shape, dtype=bool)
+        self.safe[:, 0, 0] = True
+        self.possible_pits = np.ones(shape, dtype=bool)
+        self.possible_pits[:, 0, 0] = False
+        self.possible_wumpus = self.possible_pits.copy()
+        self.definite_pits = np.zeros(shape, dtype=bool)
+        self.definite_wumpus = np.zeros(shape, dtype=bool)
+        self.breeze_cells = np.zeros(shape, dtype=bool)
+        self.stench_cells = np.zeros(shape, dtype=bool)
+        self.wumpus_alive = np.ones(batch_size, dtype=bool)
+        self.arrow_used = np.zeros(batch_size, dtype=bool)
+
+    def __len__(self) -> int:
+        return self.visited.shape[0]
+
+    def reset(self, mask: np.ndarray):
+        """Return the selected games to the initial state"""
+        for plane in (self.visited, self.definite_pits, self.definite_wumpus,
+                      self.breeze_cells, self.stench_cells, self.safe):
+            plane[mask] = False
+        self.safe[mask, 0, 0] = True
+        self.possible_pits[mask] = True
+        self.possible_pits[mask, 0, 0] = False
+        self.possible_wumpus[mask] = self.possible_pits[mask]
+        self.wumpus_alive[mask] = True
+        self.arrow_used[mask] = False
+
+    def adjacent_mask(self, positions: np.ndarray) -> np.ndarray:
+        """(B, n, n) mask of the in-bounds neighbours of each game's position"""
+        mask = np.zeros_like(self.visited)
+        games = np.arange(len(self))
+        i, j = positions[:, 0], positions[:, 1]
+        for di, dj in ((-1, 0), (1, 0), (0, -1), (0, 1)):
+            ni, nj = i + di, j + dj
+            ok = (ni >= 0) & (ni < self.n) & (nj >= 0) & (nj < self.n)
+            mask[games[ok], ni[ok], nj[ok]] = True
+        return mask
+
+    def update_knowledge(self, positions: np.ndarray, breeze: np.ndarray, stench: np.ndarray,
+                         active: Optional[np.ndarray] = None):
+        """positions is (B, 2); breeze, stench and active are (B,) booleans"""
+        if active is None:
+            active = np.ones(len(self), dtype=bool)
+        games = np.flatnonzero(active)
+        i, j = positions[games, 0], positions[games, 1]
+
+        self.visited[games, i, j] = True
+        self.breeze_cells[games, i, j] |= breeze[games]
+        self.stench_cells[games, i, j] |= stench[games]
+
+        # The agent is standing here, so this cell holds no pit or live wumpus
+        self.possible_pits[games, i, j] = False
+        self.possible_wumpus[games, i, j] = False
+
+        adjacent = self.adjacent_mask(positions)
+        keep = np.where(breeze[:, None, None], adjacent, ~adjacent)
+        self.possible_pits &= keep | ~active[:, None, None]
+
+        track = active & self.wumpus_alive
+        keep = np.where(stench[:, None, None], adjacent, ~adjacent)
+        self.possible_wumpus &= keep | ~track[:, None, None]
+
+        self._infer_definite_locations()
+
+    def _infer_definite_locations(self):
+        single = self.possible_pits.sum(axis=(1, 2)) == 1
+        self.definite_pits[single] |= self.possible_pits[single]
+        self.possible_pits[single] = False
+
+        single = (self.possible_wumpus.sum(axis=(1, 2)) == 1) & self.wumpus_alive
+        self.definite_wumpus[single] |= self.possible_wumpus[single]
+        self.possible_wumpus[single] = False
+
+        self.safe |= ~(self.possible_pits | self.possible_wumpus
+                       | self.definite_pits | self.definite_wumpus)
+
+    def mark_wumpus_dead(self, mask: np.ndarray):
+        self.wumpus_alive[mask] = False
+        self.possible_wumpus[mask] = False
+        self.definite_wumpus[mask] = False
+        self.safe |= ~(self.possible_pits | self.possible_wumpus
+                       | self.definite_pits | self.definite_wumpus)
+
+    def mark_arrow_used(self, mask: np.ndarray):
+        self.arrow_used[mask] = True
+
+    def is_safe(self, positions: np.ndarray) -> np.ndarray:
+        return self.safe[np.arange(len(self)), positions[:, 0], positions[:, 1]]
+
+    def should_shoot(self, positions: np.ndarray, orientations: np.ndarray) -> np.ndarray:
+        """(B,) mask of games where KnowledgeBase.should_shoot would be True"""
+        ready = self.wumpus_alive & ~self.arrow_used & (self.definite_wumpus.sum(axis=(1, 2)) == 1)
+        flat = self.definite_wumpus.reshape(len(self), -1).argmax(axis=1)
+        wi, wj = np.divmod(flat, self.n)
+        i, j = positions[:, 0], positions[:, 1]
+        facing = (((i == wi) & (j < wj) & (orientations == self.RIGHT))
+                  | ((i == wi) & (j > wj) & (orientations == self.LEFT))
+                  | ((j == wj) & (i < wi) & (orientations == self.BOTTOM))
+                  | ((j == wj) & (i > wi) & (orientations == self.TOP)))
+        return ready & facing
@@ -16,6 +16,9 @@ class Cell:
     def set_flag(self,flag : int):
         self.flags.add(flag)
 
+    def clear_flag(self,flag : int):
+        self.flags.discard(flag)
+
     def check_flag(self,flag: int):
         if flag in self.flags:
             return True
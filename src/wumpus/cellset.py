@@ -0,0 +1,117 @@
+from typing import Iterable, Iterator, Optional, Set, Tuple
+
+Pos = Tuple[int, int]
+
+
+class CellSet:
+    """Set of cells of an n x n grid, stored explicitly or as "every cell except these".
+
+    In complement mode `cells` holds the excluded cells, so "all cells but the
+    start" costs one tuple instead of n² of them. Membership, length, add and
+    discard are O(1) in both modes; iterating a complement set walks the grid
+    and is meant for small grids and tests only.
+    """
+    __hash__ = None  # mutable
+
+    def __init__(self, n: int, cells: Iterable[Pos] = (), complement: bool = False):
+        self.n = n
+        self.cells: Set[Pos] = set(cells)
+        self.complement = complement
+
+    @classmethod
+    def everything_except(cls, n: int, excluded: Iterable[Pos] = ()) -> 'CellSet':
+        return cls(n, excluded, complement=True)
+
+    def _in_bounds(self, pos: Pos) -> bool:
+        return 0 <= pos[0] < self.n and 0 <= pos[1] < self.n
+
+    def __contains__(self, pos) -> bool:
+        if self.complement:
+            return pos not in self.cells and self._in_bounds(pos)
+        return pos in self.cells
+
+    def __len__(self) -> int:
+        if self.complement:
+            return self.n * self.n - len(self.cells)
+        return len(self.cells)
+
+    def __bool__(self) -> bool:
+        return len(self) > 0
+
+    def __iter__(self) -> Iterator[Pos]:
+        if not self.complement:
+            return iter(self.cells)
+        return ((i, j) for i in range(self.n) for j in range(self.n) if (i, j) not in self.cells)
+
+    def __repr__(self) -> str:
+        if self.complement:
+            return f"CellSet.everything_except({self.n}, {self.cells!r})"
+        return f"CellSet({self.n}, {self.cells!r})"
+
+    def add(self, pos: Pos):
+        if self.complement:
+            self.cells.discard(pos)
+        else:
+            self.cells.add(pos)
+
+    def discard(self, pos: Pos):
+        if self.complement:
+            if self._in_bounds(pos):
+                self.cells.add(pos)
+        else:
+            self.cells.discard(pos)
+
+    def pop(self) -> Pos:
+        pos = next(iter(self))
+        self.discard(pos)
+        return pos
+
+    def clear(self):
+        self.cells = set()
+        self.complement = False
+
+    def replace(self, cells: Iterable[Pos]):
+        """Become exactly the given cells, in explicit mode"""
+        self.cells = set(cells)
+        self.complement = False
+
+    def copy(self) -> 'CellSet':
+        return CellSet(self.n, self.cells, self.complement)
+
+    def inverted(self) -> 'CellSet':
+        """Every grid cell not in this set"""
+        return CellSet(self.n, self.cells, not self.complement)
+
+    def _coerce(self, other) -> Optional['CellSet']:
+        if isinstance(other, CellSet):
+            return other
+        if isinstance(other, (set, frozenset)):
+            return CellSet(self.n, other)
+        return None
+
+    def __or__(self, other) -> 'CellSet':
+        other = self._coerce(other)
+        if other is None:
+            return NotImplemented
+        if not self.complement and not other.complement:
+            return CellSet(self.n, self.cells | other.cells)
+        if self.complement and other.complement:
+            return CellSet(self.n, self.cells & other.cells, complement=True)
+        comp, explicit = (self, other) if self.complement else (other, self)
+        return CellSet(self.n, comp.cells - explicit.cells, complement=True)
+
+    __ror__ = __or__
+
+    def __eq__(self, other) -> bool:
+        other = self._coerce(other)
+        if other is None:
+            return NotImplemented
+        if self.complement == other.complement:
+            return self.cells == other.cells
+        comp, explicit = (self, other) if self.complement else (other, self)
+        return len(self) == len(other) and all(pos in comp for pos in explicit)
+
+    def __le__(self, other) -> bool:
+        if len(self) > len(other):
+            return False
+        return all(pos in other for pos in self)
@@ -0,0 +1,174 @@
+from collections import OrderedDict
+from .cell import Cell
+from .topology import get_topology
+from .worldmanager import WorldManager
+from .world_spec import WorldSpec, sample_cells
+import numpy as np
+from typing import Iterator, Optional
+
+Chunk = tuple[int, int]
+
+# Hazard flag -> the percept it leaves on neighbouring cells
+PERCEPTS = ((Cell.WUMPUS, Cell.STENCH), (Cell.PIT, Cell.BREEZE))
+
+
+class _ChunkCell(Cell):
+    """Cell that reports edits to its world so they outlive chunk eviction"""
+
+    def __init__(self, world: 'ChunkedWorldManager', pos: tuple[int, int]):
+        super().__init__()
+        self._world = world
+        self._pos = pos
+
+    def set_flag(self, flag: int):
+        super().set_flag(flag)
+        self._world._remember(self._pos, self.flags)
+
+    def clear_flag(self, flag: int):
+        super().clear_flag(flag)
+        self._world._remember(self._pos, self.flags)
+
+
+class _ChunkRow:
+    def __init__(self, world: 'ChunkedWorldManager', i: int):
+        self._world = world
+        self._i = i
+
+    def __len__(self) -> int:
+        return self._world.n
+
+    def __getitem__(self, j: int) -> Cell:
+        if not 0 <= j < self._world.n:
+            raise IndexError(j)
+        return self._world.get_pos((self._i, j))
+
+    def __iter__(self) -> Iterator[Cell]:
+        return (self[j] for j in range(self._world.n))
+
+
+class _ChunkGrid:
+    """Lets `world[i][j]` style code read a ChunkedWorldManager"""
+
+    def __init__(self, world: 'ChunkedWorldManager'):
+        self._world = world
+
+    def __len__(self) -> int:
+        return self._world.n
+
+    def __getitem__(self, i: int) -> _ChunkRow:
+        if not 0 <= i < self._world.n:
+            raise IndexError(i)
+        return _ChunkRow(self._world, i)
+
+    def __iter__(self) -> Iterator[_ChunkRow]:
+        return (_ChunkRow(self._world, i) for i in range(self._world.n))
+
+
+class ChunkedWorldManager(WorldManager):
+    """WorldManager whose grid is generated one chunk at a time on first access.
+
+    The grid is cut into chunk_size x chunk_size chunks. A chunk's pits come
+    from default_rng([seed, ci, cj]), so an evicted chunk regenerates exactly;
+    the spec's wumpus and gold are placed in the start chunk. Breeze and
+    stench also take the hazards of the four neighbouring chunks into
+    account, so percepts agree across chunk borders. At most `max_chunks`
+    built chunks are cached, and cell edits such as a grabbed gold are kept
+    aside so they survive eviction.
+    """
+
+    def __init__(self, n: int, seed: Optional[int] = None, spec: Optional[WorldSpec] = None,
+                 chunk_size: int = 64, max_chunks: int = 256):
+        self.n = n
+        self.topology = get_topology(n)
+        self.seed = seed if seed is not None else np.random.SeedSequence().entropy
+        self.spec = spec if spec is not None else WorldSpec()
+        self.chunk_size = min(chunk_size, n)
+        self.max_chunks = max_chunks
+        self.world = _ChunkGrid(self)
+        self.generated = 0
+        self._chunks: OrderedDict[Chunk, list[list[Cell]]] = OrderedDict()
+        self._layouts: OrderedDict[Chunk, dict[int, list[tuple[int, int]]]] = OrderedDict()
+        self._edits: dict[Chunk, dict[tuple[int, int], set[int]]] = {}
+
+    def chunk_of(self, pos: tuple[int, int]) -> Chunk:
+        return (pos[0] // self.chunk_size, pos[1] // self.chunk_size)
+
+    def chunk_layout(self, chunk: Chunk) -> dict[int, list[tuple[int, int]]]:
+        """Global positions of each hazard flag in a chunk, drawn from its own rng"""
+        layout = self._layouts.get(chunk)
+        if layout is not None:
+            self._layouts.move_to_end(chunk)
+            return layout
+
+        size = self.chunk_size
+        rng = np.random.default_rng([self.seed, chunk[0], chunk[1]])
+        if chunk == (0, 0):
+            local = self.sample_layout(size, rng, self.spec)
+        else:
+            local = {Cell.PIT: sample_cells(size, self.spec.pit_count(size), rng)}
+        top, left = chunk[0] * size, chunk[1] * size
+        layout = {
+            flag: [(top + i, left + j) for i, j in positions if top + i < self.n and left + j < self.n]
+            for flag, positions in local.items()
+        }
+
+        self._layouts[chunk] = layout
+        # Layouts are small, so keep a few per built chunk for the border lookups
+        if len(self._layouts) > 5 * self.max_chunks:
+            self._layouts.popitem(last=False)
+        return layout
+
+    def _chunk(self, chunk: Chunk) -> list[list[Cell]]:
+        cells = self._chunks.get(chunk)
+        if cells is not None:
+            self._chunks.move_to_end(chunk)
+            return cells
+        cells = self._build(chunk)
+        self._chunks[chunk] = cells
+        if len(self._chunks) > self.max_chunks:
+            self._chunks.popitem(last=False)
+        return cells
+
+    def _build(self, chunk: Chunk) -> list[list[Cell]]:
+        size = self.chunk_size
+        top, left = chunk[0] * size, chunk[1] * size
+        rows, cols = min(size, self.n - top), min(size, self.n - left)
+        cells = [[_ChunkCell(self, (top + i, left + j)) for j in range(cols)] for i in range(rows)]
+
+        for flag, positions in self.chunk_layout(chunk).items():
+            for i, j in positions:
+                cells[i - top][j - left].flags.add(flag)
+
+        # Hazards just across a border leave percepts in this chunk too
+        ci, cj = chunk
+        last = (self.n - 1) // size
+        for other in (chunk, (ci - 1, cj), (ci + 1, cj), (ci, cj - 1), (ci, cj + 1)):
+            if not (0 <= other[0] <= last and 0 <= other[1] <= last):
+                continue
+            layout = self.chunk_layout(other)
+            for hazard, percept in PERCEPTS:
+                for i, j in layout.get(hazard, ()):
+                    for ai, aj in ((i - 1, j), (i + 1, j), (i, j - 1), (i, j + 1)):
+                        if 0 <= ai - top < rows and 0 <= aj - left < cols:
+                            cells[ai - top][aj - left].flags.add(percept)
+
+        for (i, j), flags in self._edits.get(chunk, {}).items():
+            cells[i - top][j - left].flags = flags
+        self.generated += 1
+        return cells
+
+    def _remember(self, pos: tuple[int, int], flags: set[int]):
+        self._edits.setdefault(self.chunk_of(pos), {})[pos] = flags
+
+    def setup_perceptions(self):
+        pass  # Each chunk gets its percepts when it is built
+
+    def get_pos(self, pos: tuple[int, int]):
+        if len(pos) != 2:
+            return
+        i, j = pos
+        chunk = self.chunk_of(pos)
+        return self._chunk(chunk)[i - chunk[0] * self.chunk_size][j - chunk[1] * self.chunk_size]
+
+    def get_adjacent_cells(self, pos: tuple[int, int]) -> list[Cell]:
+        return [self.get_pos(adj) for adj in self.topology.adjacent(pos)]
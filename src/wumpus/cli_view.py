@@ -17,6 +17,8 @@ class CLIView:
         print("s - Shoot Arrow")
         print("q - Quit")
         print("? - Show this menu")
+        if self.controller.renderer is not None:
+            self.controller.renderer.invalidate()  # The menu may have scrolled the board
 
     def get_user_action(self) -> Optional[int]:
         """Get action from user input, return None for invalid input"""
@@ -66,16 +68,7 @@ class CLIView:
     def _get_forward_position(self) -> Optional[tuple[int, int]]:
         """Get the position the agent would move to if going forward"""
         agent = self.controller.agent
-        i, j = agent.pos
-        if agent.orientation == Agent.TOP and i > 0:
-            return (i-1, j)
-        elif agent.orientation == Agent.BOTTOM and i < len(agent.world)-1:
-            return (i+1, j)
-        elif agent.orientation == Agent.LEFT and j > 0:
-            return (i, j-1)
-        elif agent.orientation == Agent.RIGHT and j < len(agent.world[0])-1:
-            return (i, j+1)
-        return None
+        return agent.topology.forward_pos(agent.pos, agent.orientation)
 
     def _format_actions(self, actions: list[int]) -> str:
         action_names = {
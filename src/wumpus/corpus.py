@@ -0,0 +1,166 @@
+"""
+World corpus - a memory-mapped file of pre-generated, bit-packed worlds.
+
+Layout: a fixed header (magic, version, n, count, base seed, metadata length),
+a JSON metadata block with the plane order and WorldSpec, then `count`
+records aligned to 64 bytes. Record k holds one np.packbits'd n*n plane per
+flag in ArrayWorldManager.PLANES, and world k is always the one WorldBatch
+draws from world_rng(base_seed, k), so a corpus can be rebuilt bit-for-bit.
+"""
+
+import dataclasses
+import hashlib
+import json
+import os
+import struct
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+import numpy as np
+from .array_world import ArrayWorldManager
+from .world_batch import WorldBatch
+from .world_spec import WorldSpec
+
+MAGIC = b'WUMPCORP'
+VERSION = 1
+HEADER = struct.Struct('<8sIIQQI')
+ALIGN = 64
+
+
+def _data_offset(meta_len: int) -> int:
+    end = HEADER.size + meta_len
+    return (end + ALIGN - 1) // ALIGN * ALIGN
+
+
+class PackedPlane:
+    """Read-only (n, n) bit plane over packed bytes, with writes kept in an overlay"""
+
+    def __init__(self, data: np.ndarray, n: int):
+        self.data = data
+        self.n = n
+        self.shape = (n, n)
+        self.overlay: dict[tuple[int, int], bool] = {}
+
+    def __getitem__(self, pos: tuple[int, int]) -> bool:
+        value = self.overlay.get(pos)
+        if value is not None:
+            return value
+        index = pos[0] * self.n + pos[1]
+        return bool((self.data[index >> 3] >> (7 - (index & 7))) & 1)
+
+    def __setitem__(self, pos: tuple[int, int], value: bool):
+        self.overlay[pos] = bool(value)
+
+
+class WorldCorpus:
+    """Memory-mapped reader for a corpus file; world(k) copies nothing"""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, 'rb') as f:
+            magic, version, n, count, base_seed, meta_len = HEADER.unpack(f.read(HEADER.size))
+            if magic != MAGIC:
+                raise ValueError(f"{path} is not a world corpus")
+            if version != VERSION:
+                raise ValueError(f"{path} has corpus version {version}, expected {VERSION}")
+            meta_bytes = f.read(meta_len)
+            meta = json.loads(meta_bytes)
+        # World k depends only on n, the base seed and the metadata, not on count
+        digest = hashlib.sha1(struct.pack('<IQ', n, base_seed) + meta_bytes).hexdigest()
+        self.ident = f"{os.path.splitext(os.path.basename(path))[0]}-{digest[:8]}"
+        self.n = n
+        self.base_seed = base_seed
+        self.flags: list[int] = meta['planes']
+        self.spec = WorldSpec(**meta['spec'])
+        self.data = np.memmap(path, dtype=np.uint8, mode='r', offset=_data_offset(meta_len),
+                              shape=(count, len(self.flags), (n * n + 7) // 8))
+
+    def __len__(self) -> int:
+        return self.data.shape[0]
+
+    def world(self, k: int) -> ArrayWorldManager:
+        """WorldManager-compatible view of world k; edits stay in memory"""
+        record = self.data[k]
+        return ArrayWorldManager.from_planes({
+            flag: PackedPlane(record[p], self.n) for p, flag in enumerate(self.flags)
+        })
+
+    def planes(self, start: int, stop: int) -> dict[int, np.ndarray]:
+        """Unpacked (stop - start, n, n) planes, e.g. for BatchKnowledgeBase"""
+        n = self.n
+        bits = np.unpackbits(self.data[start:stop], axis=-1, count=n * n).astype(bool)
+        return {flag: bits[:, p].reshape(-1, n, n) for p, flag in enumerate(self.flags)}
+
+
+def create_corpus(path: str, n: int, base_seed: int, count: int,
+                  spec: Optional[WorldSpec] = None) -> int:
+    """Write the header and size the file; returns the offset of record 0"""
+    meta = json.dumps({
+        'planes': list(ArrayWorldManager.PLANES),
+        'spec': dataclasses.asdict(spec if spec is not None else WorldSpec()),
+    }).encode()
+    offset = _data_offset(len(meta))
+    record_size = len(ArrayWorldManager.PLANES) * ((n * n + 7) // 8)
+    with open(path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, VERSION, n, count, base_seed, len(meta)))
+        f.write(meta)
+        f.truncate(offset + count * record_size)
+    return offset
+
+
+def fill_records(path: str, offset: int, n: int, base_seed: int, count: int,
+                 start: int, stop: int, spec: Optional[WorldSpec] = None):
+    """Generate worlds [start, stop) and write them straight into the file"""
+    planes = len(ArrayWorldManager.PLANES)
+    out = np.memmap(path, dtype=np.uint8, mode='r+', offset=offset,
+                    shape=(count, planes, (n * n + 7) // 8))
+    batch = WorldBatch(n, base_seed, stop - start, start, spec)
+    stacked = np.stack([batch.planes[flag] for flag in ArrayWorldManager.PLANES], axis=1)
+    out[start:stop] = np.packbits(stacked.reshape(stop - start, planes, n * n), axis=-1)
+    out.flush()
+    del out
+
+
+def build_corpus(path: str, n: int, base_seed: int, count: int, spec: Optional[WorldSpec] = None,
+                 workers: Optional[int] = None, batch_size: int = 4096):
+    """Build a corpus of `count` worlds; each worker writes its own slice of the file"""
+    offset = create_corpus(path, n, base_seed, count, spec)
+    jobs = [(start, min(start + batch_size, count)) for start in range(0, count, batch_size)]
+    if workers == 1:
+        for start, stop in jobs:
+            fill_records(path, offset, n, base_seed, count, start, stop, spec)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(fill_records, path, offset, n, base_seed, count, start, stop, spec)
+                   for start, stop in jobs]
+        for future in futures:
+            future.result()
+
+
+def main(argv: Optional[list[str]] = None):
+    import argparse
+    parser = argparse.ArgumentParser(prog='wumpus corpus', description="Build or inspect world corpora.")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    build = commands.add_parser('build', help='Generate a corpus file')
+    build.add_argument('out', help='Corpus file to write')
+    build.add_argument('-n', '--size', type=int, default=4, help='World size (default: 4)')
+    build.add_argument('--count', type=int, default=1000, help='Number of worlds (default: 1000)')
+    build.add_argument('--seed', type=int, default=0, help='Base seed (default: 0)')
+    build.add_argument('--pit-density', type=float, help='Fraction of free cells holding a pit')
+    build.add_argument('--workers', type=int, help='Worker processes (default: CPU count)')
+    build.add_argument('--batch-size', type=int, default=4096, help='Worlds per job (default: 4096)')
+
+    info = commands.add_parser('info', help='Describe a corpus file')
+    info.add_argument('path', help='Corpus file to read')
+    args = parser.parse_args(argv)
+
+    if args.command == 'build':
+        spec = WorldSpec(pit_density=args.pit_density)
+        build_corpus(args.out, args.size, args.seed, args.count, spec, args.workers, args.batch_size)
+        print(f"Wrote {args.count} worlds of size {args.size} to {args.out} "
+              f"({os.path.getsize(args.out)} bytes).")
+    else:
+        corpus = WorldCorpus(args.path)
+        print(f"{args.path}: {len(corpus)} worlds, n={corpus.n}, base seed={corpus.base_seed}, "
+              f"spec={corpus.spec}")
@@ -0,0 +1,198 @@
+from .agent import Agent
+from .array_world import spread_adjacent
+from .batch_knowledge_base import BatchKnowledgeBase
+from .cell import Cell
+from .trace_log import OUTCOMES, PERCEPT_BITS
+from .world_batch import WorldBatch
+from .worldmanager import WorldManager
+from .world_spec import WorldSpec
+import numpy as np
+from typing import Optional, Sequence
+
+# KnowledgeBase planes stacked into the belief crop, in channel order
+BELIEF_PLANES = ('visited', 'safe', 'possible_pits', 'possible_wumpus',
+                 'definite_pits', 'definite_wumpus', 'breeze_cells', 'stench_cells')
+
+# Row and column step of FORWARD for each orientation
+FORWARD = np.array([(-1, 0), (0, 1), (1, 0), (0, -1)])
+
+
+class VectorEnv:
+    """B games played in lockstep with array actions, observations and rewards.
+
+    Follows the Agent rules action for action: turning, moving and bumping
+    cost 1, a successful grab pays 1000 and wins, a shot (only taken when
+    the knowledge base confirms the wumpus in line, as Agent.shoot_arrow
+    requires) costs 10 and pays 500 for the kill, and walking into a pit or
+    the live wumpus costs 1000 and loses. Knowledge is tracked by a
+    BatchKnowledgeBase. The world for seed s is the one GameController(n, s)
+    plays.
+
+    Observations are a dict of arrays: 'percepts' (B, 5) booleans in
+    trace_log.PERCEPT_BITS order, 'pose' (B, 3) as row, column and
+    orientation, 'has_arrow' (B,), and with `crop` set 'belief', a
+    (B, len(BELIEF_PLANES) + 1, 2 * crop + 1, 2 * crop + 1) window of the
+    belief planes centred on the agent whose last channel marks off-board
+    cells.
+
+    A game that ends is reset at once onto the next unused seed; step()
+    reports how it ended in `info` and returns the new game's first
+    observation.
+    """
+
+    def __init__(self, n: int, num_envs: int, spec: Optional[WorldSpec] = None,
+                 crop: Optional[int] = None, max_steps: Optional[int] = None):
+        self.n = n
+        self.num_envs = num_envs
+        self.spec = spec
+        self.crop = crop
+        self.max_steps = max_steps
+        shape = (num_envs, n, n)
+        self.planes = {flag: np.zeros(shape, dtype=bool) for flag in
+                       (Cell.WUMPUS, Cell.PIT, Cell.GOLD, Cell.BREEZE, Cell.STENCH)}
+        self.kb = BatchKnowledgeBase(num_envs, n)
+        self.pos = np.zeros((num_envs, 2), dtype=np.int64)
+        self.orientation = np.full(num_envs, Agent.RIGHT, dtype=np.int64)
+        self.has_arrow = np.ones(num_envs, dtype=bool)
+        self.percepts = np.zeros((num_envs, len(PERCEPT_BITS)), dtype=bool)
+        self.score = np.zeros(num_envs, dtype=np.int64)
+        self.steps = np.zeros(num_envs, dtype=np.int64)
+        self.seeds = np.zeros(num_envs, dtype=np.int64)
+        self.next_seed = 0
+        self._games = np.arange(num_envs)
+        self._bit = {flag: bit for bit, flag in enumerate(PERCEPT_BITS)}
+
+    def reset(self, seeds: Optional[Sequence[int]] = None) -> dict[str, np.ndarray]:
+        """Start every game over, on `seeds` or on the next num_envs unused seeds"""
+        if seeds is None:
+            seeds = range(self.next_seed, self.next_seed + self.num_envs)
+        seeds = np.asarray(seeds, dtype=np.int64)
+        if seeds.shape != (self.num_envs,):
+            raise ValueError(f"expected {self.num_envs} seeds, got {seeds.shape}")
+        self.next_seed = int(seeds.max()) + 1
+        self._start(np.ones(self.num_envs, dtype=bool), seeds)
+        return self._observe()
+
+    def step(self, actions) -> tuple[dict[str, np.ndarray], np.ndarray, np.ndarray, np.ndarray, dict]:
+        """Apply one action per game.
+
+        Returns (observation, reward, terminated, truncated, info); info
+        holds the 'outcome' (index into trace_log.OUTCOMES), 'score' and
+        'steps' of each game as it stood before any automatic reset.
+        """
+        actions = np.asarray(actions, dtype=np.int64)
+        if actions.shape != (self.num_envs,) or ((actions < 0) | (actions > Agent.SHOOT)).any():
+            raise ValueError("expected one action from 0 to 6 per game")
+        games, planes, kb = self._games, self.planes, self.kb
+        reward = np.zeros(self.num_envs, dtype=np.int64)
+        bump = np.zeros(self.num_envs, dtype=bool)
+        scream = np.zeros(self.num_envs, dtype=bool)
+
+        turn = actions <= Agent.LEFT
+        self.orientation[turn] = actions[turn]
+        forward = actions == Agent.FORWARD
+        target = self.pos + FORWARD[self.orientation]
+        inside = ((target >= 0) & (target < self.n)).all(axis=1)
+        moved = forward & inside
+        self.pos[moved] = target[moved]
+        bump[forward & ~inside] = True
+        reward[turn | forward] -= 1
+
+        i, j = self.pos[:, 0], self.pos[:, 1]
+        grabbed = (actions == Agent.GRAB) & planes[Cell.GOLD][games, i, j]
+        reward[grabbed] += 1000
+
+        # should_shoot also checks the facing, so every shot taken hits
+        shot = (actions == Agent.SHOOT) & self.has_arrow & kb.should_shoot(self.pos, self.orientation)
+        self.has_arrow[shot] = False
+        kb.mark_arrow_used(shot)
+        kb.mark_wumpus_dead(shot)
+        scream[shot] = True
+        reward[shot] += 500 - 10
+
+        breeze = planes[Cell.BREEZE][games, i, j]
+        stench = planes[Cell.STENCH][games, i, j]
+        kb.update_knowledge(self.pos, breeze, stench)
+        self._sense(breeze, stench, bump, scream)
+
+        dead = (planes[Cell.WUMPUS][games, i, j] & kb.wumpus_alive) | planes[Cell.PIT][games, i, j]
+        reward[dead] -= 1000
+        self.score += reward
+        self.steps += 1
+
+        terminated = dead | grabbed
+        truncated = np.zeros(self.num_envs, dtype=bool)
+        if self.max_steps is not None:
+            truncated = ~terminated & (self.steps >= self.max_steps)
+        outcome = np.zeros(self.num_envs, dtype=np.int8)
+        outcome[grabbed] = OUTCOMES.index('win')
+        outcome[dead] = OUTCOMES.index('lose')
+        info = {'outcome': outcome, 'score': self.score.copy(), 'steps': self.steps.copy()}
+
+        done = terminated | truncated
+        if done.any():
+            seeds = np.arange(self.next_seed, self.next_seed + int(done.sum()))
+            self.next_seed += len(seeds)
+            self._start(done, seeds)
+        return self._observe(), reward, terminated, truncated, info
+
+    def _start(self, mask: np.ndarray, seeds: np.ndarray):
+        """Load the worlds for `seeds` into the masked games and take their first percepts"""
+        layouts = [WorldManager.sample_layout(self.n, np.random.default_rng(int(seed)), self.spec)
+                   for seed in seeds]
+        for flag, plane in WorldBatch.layout_planes(self.n, layouts).items():
+            self.planes[flag][mask] = plane
+        self.planes[Cell.STENCH][mask] = spread_adjacent(self.planes[Cell.WUMPUS][mask])
+        self.planes[Cell.BREEZE][mask] = spread_adjacent(self.planes[Cell.PIT][mask])
+
+        self.seeds[mask] = seeds
+        self.pos[mask] = WorldManager.STARTPOS
+        self.orientation[mask] = Agent.RIGHT
+        self.has_arrow[mask] = True
+        self.score[mask] = 0
+        self.steps[mask] = 0
+        self.kb.reset(mask)
+        i, j = self.pos[:, 0], self.pos[:, 1]
+        breeze = self.planes[Cell.BREEZE][self._games, i, j]
+        stench = self.planes[Cell.STENCH][self._games, i, j]
+        self.kb.update_knowledge(self.pos, breeze, stench, mask)
+        quiet = np.zeros(self.num_envs, dtype=bool)
+        keep = self.percepts.copy()
+        self._sense(breeze, stench, quiet, quiet)
+        self.percepts[~mask] = keep[~mask]
+
+    def _sense(self, breeze: np.ndarray, stench: np.ndarray, bump: np.ndarray, scream: np.ndarray):
+        bit = self._bit
+        self.percepts[:, bit[Cell.BREEZE]] = breeze
+        self.percepts[:, bit[Cell.STENCH]] = stench
+        self.percepts[:, bit[Cell.GLITTER]] = self.planes[Cell.GOLD][self._games, self.pos[:, 0], self.pos[:, 1]]
+        self.percepts[:, bit[Cell.BUMP]] = bump
+        self.percepts[:, bit[Cell.SCREAM]] = scream
+
+    def _observe(self) -> dict[str, np.ndarray]:
+        obs = {
+            'percepts': self.percepts.copy(),
+            'pose': np.column_stack([self.pos, self.orientation]),
+            'has_arrow': self.has_arrow.copy(),
+        }
+        if self.crop is not None:
+            obs['belief'] = self.belief_crop(self.crop)
+        return obs
+
+    def belief_crop(self, radius: int) -> np.ndarray:
+        """(B, C, 2r + 1, 2r + 1) belief planes around each agent, plus an off-board channel"""
+        # Gather only the window cells, so the cost does not grow with n
+        offsets = np.arange(-radius, radius + 1)
+        rows = self.pos[:, 0, None] + offsets
+        cols = self.pos[:, 1, None] + offsets
+        inside = (((rows >= 0) & (rows < self.n))[:, :, None]
+                  & ((cols >= 0) & (cols < self.n))[:, None, :])
+        flat = (self._games[:, None, None] * (self.n * self.n)
+                + np.clip(rows, 0, self.n - 1)[:, :, None] * self.n
+                + np.clip(cols, 0, self.n - 1)[:, None, :])
+
+        crop = np.empty((self.num_envs, len(BELIEF_PLANES) + 1, len(offsets), len(offsets)), dtype=bool)
+        for c, name in enumerate(BELIEF_PLANES):
+            np.logical_and(getattr(self.kb, name).ravel().take(flat), inside, out=crop[:, c])
+        crop[:, -1] = ~inside
+        return crop
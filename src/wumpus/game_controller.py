@@ -1,43 +1,134 @@
+from dataclasses import dataclass
 from .agent import Agent
+from .knowledge_base import KnowledgeBase
+from .profiling import Stats
 from .worldmanager import WorldManager
-from typing import Optional
+from time import perf_counter
+from typing import Optional, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .policy import Policy
+    from .renderer import TerminalRenderer
+    from .trace_log import TraceRecorder
+
+
+@dataclass
+class EpisodeResult:
+    outcome: Optional[str]  # 'win', 'lose', or None if the episode was cut short
+    score: int
+    steps: int
+    reason: Optional[str] = None  # Agent.end_reason: 'gold', 'pit' or 'wumpus'
+    arrow_used: bool = False
+    wumpus_killed: bool = False
+
 
 class GameController:
-    def __init__(self, n: int, seed: Optional[int] = None):
-        self.agent = Agent(n, seed)
+    def __init__(self, n: int, seed: Optional[int] = None,
+                 world_manager: Optional[WorldManager] = None,
+                 knowledge_base: Optional[KnowledgeBase] = None):
+        self.n = n
+        self.seed = seed
+        self.agent = Agent(n, seed, world_manager, knowledge_base)
         self.game_state: Optional[str] = None
+        self.steps = 0
+        self.stats: Optional[Stats] = None
+        self.recorder: Optional['TraceRecorder'] = None
+        self.renderer: Optional['TerminalRenderer'] = None  # None prints the whole board
 
     def start_game(self):
         """Initialize the game"""
         self.agent.update_knowledge()
         self.display_world()
 
-    def process_action(self, action: int) -> bool:
-        """Process an action and return True if game continues"""
+    def step(self, action: int) -> bool:
+        """Apply an action without any rendering and return True if game continues"""
+        self.agent.clear_events()
+        score = self.agent.score
+        start = perf_counter() if self.stats is not None else 0.0
         if action == Agent.GRAB:
             self.agent.grab_gold()
         elif action == Agent.SHOOT:
             self.agent.shoot_arrow()
         else:
             self.agent.make_move(action)
+        self.steps += 1
+        if self.stats is not None:
+            self.stats.add_time('act', perf_counter() - start)
 
         # Update knowledge after action
         self.agent.update_knowledge()
 
         # Check game end conditions
-        self.game_state = self.agent.check_game_end()
+        stats = self.stats
+        if stats is None:
+            self.game_state = self.agent.check_game_end()
+        else:
+            start = perf_counter()
+            self.game_state = self.agent.check_game_end()
+            stats.add_time('end_check', perf_counter() - start)
+            stats.sample_memory()
 
-        self.display_world()
+        if self.recorder is not None:
+            self.recorder.record_step(action, self.agent.sensors, self.agent.score - score, self)
+            if self.game_state is not None:
+                self.recorder.end(self.game_state)
 
         return self.game_state is None
 
+    def process_action(self, action: int) -> bool:
+        """Process an action and return True if game continues"""
+        game_continues = self.step(action)
+        self.display_world()
+        return game_continues
+
+    def snapshot(self) -> tuple:
+        """Cheap restore point for lookahead; see Agent.snapshot and KnowledgeBase.snapshot"""
+        return (self.steps, self.game_state, self.agent.snapshot())
+
+    def restore(self, snapshot: tuple):
+        self.steps, self.game_state, agent_snapshot = snapshot
+        self.agent.restore(agent_snapshot)
+
+    def checkpoint(self) -> tuple:
+        """Picklable game state; the world is not included and comes from the seed"""
+        return (self.steps, self.game_state, self.agent.checkpoint())
+
+    def resume(self, checkpoint: tuple):
+        self.steps, self.game_state, agent_checkpoint = checkpoint
+        self.agent.resume(agent_checkpoint)
+
+    def record_to(self, recorder: 'TraceRecorder') -> int:
+        """Stream every following action to a TraceRecorder; returns the game id"""
+        if self.seed is None:
+            raise ValueError("only seeded games can be recorded and replayed")
+        self.recorder = recorder
+        return recorder.begin(self.n, self.seed)
+
+    def enable_profiling(self, track_memory: bool = False) -> Stats:
+        """Attach a Stats collector to the controller, agent and knowledge base"""
+        self.stats = Stats(track_memory)
+        self.agent.stats = self.stats
+        self.agent.kb.stats = self.stats
+        return self.stats
+
+    def run_episode(self, policy: 'Policy', max_steps: int = 1000) -> EpisodeResult:
+        """Play headlessly until the game ends, the policy quits or max_steps is reached"""
+        agent = self.agent
+        agent.update_knowledge()
+        while self.game_state is None and self.steps < max_steps:
+            action = policy.choose_action(agent.sensors, agent.kb, agent.pos, agent.orientation)
+            if action is None:
+                break
+            self.step(action)
+        return EpisodeResult(self.game_state, agent.score, self.steps, agent.end_reason,
+                             not agent.has_arrow, not agent.kb.wumpus_alive)
+
     def get_available_actions(self) -> list[int]:
         """Get actions that are currently safe/possible"""
         actions = self.agent.get_safe_actions()
 
         # Add grab if there's gold here
-        current_cell = self.agent.world_manager.get_pos(self.agent.pos)
-        if current_cell.check_flag(self.agent.world_manager.world[0][0].__class__.GOLD):
+        if self.agent.gold_at(self.agent.pos):
             actions.append(Agent.GRAB)
 
         # Add shoot if conditions met
@@ -53,22 +144,20 @@ class GameController:
 
     def _can_move_forward(self) -> bool:
         """Check if forward movement is physically possible"""
-        i, j = self.agent.pos
-        if self.agent.orientation == Agent.TOP:
-            return i > 0
-        elif self.agent.orientation == Agent.BOTTOM:
-            return i < len(self.agent.world) - 1
-        elif self.agent.orientation == Agent.LEFT:
-            return j > 0
-        elif self.agent.orientation == Agent.RIGHT:
-            return j < len(self.agent.world[0]) - 1
-        return False
+        agent = self.agent
+        return agent.topology.forward_pos(agent.pos, agent.orientation) is not None
 
     def display_world(self):
-        self.agent.display_world()
+        draw = self.renderer.render if self.renderer is not None else self.agent.display_world
+        if self.stats is None:
+            draw()
+            return
+        start = perf_counter()
+        draw()
+        self.stats.add_time('render', perf_counter() - start)
 
     def get_game_state(self) -> Optional[str]:
         return self.game_state
 
     def get_score(self) -> int:
-        return self.agent.score
\ No newline at end of file
+        return self.agent.score
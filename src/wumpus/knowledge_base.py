@@ -1,5 +1,8 @@
 from typing import Set, Tuple, List, Optional
 from .cell import Cell
+from .cellset import CellSet
+from .profiling import Stats
+from .topology import get_topology
 
 class KnowledgeBase:
     # Direction constants (matching Agent)
@@ -10,37 +13,109 @@ class KnowledgeBase:
     FORWARD = 4
     def __init__(self, n: int):
         self.n = n
+        self.topology = get_topology(n)
         self.visited: Set[Tuple[int, int]] = set()
-        self.safe: Set[Tuple[int, int]] = {(0, 0)}  # Start position is safe
-        self.possible_pits: Set[Tuple[int, int]] = set()
-        self.possible_wumpus: Set[Tuple[int, int]] = set()
+        self.safe = CellSet(n, [(0, 0)])  # Start position is safe
+        self.safe_log: List[Tuple[int, int]] = [(0, 0)]  # Cells in the order they became safe
+        # Every cell but the start is a suspect; kept as a complement until a
+        # breeze or stench narrows it down, so memory follows the explored area
+        self.possible_pits = CellSet.everything_except(n, [(0, 0)])
+        self.possible_wumpus = CellSet.everything_except(n, [(0, 0)])
         self.definite_pits: Set[Tuple[int, int]] = set()
         self.definite_wumpus: Set[Tuple[int, int]] = set()
         self.breeze_cells: Set[Tuple[int, int]] = set()
         self.stench_cells: Set[Tuple[int, int]] = set()
         self.wumpus_alive = True
         self.arrow_used = False
+        self.stats: Optional[Stats] = None
+        # Bumped when safe flips to "everything except"; safe_log then only
+        # records safe cells next to visited ones
+        self.safe_resets = 0
+        self._logged: Optional[Set[Tuple[int, int]]] = None
+        # Bumped by every restore() that undoes something, so readers of
+        # safe_log can tell a rollback from a log that merely grew
+        self.restores = 0
+        # Undo entries (function, *args) recorded while a snapshot is open,
+        # and the marks of the open snapshots, innermost last
+        self._trail: Optional[list] = None
+        self._marks: List[int] = []
 
-        # Initialize possible locations (exclude start)
-        for i in range(n):
-            for j in range(n):
-                if (i, j) != (0, 0):
-                    self.possible_pits.add((i, j))
-                    self.possible_wumpus.add((i, j))
+    def snapshot(self) -> int:
+        """Open a (possibly nested) snapshot; restore(mark) undoes everything after it.
+
+        Nothing is copied: while a snapshot is open every change to the
+        belief sets is recorded as an undo entry, so taking a snapshot is
+        O(1) and restoring costs as much as what changed since.
+        """
+        if self._trail is None:
+            self._trail = []
+        mark = len(self._trail)
+        self._marks.append(mark)
+        return mark
+
+    def restore(self, mark: int):
+        """Undo back to mark and close its snapshot, and any opened after it"""
+        trail = self._trail
+        if len(trail) > mark:
+            self.restores += 1
+        while len(trail) > mark:
+            undo, *args = trail.pop()
+            undo(*args)
+        marks = self._marks
+        while marks[-1] > mark:
+            marks.pop()
+        marks.pop()
+        if not marks:
+            self._trail = None
+
+    def __getstate__(self) -> dict:
+        # Beliefs only: profiling and open snapshots belong to this process
+        state = dict(self.__dict__)
+        state.update(stats=None, _trail=None, _marks=[])
+        return state
+
+    def _add(self, cells, pos: Tuple[int, int]):
+        if pos not in cells:
+            cells.add(pos)
+            if self._trail is not None:
+                self._trail.append((cells.discard, pos))
+
+    def _discard(self, cells, pos: Tuple[int, int]):
+        if pos in cells:
+            cells.discard(pos)
+            if self._trail is not None:
+                self._trail.append((cells.add, pos))
+
+    def _set(self, obj, name: str, value):
+        if self._trail is not None:
+            self._trail.append((setattr, obj, name, getattr(obj, name)))
+        setattr(obj, name, value)
 
     def update_knowledge(self, pos: Tuple[int, int], sensors: dict):
-        self.visited.add(pos)
+        self._add(self.visited, pos)
 
         if sensors[Cell.BREEZE]:
-            self.breeze_cells.add(pos)
+            self._add(self.breeze_cells, pos)
         if sensors[Cell.STENCH]:
-            self.stench_cells.add(pos)
+            self._add(self.stench_cells, pos)
+
+        # The agent is standing here, so this cell holds no pit or live wumpus
+        self._rule_out_pits((pos,))
+        self._rule_out_wumpus((pos,))
 
         # Update possible locations based on perceptions
         self._update_possible_locations(pos, sensors)
 
         # Infer definite locations
         self._infer_definite_locations()
+        if self.safe.complement:
+            self._log_frontier(pos)
+
+        stats = self.stats
+        if stats is not None:
+            stats.observe('possible_pits', len(self.possible_pits))
+            stats.observe('possible_wumpus', len(self.possible_wumpus))
+            stats.observe('safe', len(self.safe))
 
     def _update_possible_locations(self, pos: Tuple[int, int], sensors: dict):
         adjacent = self._get_adjacent(pos)
@@ -48,52 +123,112 @@ class KnowledgeBase:
         if sensors[Cell.BREEZE]:
             # If breeze, there must be a pit in adjacent cells
             # Remove non-adjacent from possible pits
-            to_remove = set()
-            for p in self.possible_pits:
-                if p not in adjacent:
-                    to_remove.add(p)
-            self.possible_pits -= to_remove
+            self._restrict_pits(adjacent)
         else:
             # No breeze, no pits in adjacent cells
-            self.possible_pits -= set(adjacent)
+            self._rule_out_pits(adjacent)
 
         if sensors[Cell.STENCH] and self.wumpus_alive:
             # If stench, wumpus in adjacent
-            to_remove = set()
-            for w in self.possible_wumpus:
-                if w not in adjacent:
-                    to_remove.add(w)
-            self.possible_wumpus -= to_remove
+            self._restrict_wumpus(adjacent)
         elif not sensors[Cell.STENCH] and self.wumpus_alive:
             # No stench, no wumpus in adjacent
-            self.possible_wumpus -= set(adjacent)
+            self._rule_out_wumpus(adjacent)
+
+    def _rule_out_pits(self, cells):
+        """Drop cells from possible_pits and mark the ones no longer suspect as safe"""
+        if self.stats is not None:
+            self.stats.count('cells_rescanned', len(cells))
+        for pos in cells:
+            if pos in self.possible_pits:
+                self._discard(self.possible_pits, pos)
+                self._mark_if_safe(pos)
+
+    def _rule_out_wumpus(self, cells):
+        if self.stats is not None:
+            self.stats.count('cells_rescanned', len(cells))
+        for pos in cells:
+            if pos in self.possible_wumpus:
+                self._discard(self.possible_wumpus, pos)
+                self._mark_if_safe(pos)
+
+    def _restrict_pits(self, cells):
+        """Keep only the given cells as pit suspects"""
+        if self.possible_pits.complement:
+            self._replace(self.possible_pits, [p for p in cells if p in self.possible_pits])
+            self._refresh_safe()
+        else:
+            self._rule_out_pits([p for p in self.possible_pits if p not in cells])
+
+    def _restrict_wumpus(self, cells):
+        if self.possible_wumpus.complement:
+            self._replace(self.possible_wumpus, [w for w in cells if w in self.possible_wumpus])
+            self._refresh_safe()
+        else:
+            self._rule_out_wumpus([w for w in self.possible_wumpus if w not in cells])
+
+    def _mark_if_safe(self, pos: Tuple[int, int]):
+        if (pos not in self.possible_pits and pos not in self.possible_wumpus
+                and pos not in self.definite_pits and pos not in self.definite_wumpus
+                and pos not in self.safe):
+            self._add(self.safe, pos)
+            self._log_safe(pos)
+
+    def _replace(self, cells: CellSet, kept):
+        # CellSet.replace rebinds its fields, so the old ones make the undo entry
+        self._set(cells, 'cells', cells.cells)
+        self._set(cells, 'complement', cells.complement)
+        cells.replace(kept)
+
+    def _log_safe(self, pos: Tuple[int, int]):
+        self.safe_log.append(pos)
+        if self._trail is not None:
+            self._trail.append((self.safe_log.pop,))
+        if self._logged is not None:
+            self._add(self._logged, pos)
+
+    def _log_frontier(self, pos: Tuple[int, int]):
+        for cell in (pos, *self._get_adjacent(pos)):
+            if cell in self.safe and cell not in self._logged:
+                self._log_safe(cell)
+
+    def _refresh_safe(self):
+        """Recompute safe in closed form after a suspect set left complement mode"""
+        dangers = self.possible_pits | self.possible_wumpus | self.definite_pits | self.definite_wumpus
+        safe = dangers.inverted()
+        if safe.complement and not self.safe.complement:
+            # Nearly the whole grid just became safe; log only what borders the explored area
+            self._set(self, 'safe', safe)
+            self._set(self, 'safe_resets', self.safe_resets + 1)
+            self._set(self, '_logged', set(self.safe_log))
+            for pos in self.visited:
+                self._log_frontier(pos)
+            return
+        if safe.complement:
+            gained = self.safe.cells - safe.cells
+        else:
+            gained = safe.cells - self.safe.cells
+        for pos in sorted(gained):
+            self._add(self.safe, pos)
+            self._log_safe(pos)
 
     def _infer_definite_locations(self):
         # If only one possible location for pit/wumpus, it's definite
         if len(self.possible_pits) == 1:
             pit_pos = next(iter(self.possible_pits))
-            self.definite_pits.add(pit_pos)
-            self.possible_pits.clear()
+            self._discard(self.possible_pits, pit_pos)
+            self._add(self.definite_pits, pit_pos)
 
         if len(self.possible_wumpus) == 1 and self.wumpus_alive:
             wumpus_pos = next(iter(self.possible_wumpus))
-            self.definite_wumpus.add(wumpus_pos)
-            self.possible_wumpus.clear()
-
-        # Update safe cells
-        all_possible_dangers = self.possible_pits | self.possible_wumpus
-        for i in range(self.n):
-            for j in range(self.n):
-                pos = (i, j)
-                if pos not in self.visited and pos not in all_possible_dangers:
-                    self.safe.add(pos)
+            self._discard(self.possible_wumpus, wumpus_pos)
+            self._add(self.definite_wumpus, wumpus_pos)
 
     def is_safe(self, pos: Tuple[int, int]) -> bool:
         return pos in self.safe
 
     def get_safe_moves(self, pos: Tuple[int, int], orientation: int) -> List[int]:
         moves = []
-        adjacent = self._get_adjacent(pos)
 
         # Check forward move
         forward_pos = self._get_forward_pos(pos, orientation)
@@ -131,33 +266,26 @@ class KnowledgeBase:
 
         return True
 
-    def _get_adjacent(self, pos: Tuple[int, int]) -> List[Tuple[int, int]]:
-        i, j = pos
-        adjacent = []
-        for di, dj in [(-1, 0), (1, 0), (0, -1), (0, 1)]:
-            ni, nj = i + di, j + dj
-            if 0 <= ni < self.n and 0 <= nj < self.n:
-                adjacent.append((ni, nj))
-        return adjacent
+    def _get_adjacent(self, pos: Tuple[int, int]) -> Tuple[Tuple[int, int], ...]:
+        return self.topology.adjacent(pos)
 
     def _get_forward_pos(self, pos: Tuple[int, int], orientation: int) -> Optional[Tuple[int, int]]:
-        i, j = pos
-        if orientation == self.TOP:
-            return (i-1, j) if i > 0 else None
-        elif orientation == self.BOTTOM:
-            return (i+1, j) if i < self.n-1 else None
-        elif orientation == self.LEFT:
-            return (i, j-1) if j > 0 else None
-        elif orientation == self.RIGHT:
-            return (i, j+1) if j < self.n-1 else None
-        return None
+        return self.topology.forward_pos(pos, orientation)
 
     def mark_wumpus_dead(self):
-        self.wumpus_alive = False
-        self.possible_wumpus.clear()
-        self.definite_wumpus.clear()
-        # Recalculate safe cells
-        self._infer_definite_locations()
+        self._set(self, 'wumpus_alive', False)
+        was_complement = self.possible_wumpus.complement
+        # Only the cells that were wumpus suspects can change status
+        released = list(self.definite_wumpus)
+        if not was_complement:
+            released += list(self.possible_wumpus)
+        self._replace(self.possible_wumpus, ())
+        self._set(self, 'definite_wumpus', set())
+        if was_complement:
+            self._refresh_safe()
+            return
+        for pos in released:
+            self._mark_if_safe(pos)
 
     def mark_arrow_used(self):
-        self.arrow_used = True
\ No newline at end of file
+        self._set(self, 'arrow_used', True)
\ No newline at end of file
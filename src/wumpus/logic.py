@@ -0,0 +1,301 @@
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from .cell import Cell
+from .knowledge_base import KnowledgeBase
+
+
+class IncrementalSolver:
+    """DPLL SAT solver with two-watched-literal unit propagation.
+
+    Clauses are only ever added, never removed, so every fact derived at
+    decision level 0 stays valid; those facts and every entailment proved by
+    `entails` are kept as permanent units and reused by later queries.
+    Literals are non-zero ints: v means variable v is true, -v means false.
+    """
+
+    def __init__(self):
+        self.num_vars = 0
+        self.clauses: List[List[int]] = []
+        self.watches: Dict[int, List[int]] = {}
+        self.value: List[Optional[bool]] = [None]
+        self.trail: List[int] = []
+        self.trail_lim: List[int] = []
+        self.flipped: List[bool] = []
+        self.qhead = 0
+        self.next_var = 1
+        self.ok = True
+        self.model: List[Optional[bool]] = []
+
+    def copy(self) -> 'IncrementalSolver':
+        """Independent solver in the same state; clauses are copied since propagation reorders them"""
+        other = IncrementalSolver.__new__(IncrementalSolver)
+        other.__dict__.update(self.__dict__)
+        other.clauses = [list(clause) for clause in self.clauses]
+        other.watches = {lit: list(watching) for lit, watching in self.watches.items()}
+        for name in ('value', 'trail', 'trail_lim', 'flipped', 'model'):
+            setattr(other, name, list(getattr(self, name)))
+        return other
+
+    def new_var(self) -> int:
+        self.num_vars += 1
+        self.value.append(None)
+        self.watches[self.num_vars] = []
+        self.watches[-self.num_vars] = []
+        return self.num_vars
+
+    def lit_value(self, lit: int) -> Optional[bool]:
+        value = self.value[abs(lit)]
+        if value is None:
+            return None
+        return value if lit > 0 else not value
+
+    def add_clause(self, lits: Iterable[int]) -> bool:
+        """Add a clause permanently; returns False once the formula is unsatisfiable"""
+        self._backtrack(0)
+        if not self.ok:
+            return False
+        clause: List[int] = []
+        for lit in dict.fromkeys(lits):
+            value = self.lit_value(lit)
+            if value is True or -lit in clause:
+                return True
+            if value is None:
+                clause.append(lit)
+
+        if not clause:
+            self.ok = False
+        elif len(clause) == 1:
+            self._enqueue(clause[0])
+            if self._propagate() is not None:
+                self.ok = False
+        else:
+            idx = len(self.clauses)
+            self.clauses.append(clause)
+            self.watches[clause[0]].append(idx)
+            self.watches[clause[1]].append(idx)
+        return self.ok
+
+    def solve(self, assumptions: Iterable[int] = ()) -> bool:
+        """Satisfiability under assumptions; on success the assignment is left in self.model"""
+        self._backtrack(0)
+        if not self.ok:
+            return False
+        for lit in assumptions:
+            value = self.lit_value(lit)
+            if value is False:
+                self._backtrack(0)
+                return False
+            if value is None:
+                self._decide(lit, flipped=True)  # assumptions are never flipped
+                if self._propagate() is not None:
+                    self._backtrack(0)
+                    return False
+        base = len(self.trail_lim)
+
+        while True:
+            var = self._pick_var()
+            if var is None:
+                self.model = list(self.value)
+                self._backtrack(0)
+                return True
+            # Hazards are rare, so try "absent" first
+            self._decide(-var, flipped=False)
+            while self._propagate() is not None:
+                while len(self.trail_lim) > base and self.flipped[-1]:
+                    self._backtrack(len(self.trail_lim) - 1)
+                if len(self.trail_lim) <= base:
+                    self._backtrack(0)
+                    return False
+                decision = self.trail[self.trail_lim[-1]]
+                self._backtrack(len(self.trail_lim) - 1)
+                self._decide(-decision, flipped=True)
+
+    def entails(self, lit: int) -> bool:
+        """True if every model makes lit true; a proof is kept as a permanent unit"""
+        if self.lit_value(lit) is True and not self.trail_lim:
+            return True
+        if self.solve([-lit]):
+            return False
+        self.add_clause([lit])
+        return True
+
+    def _decide(self, lit: int, flipped: bool):
+        self.trail_lim.append(len(self.trail))
+        self.flipped.append(flipped)
+        self._enqueue(lit)
+
+    def _enqueue(self, lit: int):
+        self.value[abs(lit)] = lit > 0
+        self.trail.append(lit)
+
+    def _pick_var(self) -> Optional[int]:
+        while self.next_var <= self.num_vars and self.value[self.next_var] is not None:
+            self.next_var += 1
+        return self.next_var if self.next_var <= self.num_vars else None
+
+    def _backtrack(self, level: int):
+        while len(self.trail_lim) > level:
+            start = self.trail_lim.pop()
+            self.flipped.pop()
+            for lit in self.trail[start:]:
+                var = abs(lit)
+                self.value[var] = None
+                if var < self.next_var:
+                    self.next_var = var
+            del self.trail[start:]
+        self.qhead = min(self.qhead, len(self.trail))
+
+    def _propagate(self) -> Optional[int]:
+        """Unit propagation; returns the index of a conflicting clause, if any"""
+        while self.qhead < len(self.trail):
+            false_lit = -self.trail[self.qhead]
+            self.qhead += 1
+            watchers = self.watches[false_lit]
+            kept: List[int] = []
+            for pos, ci in enumerate(watchers):
+                clause = self.clauses[ci]
+                if clause[0] == false_lit:
+                    clause[0], clause[1] = clause[1], clause[0]
+                if self.lit_value(clause[0]) is True:
+                    kept.append(ci)
+                    continue
+                for k in range(2, len(clause)):
+                    if self.lit_value(clause[k]) is not False:
+                        clause[1], clause[k] = clause[k], clause[1]
+                        self.watches[clause[1]].append(ci)
+                        break
+                else:
+                    kept.append(ci)
+                    if self.lit_value(clause[0]) is False:
+                        kept.extend(watchers[pos + 1:])
+                        self.watches[false_lit] = kept
+                        self.qhead = len(self.trail)
+                        return ci
+                    self._enqueue(clause[0])
+            self.watches[false_lit] = kept
+        return None
+
+
+class LogicKnowledgeBase(KnowledgeBase):
+    """KnowledgeBase whose conclusions are propositional entailments.
+
+    Each percept adds clauses over P(i,j) (pit) and W(i,j) (wumpus) variables:
+    a breeze gives P(a) ∨ P(b) ∨ ..., no breeze gives ¬P for each neighbour,
+    and likewise for stench and W. The world holds exactly one wumpus, so a
+    stench also adds pairwise at-most-one clauses and rules out W outside the
+    first stench's neighbourhood. Frontier cells are then asked "is ¬P / P /
+    ¬W / W entailed?" against the incremental solver, which stays sound with
+    any number of pits.
+    """
+
+    def __init__(self, n: int):
+        super().__init__(n)
+        self.solver = IncrementalSolver()
+        self.pit_vars: Dict[Tuple[int, int], int] = {}
+        self.wumpus_vars: Dict[Tuple[int, int], int] = {}
+        self.frontier: Set[Tuple[int, int]] = set()
+        self._wumpus_zone: Optional[Set[Tuple[int, int]]] = None
+        self._solver_shared = False
+
+    def snapshot(self) -> int:
+        # The solver is copied on the first update after a snapshot, not here
+        mark = super().snapshot()
+        self._set(self, '_solver_shared', True)
+        return mark
+
+    def _own_solver(self):
+        for name, value in (('solver', self.solver.copy()), ('pit_vars', dict(self.pit_vars)),
+                            ('wumpus_vars', dict(self.wumpus_vars)), ('frontier', set(self.frontier)),
+                            ('_solver_shared', False)):
+            self._set(self, name, value)
+
+    def update_knowledge(self, pos: Tuple[int, int], sensors: dict):
+        # A revisited cell repeats percepts the solver already holds
+        if pos in self.visited:
+            return
+        if self._solver_shared:
+            self._own_solver()
+        super().update_knowledge(pos, sensors)
+
+    def _pit(self, pos: Tuple[int, int]) -> int:
+        var = self.pit_vars.get(pos)
+        if var is None:
+            var = self.pit_vars[pos] = self.solver.new_var()
+        return var
+
+    def _wumpus(self, pos: Tuple[int, int]) -> int:
+        var = self.wumpus_vars.get(pos)
+        if var is None:
+            var = self.wumpus_vars[pos] = self.solver.new_var()
+            if self._wumpus_zone is not None and pos not in self._wumpus_zone:
+                self.solver.add_clause([-var])
+        return var
+
+    def _update_possible_locations(self, pos: Tuple[int, int], sensors: dict):
+        solver = self.solver
+        adjacent = self._get_adjacent(pos)
+
+        solver.add_clause([-self._pit(pos)])
+        if self.wumpus_alive:
+            solver.add_clause([-self._wumpus(pos)])
+
+        if sensors[Cell.BREEZE]:
+            solver.add_clause([self._pit(a) for a in adjacent])
+        else:
+            for a in adjacent:
+                solver.add_clause([-self._pit(a)])
+            self._rule_out_pits(adjacent)
+
+        if sensors[Cell.STENCH]:
+            wumpus_lits = [self._wumpus(a) for a in adjacent]
+            solver.add_clause(wumpus_lits)
+            for k, first in enumerate(wumpus_lits):
+                for second in wumpus_lits[k + 1:]:
+                    solver.add_clause([-first, -second])
+            if self._wumpus_zone is None:
+                self._set(self, '_wumpus_zone', set(adjacent))
+                for other, var in self.wumpus_vars.items():
+                    if other not in self._wumpus_zone:
+                        solver.add_clause([-var])
+            if self.wumpus_alive:
+                self._restrict_wumpus(adjacent)
+        else:
+            for a in adjacent:
+                solver.add_clause([-self._wumpus(a)])
+            if self.wumpus_alive:
+                self._rule_out_wumpus(adjacent)
+
+        self.frontier.discard(pos)
+        self.frontier.update(a for a in adjacent if a not in self.visited)
+
+    def _infer_definite_locations(self):
+        solver = self.solver
+        if not solver.solve():
+            return  # Contradictory percepts; keep what is already known
+        model = solver.model
+
+        # A cell can only be entailed to take the value it has in this model
+        for cell in list(self.frontier):
+            if cell in self.possible_pits:
+                var = self.pit_vars[cell]
+                if not model[var]:
+                    if solver.entails(-var):
+                        self._rule_out_pits((cell,))
+                elif solver.entails(var):
+                    self._discard(self.possible_pits, cell)
+                    self._add(self.definite_pits, cell)
+
+            if self.wumpus_alive and cell in self.possible_wumpus:
+                var = self.wumpus_vars[cell]
+                if not model[var]:
+                    if solver.entails(-var):
+                        self._rule_out_wumpus((cell,))
+                elif solver.entails(var):
+                    self._confirm_wumpus(cell)
+
+        if len(self.possible_wumpus) == 1 and self.wumpus_alive:
+            self._confirm_wumpus(next(iter(self.possible_wumpus)))
+
+    def _confirm_wumpus(self, pos: Tuple[int, int]):
+        self._discard(self.possible_wumpus, pos)
+        self._restrict_wumpus(())
+        self._add(self.definite_wumpus, pos)
@@ -5,12 +5,46 @@ Wumpus World Game - CLI Application
 A complete implementation of the Wumpus World problem with AI agent inference.
 """
 
-import argparse
 import sys
-from .game_controller import GameController
-from .cli_view import CLIView
+
+def run_subcommand(argv: list[str]) -> bool:
+    """Dispatch `wumpus <command> ...`; returns False if argv is not a subcommand"""
+    if not argv:
+        return False
+    if argv[0] == 'tournament':
+        from .tournament import main as tournament_main
+        tournament_main(argv[1:])
+        return True
+    if argv[0] == 'corpus':
+        from .corpus import main as corpus_main
+        corpus_main(argv[1:])
+        return True
+    if argv[0] == 'replay':
+        from .trace_log import main as replay_main
+        replay_main(argv[1:])
+        return True
+    if argv[0] == 'stats':
+        from .results import main as stats_main
+        stats_main(argv[1:])
+        return True
+    if argv[0] == 'serve':
+        from .server import main as serve_main
+        serve_main(argv[1:])
+        return True
+    return False
 
 def main():
+    if run_subcommand(sys.argv[1:]):
+        return
+
+    # Imported here so that importing this module (e.g. for run_subcommand) stays cheap
+    import argparse
+    import random
+    from .cli_view import CLIView
+    from .game_controller import GameController
+    from .renderer import TerminalRenderer
+    from .trace_log import TraceRecorder
+
     parser = argparse.ArgumentParser(
         description="Wumpus World Game - An AI agent navigates a dangerous world to find gold.",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -19,7 +53,15 @@ Examples:
   python -m wumpus.main          # Play with default 4x4 world
   python -m wumpus.main -n 6     # Play with 6x6 world
   python -m wumpus.main -s 42    # Play with seed 42 for reproducible world
+  python -m wumpus.main --profile  # Report where time and memory went
+  python -m wumpus.main --plain  # Print the full board after every action
+  python -m wumpus.main --record games.trace  # Append this game to a trace
   python -m wumpus.main --help   # Show this help
+  wumpus tournament --help       # Headless multi-process policy tournament
+  wumpus corpus build --help     # Pre-generate worlds into a memory-mapped file
+  wumpus replay games.trace --game 0 --step 12  # Inspect a recorded game
+  wumpus serve --port 8765        # Host many games over JSON lines
+  wumpus stats results/           # Aggregate columnar tournament results
         """
     )
 
@@ -36,6 +78,24 @@ Examples:
         help='Random seed for reproducible world generation'
     )
 
+    parser.add_argument(
+        '--profile',
+        action='store_true',
+        help='Print per-phase timings, counters and peak memory when the game ends'
+    )
+
+    parser.add_argument(
+        '--plain',
+        action='store_true',
+        help='Print the whole board after every action instead of redrawing a viewport'
+    )
+
+    parser.add_argument(
+        '--record',
+        metavar='PATH',
+        help='Append the game to a binary trace for `wumpus replay`'
+    )
+
     args = parser.parse_args()
 
     if args.size < 3:
@@ -44,11 +104,31 @@ Examples:
 
     try:
         # Create MVC components
-        controller = GameController(args.size, args.seed)
+        seed = args.seed
+        if args.record and seed is None:
+            seed = random.randrange(2 ** 31)  # Replays need a concrete seed
+        controller = GameController(args.size, seed)
+        if args.profile:
+            controller.enable_profiling(track_memory=True)
+        recorder = None
+        if args.record:
+            recorder = TraceRecorder(args.record)
+            game = controller.record_to(recorder)
+            print(f"Recording game {game} (seed {seed}) to {args.record}")
+        if not args.plain:
+            controller.renderer = TerminalRenderer(controller.agent)
         view = CLIView(controller)
 
         # Start the game
-        view.run_game()
+        try:
+            view.run_game()
+        finally:
+            if recorder is not None:
+                recorder.close()
+
+        if controller.stats is not None:
+            print(controller.stats.report(), file=sys.stderr)
+            controller.stats.close()
 
     except KeyboardInterrupt:
         print("\n\nGame interrupted by user.")
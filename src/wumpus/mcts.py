@@ -0,0 +1,314 @@
+import math
+import random
+from collections import OrderedDict
+from functools import lru_cache
+from time import perf_counter
+from typing import Dict, List, Optional, Tuple
+from .agent import Agent
+from .cell import Cell
+from .knowledge_base import KnowledgeBase
+from .probability import HazardProbability
+from .world_spec import WorldSpec
+
+Pos = Tuple[int, int]
+MASK64 = (1 << 64) - 1
+QUIT = -1  # Internal stand-in for returning None
+SCALE = 1000.0  # Scores are divided by this so UCT values stay near [-1, 1]
+
+# Zobrist feature tags
+VISIT, POSE, ARROW_USED, WUMPUS_DEAD = range(4)
+
+
+def _splitmix64(x: int) -> int:
+    x = (x + 0x9E3779B97F4A7C15) & MASK64
+    x = ((x ^ (x >> 30)) * 0xBF58476D1CE4E5B9) & MASK64
+    x = ((x ^ (x >> 27)) * 0x94D049BB133111EB) & MASK64
+    return x ^ (x >> 31)
+
+
+@lru_cache(maxsize=1 << 16)
+def zobrist(tag: int, i: int = 0, j: int = 0, extra: int = 0) -> int:
+    """Random-looking 64-bit key for one belief feature, derived rather than tabled so any n works"""
+    return _splitmix64(_splitmix64(_splitmix64(_splitmix64(tag) ^ i) ^ j) ^ extra)
+
+
+def belief_hash(kb: KnowledgeBase, pos: Pos, orientation: int) -> int:
+    """XOR of the pose and of every visited cell with the breeze/stench it showed.
+
+    KnowledgeBase beliefs are a function of these observations, so equal
+    hashes mean equal beliefs however the cells were reached, and a move
+    updates the hash with one or two XORs.
+    """
+    h = zobrist(POSE, pos[0], pos[1], orientation)
+    for cell in kb.visited:
+        h ^= zobrist(VISIT, cell[0], cell[1], (cell in kb.breeze_cells) | (cell in kb.stench_cells) << 1)
+    if kb.arrow_used:
+        h ^= zobrist(ARROW_USED)
+    if not kb.wumpus_alive:
+        h ^= zobrist(WUMPUS_DEAD)
+    return h
+
+
+class _Node:
+    __slots__ = ('visits', 'stats')
+
+    def __init__(self):
+        self.visits = 0
+        self.stats: Dict[int, List[float]] = {}  # action -> [visits, total value]
+
+
+class _SampledWorld:
+    """One world consistent with the percepts at the root.
+
+    Each frontier component's pits are drawn jointly, as one of the
+    configurations HazardProbability enumerated for its breezes; cells no
+    breeze constrains are drawn lazily from the prior when first touched.
+    """
+
+    def __init__(self, policy: 'MCTSPolicy', kb: KnowledgeBase, rng: random.Random):
+        self.policy = policy
+        self.kb = kb
+        self.rng = rng
+        self.pits: Dict[Pos, bool] = {}
+        for cells, component in policy._pit_components:
+            if component.configurations:
+                mask = component.sample(rng)
+                for k, cell in enumerate(cells):
+                    self.pits[cell] = bool(mask >> k & 1)
+        self.wumpus = self._pick_wumpus()
+        self.gold = self._pick_cell(
+            lambda c: c not in kb.visited and c != self.wumpus and not self.is_pit(c))
+
+    def _pick_cell(self, accept, tries: int = 64) -> Optional[Pos]:
+        n = self.kb.n
+        for _ in range(tries):
+            cell = (self.rng.randrange(n), self.rng.randrange(n))
+            if accept(cell):
+                return cell
+        return None
+
+    def _pick_wumpus(self) -> Optional[Pos]:
+        kb = self.kb
+        if not kb.wumpus_alive:
+            return None
+        if len(kb.definite_wumpus) == 1:
+            return next(iter(kb.definite_wumpus))
+        candidates = self.policy._wumpus_candidates
+        if candidates is not None:
+            return self.rng.choice(candidates) if candidates else None
+        excluded = self.policy._wumpus_excluded
+        return self._pick_cell(lambda c: c not in excluded and c not in kb.safe)
+
+    def is_pit(self, cell: Pos) -> bool:
+        pit = self.pits.get(cell)
+        if pit is None:
+            kb = self.kb
+            if cell in kb.definite_pits:
+                pit = True
+            elif cell in kb.safe or cell in self.policy._pit_free:
+                pit = False
+            else:
+                pit = self.rng.random() < self.policy._pit_prior
+            self.pits[cell] = pit
+        return pit
+
+    def sensors(self, cell: Pos) -> dict:
+        adjacent = self.kb._get_adjacent(cell)
+        return {
+            Cell.BREEZE: any(self.is_pit(a) for a in adjacent),
+            Cell.STENCH: self.kb.wumpus_alive and self.wumpus in adjacent,
+            Cell.GLITTER: cell == self.gold,
+            Cell.BUMP: False,
+            Cell.SCREAM: False,
+        }
+
+
+class MCTSPolicy:
+    """Monte Carlo tree search over KnowledgeBase belief states.
+
+    Every iteration samples a world that agrees with the current beliefs
+    (pits drawn jointly per HazardProbability component, one wumpus among
+    the cells it can still be in, gold on an unvisited pit-free cell) and
+    walks the tree with UCT. The walk feeds the sampled percepts into the
+    real KnowledgeBase inside a snapshot, so beliefs evolve exactly as in
+    play, and restore() undoes it. Nodes are
+    keyed by belief_hash, so paths that reach the same beliefs share
+    statistics, and live in a transposition table of at most `max_nodes`
+    entries with least-recently-used eviction. A move is chosen after
+    `iterations` walks or `time_budget` seconds, whichever comes first.
+
+    Unlike LogicPolicy it will step into a cell that is not provably safe when
+    that is worth the risk. It only considers quitting once every provably
+    safe cell has been visited.
+    """
+
+    def __init__(self, iterations: int = 200, time_budget: Optional[float] = None,
+                 max_nodes: int = 50_000, horizon: int = 40, exploration: float = 1.0,
+                 pit_prior: Optional[float] = None, seed: Optional[int] = None):
+        self.iterations = iterations
+        self.time_budget = time_budget
+        self.max_nodes = max_nodes
+        self.horizon = horizon
+        self.exploration = exploration
+        self.pit_prior = pit_prior
+        self.rng = random.Random(seed)
+        self.table: OrderedDict[int, _Node] = OrderedDict()
+        self.evictions = 0
+        self.last_iterations = 0
+
+    def reset(self):
+        self.table.clear()
+
+    def choose_action(self, percepts: dict[int, bool], kb: KnowledgeBase,
+                      pos: Tuple[int, int], orientation: int) -> Optional[int]:
+        if percepts[Cell.GLITTER]:
+            return Agent.GRAB
+        self._prepare(kb)
+        root = belief_hash(kb, pos, orientation)
+
+        start = perf_counter()
+        done = 0
+        while done < self.iterations:
+            if self.time_budget is not None and done and perf_counter() - start >= self.time_budget:
+                break
+            world = _SampledWorld(self, kb, self.rng)
+            mark = kb.snapshot()
+            try:
+                self._search(kb, world, pos, orientation, root, 0)
+            finally:
+                kb.restore(mark)
+            done += 1
+        self.last_iterations = done
+
+        node = self.table.get(root)
+        if node is None or not node.stats:
+            return None
+        best = max(node.stats, key=lambda a: (node.stats[a][0], node.stats[a][1]))
+        return None if best == QUIT else best
+
+    def _prepare(self, kb: KnowledgeBase):
+        """Per-move belief summaries the sampled worlds draw from"""
+        engine = HazardProbability(self._prior(kb))
+        self._pit_prior = engine.pit_prior
+        self._pit_free, self._pit_components = engine.pit_components(kb)
+        candidates, self._wumpus_excluded = engine.wumpus_support(kb)
+        self._wumpus_candidates = sorted(candidates) if candidates is not None else None
+
+    def _prior(self, kb: KnowledgeBase) -> float:
+        if self.pit_prior is not None:
+            return self.pit_prior
+        # The classic world's pit count spread over the cells other than the start
+        return WorldSpec().pit_count(kb.n) / max(kb.n * kb.n - 1, 1)
+
+    def _actions(self, kb: KnowledgeBase, pos: Pos, orientation: int) -> List[int]:
+        actions = [facing for facing in (Agent.TOP, Agent.RIGHT, Agent.BOTTOM, Agent.LEFT)
+                   if facing != orientation]
+        if kb._get_forward_pos(pos, orientation) is not None:
+            actions.append(Agent.FORWARD)
+        if kb.should_shoot(pos, orientation):
+            actions.append(Agent.SHOOT)
+        # Exploring a provably safe cell never hurts more than its step cost,
+        # so quitting is only weighed once none is left
+        if kb.safe <= kb.visited:
+            actions.append(QUIT)
+        return actions
+
+    def _lookup(self, h: int) -> Optional[_Node]:
+        node = self.table.get(h)
+        if node is not None:
+            self.table.move_to_end(h)
+        return node
+
+    def _store(self, h: int) -> _Node:
+        node = self.table[h] = _Node()
+        if len(self.table) > self.max_nodes:
+            self.table.popitem(last=False)
+            self.evictions += 1
+        return node
+
+    def _select(self, node: _Node, actions: List[int]) -> int:
+        untried = [a for a in actions if a not in node.stats]
+        if untried:
+            return self.rng.choice(untried)
+        log_n = math.log(node.visits)
+        best, best_score = actions[0], -math.inf
+        for action in actions:
+            count, total = node.stats[action]
+            score = total / count + self.exploration * math.sqrt(log_n / count)
+            if score > best_score:
+                best, best_score = action, score
+        return best
+
+    def _search(self, kb: KnowledgeBase, world: _SampledWorld, pos: Pos, orientation: int,
+                h: int, depth: int) -> float:
+        if depth >= self.horizon:
+            return 0.0
+        node = self._lookup(h)
+        if node is None:
+            self._store(h)
+            return self._rollout(kb, world, pos, orientation, depth)
+
+        action = self._select(node, self._actions(kb, pos, orientation))
+        reward, done, pos, next_orientation, next_h = self._apply(kb, world, pos, orientation, h, action)
+        value = reward if done else reward + self._search(kb, world, pos, next_orientation, next_h, depth + 1)
+
+        node.visits += 1
+        stats = node.stats.setdefault(action, [0, 0.0])
+        stats[0] += 1
+        stats[1] += value
+        return value
+
+    def _apply(self, kb: KnowledgeBase, world: _SampledWorld, pos: Pos, orientation: int,
+               h: int, action: int) -> Tuple[float, bool, Pos, int, int]:
+        """(reward, game over, position, orientation, hash) after one action in the sampled world"""
+        if action == QUIT:
+            return 0.0, True, pos, orientation, h
+        if action == Agent.SHOOT:
+            kb.mark_arrow_used()
+            h ^= zobrist(ARROW_USED)
+            reward = -10
+            if world.wumpus is not None and world.wumpus in kb.definite_wumpus:
+                kb.mark_wumpus_dead()
+                h ^= zobrist(WUMPUS_DEAD)
+                reward += 500
+            return reward / SCALE, False, pos, orientation, h
+        if action != Agent.FORWARD:
+            h ^= zobrist(POSE, pos[0], pos[1], orientation) ^ zobrist(POSE, pos[0], pos[1], action)
+            return -1 / SCALE, False, pos, action, h
+
+        target = kb._get_forward_pos(pos, orientation)
+        if world.is_pit(target) or (kb.wumpus_alive and target == world.wumpus):
+            return -1001 / SCALE, True, target, orientation, h
+        h ^= zobrist(POSE, pos[0], pos[1], orientation) ^ zobrist(POSE, target[0], target[1], orientation)
+        if target == world.gold:
+            return 999 / SCALE, True, target, orientation, h
+        if target not in kb.visited:
+            sensors = world.sensors(target)
+            kb.update_knowledge(target, sensors)
+            h ^= zobrist(VISIT, target[0], target[1], sensors[Cell.BREEZE] | sensors[Cell.STENCH] << 1)
+        return -1 / SCALE, False, target, orientation, h
+
+    def _rollout(self, kb: KnowledgeBase, world: _SampledWorld, pos: Pos, orientation: int,
+                 depth: int) -> float:
+        """Cautious random walk through provably safe cells, preferring unvisited ones"""
+        value = 0.0
+        while depth < self.horizon:
+            options = []
+            for facing in (Agent.TOP, Agent.RIGHT, Agent.BOTTOM, Agent.LEFT):
+                target = kb._get_forward_pos(pos, facing)
+                if target is not None and kb.is_safe(target):
+                    options.append((target in kb.visited, facing, target))
+            if not options:
+                return value  # Nothing safe left: quit
+            fresh = [option for option in options if not option[0]]
+            _, facing, target = self.rng.choice(fresh or options)
+            value -= (2 if facing != orientation else 1) / SCALE
+            depth += 1 if facing == orientation else 2
+            orientation, pos = facing, target
+            if pos == world.gold:
+                return value + 1000 / SCALE
+            if world.is_pit(pos) or (kb.wumpus_alive and pos == world.wumpus):
+                return value - 1000 / SCALE
+            if pos not in kb.visited:
+                kb.update_knowledge(pos, world.sensors(pos))
+        return value
@@ -0,0 +1,169 @@
+"""
+Full-information oracle - the best score each world allows, for a whole batch at once.
+
+The oracle sees the hazards, so its answer bounds what any policy can score
+on the same world: regret = bound - score is never negative. States are
+(orientation, row, column) as the Agent moves: a turn to any orientation
+costs 1, FORWARD costs 1 and entering a pit, or the wumpus while it lives,
+is fatal. Shortest costs over the (B, 4, n, n) state planes are found by
+relaxing every world together until nothing improves; each round carries
+costs along whole straight runs, so rounds grow with the number of turns
+on a path rather than its length.
+
+Shooting is assumed possible as soon as the wumpus is in line ahead; a real
+agent must first deduce where it is, so the bound is optimistic there, as
+an upper bound should be.
+"""
+
+from dataclasses import dataclass, fields
+from typing import Iterable, Optional
+import numpy as np
+from .agent import Agent
+from .cell import Cell
+from .pcg64 import default_rng
+from .world_batch import WorldBatch
+from .worldmanager import WorldManager
+from .world_spec import WorldSpec
+
+UNREACHABLE = np.iinfo(np.int32).max // 2
+BLOCK_CELLS = 1 << 18  # Cells solved together, which bounds solve()'s memory
+
+GOLD_REWARD = 1000
+KILL_REWARD = 500 - 10  # The kill minus the arrow
+
+
+@dataclass
+class OracleResult:
+    """Per-world arrays; costs count turns and moves, UNREACHABLE if impossible"""
+    plain_cost: np.ndarray  # To the gold without shooting
+    shoot_cost: np.ndarray  # To the gold after shooting the wumpus
+    fire_cost: np.ndarray   # To the cheapest spot to shoot from
+    bound: np.ndarray       # Best achievable score
+
+    @property
+    def solvable(self) -> np.ndarray:
+        return np.minimum(self.plain_cost, self.shoot_cost) < UNREACHABLE
+
+    @property
+    def shoot_helps(self) -> np.ndarray:
+        """True where the best play shoots the wumpus"""
+        return self.bound > _score(self.plain_cost, GOLD_REWARD)
+
+    def regret(self, scores) -> np.ndarray:
+        return self.bound - np.asarray(scores, dtype=np.int64)
+
+
+def _score(cost: np.ndarray, reward: int) -> np.ndarray:
+    """reward less the cost where reachable, else 0 (quitting at once)"""
+    return np.maximum(np.where(cost < UNREACHABLE, reward - cost.astype(np.int64), 0), 0)
+
+
+class _Runs:
+    """Carries costs along runs of free cells for one direction of travel.
+
+    step() gives out[k] = min(cost[m] + k - m) over m <= k along the axis
+    with no blocked cell in between, as a scan by doubling: the pass with
+    shift s lets each cell take from the cell s behind it, if that is still
+    in its run. `reach`, the number of free cells before each one in its
+    run, resets at every blocked cell, so every value fits in int32.
+    """
+
+    def __init__(self, blocked: np.ndarray, axis: int, reverse: bool):
+        self.axis = axis
+        self.index = [slice(None)] * blocked.ndim
+        if reverse:
+            self.index[axis] = slice(None, None, -1)
+        blocked = blocked[tuple(self.index)]
+        shape = [1] * blocked.ndim
+        shape[axis] = blocked.shape[axis]
+        step = np.arange(blocked.shape[axis], dtype=np.int32).reshape(shape)
+        last = np.maximum.accumulate(np.where(blocked, step, -1), axis=axis)
+        self.reach = step - last - 1  # -1 on blocked cells, which take from nothing
+
+    def _along(self, start: Optional[int], stop: Optional[int]) -> tuple:
+        index = [slice(None)] * self.reach.ndim
+        index[self.axis] = slice(start, stop)
+        return tuple(index)
+
+    def step(self, cost: np.ndarray) -> np.ndarray:
+        """cost must already be UNREACHABLE on blocked cells"""
+        index = tuple(self.index)
+        out = cost[index].copy()
+        shift = 1
+        while shift < out.shape[self.axis]:
+            ahead, behind = self._along(shift, None), self._along(None, -shift)
+            carried = out[behind] + shift
+            carried[self.reach[ahead] < shift] = UNREACHABLE
+            np.minimum(out[ahead], carried, out=out[ahead])
+            shift *= 2
+        return out[index]
+
+
+def _relax(dist: np.ndarray, passable: np.ndarray) -> np.ndarray:
+    """Lower dist (B, 4, n, n) in place until no turn or run of moves improves it"""
+    blocked = ~passable
+    dist[np.broadcast_to(blocked[:, None], dist.shape)] = UNREACHABLE
+    runs = {Agent.TOP: _Runs(blocked, 1, True), Agent.RIGHT: _Runs(blocked, 2, False),
+            Agent.BOTTOM: _Runs(blocked, 1, False), Agent.LEFT: _Runs(blocked, 2, True)}
+    while True:
+        before = dist.copy()
+        np.minimum(dist, dist.min(axis=1, keepdims=True) + 1, out=dist)
+        for orientation, run in runs.items():
+            dist[:, orientation] = run.step(dist[:, orientation])
+        if np.array_equal(dist, before):
+            return dist
+
+
+def line_of_fire(target: np.ndarray) -> np.ndarray:
+    """(B, 4, n, n): True where facing that orientation has a target cell strictly ahead"""
+    fire = np.zeros((target.shape[0], 4) + target.shape[1:], dtype=bool)
+    fire[:, Agent.TOP, 1:] = np.logical_or.accumulate(target, axis=1)[:, :-1]
+    fire[:, Agent.BOTTOM, :-1] = np.logical_or.accumulate(target[:, ::-1], axis=1)[:, ::-1][:, 1:]
+    fire[:, Agent.LEFT, :, 1:] = np.logical_or.accumulate(target, axis=2)[:, :, :-1]
+    fire[:, Agent.RIGHT, :, :-1] = np.logical_or.accumulate(target[:, :, ::-1], axis=2)[:, :, ::-1][:, :, 1:]
+    return fire
+
+
+def solve(planes: dict[int, np.ndarray]) -> OracleResult:
+    """Oracle over (B, n, n) WUMPUS, PIT and GOLD planes, e.g. WorldBatch.planes
+
+    Worlds are solved in blocks of about BLOCK_CELLS cells, so memory does
+    not grow with B.
+    """
+    count, n = planes[Cell.PIT].shape[:2]
+    size = max(1, BLOCK_CELLS // (n * n))
+    blocks = [_solve_block({flag: plane[start:start + size] for flag, plane in planes.items()})
+              for start in range(0, count, size)]
+    if len(blocks) == 1:
+        return blocks[0]
+    return OracleResult(*(np.concatenate([getattr(block, field.name) for block in blocks])
+                          for field in fields(OracleResult)))
+
+
+def _solve_block(planes: dict[int, np.ndarray]) -> OracleResult:
+    wumpus, pit, gold = planes[Cell.WUMPUS], planes[Cell.PIT], planes[Cell.GOLD]
+    count, n = pit.shape[0], pit.shape[1]
+    i, j = WorldManager.STARTPOS
+    gold = np.broadcast_to(gold[:, None], (count, 4, n, n))
+
+    dist = np.full((count, 4, n, n), UNREACHABLE, dtype=np.int32)
+    dist[:, Agent.RIGHT, i, j] = 0
+    alive = _relax(dist, ~pit & ~wumpus)
+    plain_cost = np.where(gold, alive, UNREACHABLE).min(axis=(1, 2, 3))
+
+    # Shooting takes no turn or move; afterwards the wumpus cell is safe
+    fire = line_of_fire(wumpus)
+    dist = np.where(fire, alive, UNREACHABLE)
+    fire_cost = dist.min(axis=(1, 2, 3))
+    shoot_cost = np.where(gold, _relax(dist, ~pit), UNREACHABLE).min(axis=(1, 2, 3))
+
+    bound = np.maximum.reduce([_score(plain_cost, GOLD_REWARD),
+                               _score(fire_cost, KILL_REWARD),  # Shoot, then quit
+                               _score(shoot_cost, GOLD_REWARD + KILL_REWARD)])
+    return OracleResult(plain_cost, shoot_cost, fire_cost, bound)
+
+
+def seed_planes(n: int, seeds: Iterable[int], spec: Optional[WorldSpec] = None) -> dict[int, np.ndarray]:
+    """WUMPUS, PIT and GOLD planes of the worlds GameController(n, seed) plays"""
+    return WorldBatch.layout_planes(n, [WorldManager.sample_layout(n, default_rng(seed), spec)
+                                        for seed in seeds])
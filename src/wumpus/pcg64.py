@@ -0,0 +1,155 @@
+"""
+Pure-Python twin of numpy.random.default_rng(seed).integers for world generation.
+
+Reimplements the three pieces numpy chains together - SeedSequence
+entropy mixing, the PCG64 (XSL-RR 128/64) bit generator with its buffered
+32-bit draws, and Lemire's bounded-integer method - closely enough that
+default_rng(seed).integers(high) returns the same sequence as numpy for any
+non-negative integer seed. World generation only needs a few dozen draws,
+so this avoids importing numpy in processes that never use it otherwise.
+"""
+
+import secrets
+from typing import Optional
+
+MASK32 = (1 << 32) - 1
+MASK64 = (1 << 64) - 1
+MASK128 = (1 << 128) - 1
+
+# numpy.random.bit_generator's SeedSequence constants
+POOL_SIZE = 4
+INIT_A = 0x43b0d7e5
+MULT_A = 0x931e8875
+INIT_B = 0x8b51f9dd
+MULT_B = 0x58f38ded
+MIX_MULT_L = 0xca01f9dd
+MIX_MULT_R = 0x4973f715
+XSHIFT = 16
+
+PCG_MULTIPLIER = 0x2360ED051FC65DA44385DF649FCCF645
+
+
+class SeedSequence:
+    """numpy.random.SeedSequence for a single non-negative integer of entropy"""
+
+    def __init__(self, entropy: Optional[int] = None):
+        if entropy is None:
+            entropy = secrets.randbits(128)
+        entropy = int(entropy)
+        if entropy < 0:
+            raise ValueError("expected non-negative integer")
+        self.entropy = entropy
+        words = []
+        while True:
+            words.append(entropy & MASK32)
+            entropy >>= 32
+            if not entropy:
+                break
+        self.pool = self._mix(words)
+
+    @staticmethod
+    def _mix(entropy: list[int]) -> list[int]:
+        hash_const = INIT_A
+
+        def hashmix(value: int) -> int:
+            nonlocal hash_const
+            value ^= hash_const
+            hash_const = hash_const * MULT_A & MASK32
+            value = value * hash_const & MASK32
+            return value ^ value >> XSHIFT
+
+        def mix(x: int, y: int) -> int:
+            result = (MIX_MULT_L * x - MIX_MULT_R * y) & MASK32
+            return result ^ result >> XSHIFT
+
+        pool = [hashmix(entropy[i] if i < len(entropy) else 0) for i in range(POOL_SIZE)]
+        for src in range(POOL_SIZE):
+            for dst in range(POOL_SIZE):
+                if src != dst:
+                    pool[dst] = mix(pool[dst], hashmix(pool[src]))
+        for src in range(POOL_SIZE, len(entropy)):
+            for dst in range(POOL_SIZE):
+                pool[dst] = mix(pool[dst], hashmix(entropy[src]))
+        return pool
+
+    def generate_state(self, n_words: int) -> list[int]:
+        """n_words 64-bit words, as generate_state(n_words, np.uint64) gives"""
+        hash_const = INIT_B
+        words32 = []
+        for k in range(2 * n_words):
+            value = self.pool[k % POOL_SIZE] ^ hash_const
+            hash_const = hash_const * MULT_B & MASK32
+            value = value * hash_const & MASK32
+            words32.append(value ^ value >> XSHIFT)
+        return [words32[2 * k] | words32[2 * k + 1] << 32 for k in range(n_words)]
+
+
+class PCG64:
+    """numpy.random.PCG64 output stream, including its spare 32-bit half"""
+
+    def __init__(self, seed_seq: SeedSequence):
+        s0, s1, i0, i1 = seed_seq.generate_state(4)
+        self.inc = ((i0 << 64 | i1) << 1 | 1) & MASK128
+        self.state = 0
+        self._step()
+        self.state = (self.state + (s0 << 64 | s1)) & MASK128
+        self._step()
+        self._spare: Optional[int] = None
+
+    def _step(self):
+        self.state = (self.state * PCG_MULTIPLIER + self.inc) & MASK128
+
+    def next_uint64(self) -> int:
+        self._step()
+        state = self.state
+        rot = state >> 122
+        xored = (state >> 64 ^ state) & MASK64
+        return (xored >> rot | xored << (64 - rot)) & MASK64
+
+    def next_uint32(self) -> int:
+        if self._spare is not None:
+            value, self._spare = self._spare, None
+            return value
+        value = self.next_uint64()
+        self._spare = value >> 32
+        return value & MASK32
+
+
+class Generator:
+    """The slice of numpy.random.Generator that world generation uses"""
+
+    def __init__(self, bit_generator: PCG64):
+        self.bit_generator = bit_generator
+
+    def integers(self, high: int) -> int:
+        """Uniform integer in [0, high), drawn exactly as numpy does for int64"""
+        bound = high - 1
+        if bound < 0:
+            raise ValueError("high <= 0")
+        if bound == 0:
+            return 0
+        if bound == MASK32:
+            return self.bit_generator.next_uint32()
+        if bound < MASK32:
+            return self._lemire32(bound + 1)
+        return self._lemire64(bound + 1)
+
+    def _lemire32(self, span: int) -> int:
+        m = self.bit_generator.next_uint32() * span
+        if m & MASK32 < span:
+            threshold = (MASK32 - (span - 1)) % span
+            while m & MASK32 < threshold:
+                m = self.bit_generator.next_uint32() * span
+        return m >> 32
+
+    def _lemire64(self, span: int) -> int:
+        m = self.bit_generator.next_uint64() * span
+        if m & MASK64 < span:
+            threshold = (MASK64 - (span - 1)) % span
+            while m & MASK64 < threshold:
+                m = self.bit_generator.next_uint64() * span
+        return m >> 64
+
+
+def default_rng(seed: Optional[int] = None) -> Generator:
+    return Generator(PCG64(SeedSequence(seed)))
@@ -0,0 +1,163 @@
+import heapq
+from typing import Dict, List, Optional, Tuple
+from .knowledge_base import KnowledgeBase
+
+State = Tuple[int, int, int]  # (row, column, orientation)
+INF = float('inf')
+FORWARD = 4
+
+
+class PathPlanner:
+    """Turn-aware shortest paths through a KnowledgeBase's safe cells, repaired incrementally.
+
+    D* Lite over (cell, orientation) states: facing any other direction costs
+    1 (as Agent.make_move does) and moving forward costs 1. The search runs
+    backwards from the goal, so when the agent moves only the key modifier
+    changes, and when cells become safe only the states touching them are
+    updated before the search tree is repaired. If the KnowledgeBase's safe
+    set flips to complement form or is rolled back the search starts over.
+    """
+
+    def __init__(self, kb: KnowledgeBase):
+        self.kb = kb
+        self.topology = kb.topology
+        self._log_cursor = 0
+        self._safe_resets = kb.safe_resets
+        self._restores = kb.restores
+        self.goal: Optional[Tuple[int, int]] = None
+        self.expanded = 0
+        self._reset_search()
+
+    def _reset_search(self):
+        self.g: Dict[State, float] = {}
+        self.rhs: Dict[State, float] = {}
+        self._queue: List[Tuple[Tuple[float, float], State]] = []
+        self._queued: Dict[State, Tuple[float, float]] = {}
+        self.km = 0
+        self._last_start: Optional[State] = None
+
+    def plan(self, pos: Tuple[int, int], orientation: int,
+             goal: Tuple[int, int]) -> Optional[List[int]]:
+        """Actions (facing constants and FORWARD) from pos to goal, or None if unreachable"""
+        start = (pos[0], pos[1], orientation)
+        if self.kb.safe_resets != self._safe_resets or self.kb.restores != self._restores:
+            # Safe cells were replaced wholesale or rolled back by KnowledgeBase.restore
+            self._safe_resets = self.kb.safe_resets
+            self._restores = self.kb.restores
+            self.goal = None
+        if goal != self.goal:
+            self.goal = goal
+            self._reset_search()
+            self._sync()
+            for o in range(4):
+                self.rhs[(goal[0], goal[1], o)] = 0
+                self._push((goal[0], goal[1], o), start)
+            self._last_start = start
+        else:
+            if self._last_start is not None and start != self._last_start:
+                self.km += self._h(self._last_start, start)
+            self._last_start = start
+            for cell in self._sync():
+                self._open(cell, start)
+
+        self._compute(start)
+        if self.g.get(start, INF) == INF:
+            return None if start[:2] != goal else []
+        return self._extract(start)
+
+    def _sync(self) -> List[Tuple[int, int]]:
+        """Pull cells that became safe since the last call"""
+        log = self.kb.safe_log
+        new_cells = log[self._log_cursor:]
+        self._log_cursor = len(log)
+        return new_cells
+
+    def _open(self, cell: Tuple[int, int], start: State):
+        # New edges: every state in the cell, and neighbours facing into it
+        i, j = cell
+        for o in range(4):
+            self._update((i, j, o), start)
+        for o in range(4):
+            behind = self.topology.forward_pos(cell, (o + 2) % 4)
+            if behind is not None and behind in self.kb.safe:
+                self._update((behind[0], behind[1], o), start)
+
+    def _h(self, a: State, b: State) -> int:
+        return abs(a[0] - b[0]) + abs(a[1] - b[1])
+
+    def _key(self, s: State, start: State) -> Tuple[float, float]:
+        best = min(self.g.get(s, INF), self.rhs.get(s, INF))
+        return (best + self._h(start, s) + self.km, best)
+
+    def _push(self, s: State, start: State):
+        key = self._key(s, start)
+        self._queued[s] = key
+        heapq.heappush(self._queue, (key, s))
+
+    def _successors(self, s: State):
+        i, j, o = s
+        for other in range(4):
+            if other != o:
+                yield (i, j, other)
+        ahead = self.topology.forward_pos((i, j), o)
+        if ahead is not None and ahead in self.kb.safe:
+            yield (ahead[0], ahead[1], o)
+
+    def _predecessors(self, s: State):
+        i, j, o = s
+        for other in range(4):
+            if other != o:
+                yield (i, j, other)
+        behind = self.topology.forward_pos((i, j), (o + 2) % 4)
+        if behind is not None and behind in self.kb.safe:
+            yield (behind[0], behind[1], o)
+
+    def _update(self, s: State, start: State):
+        if s[:2] != self.goal:
+            self.rhs[s] = min((1 + self.g.get(t, INF) for t in self._successors(s)), default=INF)
+        self._queued.pop(s, None)
+        if self.g.get(s, INF) != self.rhs.get(s, INF):
+            self._push(s, start)
+
+    def _top(self):
+        # Drop heap entries superseded by a later push or removal
+        while self._queue:
+            key, s = self._queue[0]
+            if self._queued.get(s) == key:
+                return key, s
+            heapq.heappop(self._queue)
+        return None
+
+    def _compute(self, start: State):
+        while True:
+            top = self._top()
+            if top is None:
+                return
+            key, u = top
+            if key >= self._key(start, start) and self.rhs.get(start, INF) == self.g.get(start, INF):
+                return
+            self.expanded += 1
+            new_key = self._key(u, start)
+            if key < new_key:
+                self._push(u, start)
+                continue
+            heapq.heappop(self._queue)
+            del self._queued[u]
+            if self.g.get(u, INF) > self.rhs.get(u, INF):
+                self.g[u] = self.rhs[u]
+                for p in self._predecessors(u):
+                    self._update(p, start)
+            else:
+                self.g[u] = INF
+                self._update(u, start)
+                for p in self._predecessors(u):
+                    self._update(p, start)
+
+    def _extract(self, start: State) -> List[int]:
+        actions = []
+        s = start
+        while s[:2] != self.goal:
+            step = min(self._successors(s), key=lambda t: self.g.get(t, INF))
+            actions.append(FORWARD if step[:2] != s[:2] else step[2])
+            s = step
+        return actions
@@ -0,0 +1,183 @@
+import random
+from typing import Callable, Optional, Protocol, Tuple
+from .agent import Agent
+from .cell import Cell
+from .knowledge_base import KnowledgeBase
+from .mcts import MCTSPolicy
+from .planner import PathPlanner
+from .probability import HazardProbability
+
+
+class Policy(Protocol):
+    """Picks the next action from what the agent perceives and knows.
+
+    Returning None ends the episode early.
+    """
+
+    def choose_action(self, percepts: dict[int, bool], kb: KnowledgeBase,
+                      pos: Tuple[int, int], orientation: int) -> Optional[int]:
+        ...
+
+
+class LogicPolicy:
+    """Rule-based play on top of KnowledgeBase inference.
+
+    Grabs glitter, shoots a confirmed wumpus, and otherwise walks into safe
+    cells, preferring unvisited ones and then the least-visited ones. Gives up
+    when no neighbouring cell is provably safe.
+    """
+    FACINGS = (Agent.TOP, Agent.RIGHT, Agent.BOTTOM, Agent.LEFT)
+
+    def __init__(self):
+        self.visits: dict[Tuple[int, int], int] = {}
+
+    def reset(self):
+        self.visits.clear()
+
+    def choose_action(self, percepts: dict[int, bool], kb: KnowledgeBase,
+                      pos: Tuple[int, int], orientation: int) -> Optional[int]:
+        if percepts[Cell.GLITTER]:
+            return Agent.GRAB
+        if kb.should_shoot(pos, orientation):
+            return Agent.SHOOT
+
+        facing = self._face_wumpus(kb, pos)
+        if facing is not None and facing != orientation:
+            return facing
+
+        forward_pos = kb._get_forward_pos(pos, orientation)
+        if Agent.FORWARD in kb.get_safe_moves(pos, orientation) and forward_pos not in kb.visited:
+            return self._forward(forward_pos)
+
+        # Head for the safe neighbour we have been to least often
+        best = None
+        for facing in self.FACINGS:
+            target = kb._get_forward_pos(pos, facing)
+            if target is None or not kb.is_safe(target):
+                continue
+            rank = (target in kb.visited, self.visits.get(target, 0))
+            if best is None or rank < best[0]:
+                best = (rank, facing, target)
+        if best is None:
+            return None
+        _, facing, target = best
+        if facing != orientation:
+            return facing
+        return self._forward(target)
+
+    def _forward(self, target: Tuple[int, int]) -> int:
+        self.visits[target] = self.visits.get(target, 0) + 1
+        return Agent.FORWARD
+
+    def _face_wumpus(self, kb: KnowledgeBase, pos: Tuple[int, int]) -> Optional[int]:
+        """Orientation that lines the arrow up with a confirmed wumpus, if any"""
+        if not kb.wumpus_alive or kb.arrow_used or len(kb.definite_wumpus) != 1:
+            return None
+        wi, wj = next(iter(kb.definite_wumpus))
+        i, j = pos
+        if i == wi:
+            return Agent.RIGHT if wj > j else Agent.LEFT
+        if j == wj:
+            return Agent.BOTTOM if wi > i else Agent.TOP
+        return None
+
+
+class RiskAwarePolicy(LogicPolicy):
+    """LogicPolicy that gambles on the least risky neighbour once no safe cell is left to explore"""
+
+    def __init__(self, max_risk: float = 0.5, pit_prior: float = 0.2):
+        super().__init__()
+        self.max_risk = max_risk
+        self.engine = HazardProbability(pit_prior)
+
+    def choose_action(self, percepts: dict[int, bool], kb: KnowledgeBase,
+                      pos: Tuple[int, int], orientation: int) -> Optional[int]:
+        if percepts[Cell.GLITTER] or kb.should_shoot(pos, orientation) or not kb.safe <= kb.visited:
+            return super().choose_action(percepts, kb, pos, orientation)
+
+        probs = self.engine.probabilities(kb)
+        best = None
+        for facing in self.FACINGS:
+            target = kb._get_forward_pos(pos, facing)
+            if target not in probs:
+                continue
+            p_pit, p_wumpus = probs[target]
+            risk = 1.0 - (1.0 - p_pit) * (1.0 - p_wumpus)
+            if best is None or risk < best[0]:
+                best = (risk, facing, target)
+        if best is None or best[0] > self.max_risk:
+            return super().choose_action(percepts, kb, pos, orientation)
+        _, facing, target = best
+        if facing != orientation:
+            return facing
+        return self._forward(target)
+
+
+class ExplorerPolicy(LogicPolicy):
+    """LogicPolicy that plans whole routes to the nearest unexplored safe cell"""
+
+    def __init__(self):
+        super().__init__()
+        self.planner: Optional[PathPlanner] = None
+        self._unexplored: set = set()
+        self._cursor = 0
+        self._restores = 0
+
+    def reset(self):
+        super().reset()
+        self.planner = None
+
+    def choose_action(self, percepts: dict[int, bool], kb: KnowledgeBase,
+                      pos: Tuple[int, int], orientation: int) -> Optional[int]:
+        if percepts[Cell.GLITTER]:
+            return Agent.GRAB
+        if kb.should_shoot(pos, orientation):
+            return Agent.SHOOT
+        facing = self._face_wumpus(kb, pos)
+        if facing is not None and facing != orientation:
+            return facing
+
+        if self.planner is None or self.planner.kb is not kb or kb.restores != self._restores:
+            self.planner = PathPlanner(kb)
+            self._unexplored = set()
+            self._cursor = 0
+            self._restores = kb.restores
+        self._unexplored.update(kb.safe_log[self._cursor:])
+        self._cursor = len(kb.safe_log)
+        self._unexplored = {cell for cell in self._unexplored if cell not in kb.visited}
+
+        # Keep heading for the current goal; otherwise try targets nearest first
+        goal = self.planner.goal
+        targets = sorted(self._unexplored, key=lambda c: abs(c[0] - pos[0]) + abs(c[1] - pos[1]))
+        if goal in self._unexplored:
+            targets.insert(0, goal)
+        for target in targets:
+            actions = self.planner.plan(pos, orientation, target)
+            if actions:
+                return actions[0]
+            self._unexplored.discard(target)
+        return None
+
+
+class RandomPolicy:
+    """Uniformly random moves and turns; a baseline for comparisons"""
+    ACTIONS = (Agent.TOP, Agent.RIGHT, Agent.BOTTOM, Agent.LEFT, Agent.FORWARD)
+
+    def __init__(self, seed: Optional[int] = None):
+        self.rng = random.Random(seed)
+
+    def choose_action(self, percepts: dict[int, bool], kb: KnowledgeBase,
+                      pos: Tuple[int, int], orientation: int) -> Optional[int]:
+        if percepts[Cell.GLITTER]:
+            return Agent.GRAB
+        return self.rng.choice(self.ACTIONS)
+
+
+# Policy factories by name; each takes the episode seed
+POLICIES: dict[str, Callable[[Optional[int]], Policy]] = {
+    'logic': lambda seed: LogicPolicy(),
+    'risk': lambda seed: RiskAwarePolicy(),
+    'explore': lambda seed: ExplorerPolicy(),
+    'mcts': lambda seed: MCTSPolicy(seed=seed),
+    'random': RandomPolicy,
+}
@@ -0,0 +1,203 @@
+import random
+from collections import OrderedDict
+from itertools import accumulate
+from typing import Dict, List, Optional, Set, Tuple
+from .knowledge_base import KnowledgeBase
+
+Pos = Tuple[int, int]
+
+
+class HazardProbability:
+    """Exact P(pit) and P(wumpus) for frontier cells given a KnowledgeBase's percepts.
+
+    Pits are modelled as independent with probability `pit_prior` per cell; a
+    breeze means at least one adjacent pit, no breeze means none. The frontier
+    is split into connected components (cells linked by a shared breeze), each
+    component is enumerated on its own, and the result is memoized under a
+    translation-independent signature of its constraints, so components that
+    did not change between steps are never enumerated again.
+
+    The wumpus is modelled as exactly one, uniformly placed on any cell other
+    than the start that is consistent with every stench and stench-free cell.
+    Pit and wumpus placements are treated as independent.
+    """
+
+    def __init__(self, pit_prior: float = 0.2, max_cache_entries: int = 4096):
+        self.pit_prior = pit_prior
+        self.max_cache_entries = max_cache_entries
+        self._cache: OrderedDict = OrderedDict()
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    def frontier(self, kb: KnowledgeBase) -> Set[Pos]:
+        """Unvisited cells next to a visited cell"""
+        cells = set()
+        for pos in kb.visited:
+            for adj in kb._get_adjacent(pos):
+                if adj not in kb.visited:
+                    cells.add(adj)
+        return cells
+
+    def probabilities(self, kb: KnowledgeBase) -> Dict[Pos, Tuple[float, float]]:
+        """(P(pit), P(wumpus)) for every frontier cell"""
+        pits = self.pit_probabilities(kb)
+        wumpus = self.wumpus_probabilities(kb)
+        return {pos: (pits[pos], wumpus.get(pos, 0.0)) for pos in self.frontier(kb)}
+
+    def risk(self, kb: KnowledgeBase, pos: Pos) -> float:
+        """Probability that entering pos is fatal"""
+        p_pit, p_wumpus = self.probabilities(kb).get(pos, (self.pit_prior, 0.0))
+        return 1.0 - (1.0 - p_pit) * (1.0 - p_wumpus)
+
+    def pit_probabilities(self, kb: KnowledgeBase) -> Dict[Pos, float]:
+        pit_free, components = self.pit_components(kb)
+        result = {pos: (0.0 if pos in pit_free else self.pit_prior) for pos in self.frontier(kb)}
+        for cells, solution in components:
+            result.update(zip(cells, solution.marginals))
+        return result
+
+    def pit_components(self, kb: KnowledgeBase) -> Tuple[Set[Pos], List[Tuple[List[Pos], 'Component']]]:
+        """(cells that cannot hold a pit, (cells, Component) per group of linked breezes)
+
+        Cells in neither are unconstrained and hold a pit with pit_prior on
+        their own.
+        """
+        pit_free = set(kb.visited)
+        for pos in kb.visited - kb.breeze_cells:
+            pit_free.update(kb._get_adjacent(pos))
+
+        constraints: List[Tuple[Pos, ...]] = []
+        for pos in kb.breeze_cells:
+            cells = tuple(sorted(adj for adj in kb._get_adjacent(pos) if adj not in pit_free))
+            if cells:
+                constraints.append(cells)
+        return pit_free, [(cells, self._solve(cells, component))
+                          for cells, component in self._components(constraints)]
+
+    def wumpus_probabilities(self, kb: KnowledgeBase) -> Dict[Pos, float]:
+        frontier = self.frontier(kb)
+        if not kb.wumpus_alive:
+            return {pos: 0.0 for pos in frontier}
+
+        candidates, excluded = self.wumpus_support(kb)
+        if candidates is not None:
+            count = len(candidates)
+            return {pos: (1.0 / count if pos in candidates else 0.0) for pos in frontier}
+
+        # No stench yet: every cell not ruled out is equally likely
+        count = kb.n * kb.n - len(excluded)
+        return {pos: (0.0 if pos in excluded or count == 0 else 1.0 / count) for pos in frontier}
+
+    def wumpus_support(self, kb: KnowledgeBase) -> Tuple[Optional[Set[Pos]], Set[Pos]]:
+        """(cells the wumpus can be in, cells it cannot); candidates is None before any stench"""
+        excluded = set(kb.visited)
+        excluded.add((0, 0))
+        for pos in kb.visited - kb.stench_cells:
+            excluded.update(kb._get_adjacent(pos))
+
+        candidates: Optional[Set[Pos]] = None
+        for pos in kb.stench_cells:
+            around = set(kb._get_adjacent(pos))
+            candidates = around if candidates is None else candidates & around
+        if candidates is not None:
+            candidates -= excluded
+        return candidates, excluded
+
+    def _components(self, constraints: List[Tuple[Pos, ...]]):
+        """Yield (cells, constraints) for each group of breezes sharing a frontier cell"""
+        by_cell: Dict[Pos, List[int]] = {}
+        for idx, cells in enumerate(constraints):
+            for pos in cells:
+                by_cell.setdefault(pos, []).append(idx)
+
+        seen: Set[int] = set()
+        for first in range(len(constraints)):
+            if first in seen:
+                continue
+            seen.add(first)
+            stack = [first]
+            members = []
+            cells: Set[Pos] = set()
+            while stack:
+                idx = stack.pop()
+                members.append(constraints[idx])
+                for pos in constraints[idx]:
+                    if pos not in cells:
+                        cells.add(pos)
+                        for other in by_cell[pos]:
+                            if other not in seen:
+                                seen.add(other)
+                                stack.append(other)
+            yield sorted(cells), members
+
+    def _solve(self, cells: List[Pos], constraints: List[Tuple[Pos, ...]]) -> 'Component':
+        # Signature relative to the component's corner so a translated copy hits the cache
+        oi = min(i for i, _ in cells)
+        oj = min(j for _, j in cells)
+        index = {pos: k for k, pos in enumerate(cells)}
+        shape = tuple((i - oi, j - oj) for i, j in cells)
+        rules = tuple(sorted({tuple(index[pos] for pos in con) for con in constraints}))
+        key = (self.pit_prior, shape, rules)
+
+        cached = self._cache.get(key)
+        if cached is not None:
+            self._cache.move_to_end(key)
+            self.cache_hits += 1
+            return cached
+
+        self.cache_misses += 1
+        result = _enumerate(len(cells), rules, self.pit_prior)
+        self._cache[key] = result
+        if len(self._cache) > self.max_cache_entries:
+            self._cache.popitem(last=False)
+        return result
+
+
+class Component:
+    """Every pit configuration of one frontier component that fits its breezes.
+
+    Bit k of a configuration is set when the component's k-th cell holds a
+    pit; cum_weights are the running totals of their prior weights, ready
+    for random.choices, so whole configurations can be sampled jointly.
+    """
+    __slots__ = ('configurations', 'cum_weights', 'marginals')
+
+    def __init__(self, configurations: List[int], weights: List[float], m: int):
+        self.configurations = configurations
+        self.cum_weights = list(accumulate(weights))
+        total = self.cum_weights[-1] if weights else 0.0
+        pit_weight = [0.0] * m
+        for mask, weight in zip(configurations, weights):
+            for idx in range(m):
+                if mask >> idx & 1:
+                    pit_weight[idx] += weight
+        self.marginals = [w / total for w in pit_weight] if total else [0.0] * m
+
+    def sample(self, rng: random.Random) -> int:
+        return rng.choices(self.configurations, cum_weights=self.cum_weights)[0]
+
+
+def _enumerate(m: int, rules: Tuple[Tuple[int, ...], ...], prior: float) -> Component:
+    """Pit configurations of m cells under 'at least one pit' rules, with their weights"""
+    # Check each rule as soon as its last cell has been assigned
+    closing: List[List[Tuple[int, ...]]] = [[] for _ in range(m)]
+    for rule in rules:
+        closing[max(rule)].append(rule)
+
+    assignment = [False] * m
+    configurations: List[int] = []
+    weights: List[float] = []
+
+    def walk(k: int, weight: float, mask: int):
+        if k == m:
+            configurations.append(mask)
+            weights.append(weight)
+            return
+        for value, factor in ((True, prior), (False, 1.0 - prior)):
+            assignment[k] = value
+            if all(any(assignment[c] for c in rule) for rule in closing[k]):
+                walk(k + 1, weight * factor, mask | value << k)
+        assignment[k] = False
+
+    walk(0, 1.0, 0)
+    return Component(configurations, weights, m)
@@ -0,0 +1,88 @@
+from collections import defaultdict
+from typing import Optional
+
+
+class Stats:
+    """Per-phase timers, counters and peak memory collected from the game loop.
+
+    Components hold an optional reference to a Stats object and only pay for a
+    `None` check when profiling is off. Timings are accumulated seconds per
+    phase; `observe` keeps the last and largest value of a gauge such as a
+    knowledge-base set size.
+    """
+
+    def __init__(self, track_memory: bool = False):
+        self.timings: dict[str, float] = defaultdict(float)
+        self.calls: dict[str, int] = defaultdict(int)
+        self.counters: dict[str, int] = defaultdict(int)
+        self.last: dict[str, int] = {}
+        self.peak: dict[str, int] = {}
+        self.track_memory = track_memory
+        self.peak_memory: Optional[int] = None
+        self._tracemalloc = None
+        self._started_tracing = False  # Only stop tracing we started
+        if track_memory:
+            # Imported on demand: it pulls in pickle and friends at startup
+            import tracemalloc
+            self._tracemalloc = tracemalloc
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._started_tracing = True
+
+    def close(self):
+        """Take a last memory sample and stop tracemalloc if this started it"""
+        self.sample_memory()
+        if self._started_tracing:
+            self._tracemalloc.stop()
+            self._started_tracing = False
+
+    def __enter__(self) -> 'Stats':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def add_time(self, phase: str, seconds: float):
+        self.timings[phase] += seconds
+        self.calls[phase] += 1
+
+    def count(self, name: str, amount: int = 1):
+        self.counters[name] += amount
+
+    def observe(self, name: str, value: int):
+        self.last[name] = value
+        if value > self.peak.get(name, -1):
+            self.peak[name] = value
+
+    def sample_memory(self):
+        tracemalloc = self._tracemalloc
+        if tracemalloc is not None and tracemalloc.is_tracing():
+            peak = tracemalloc.get_traced_memory()[1]
+            if self.peak_memory is None or peak > self.peak_memory:
+                self.peak_memory = peak
+
+    def as_dict(self) -> dict:
+        return {
+            'timings': dict(self.timings),
+            'calls': dict(self.calls),
+            'counters': dict(self.counters),
+            'last': dict(self.last),
+            'peak': dict(self.peak),
+            'peak_memory': self.peak_memory,
+        }
+
+    def report(self) -> str:
+        self.sample_memory()
+        lines = ["=== Profile ==="]
+        total = sum(self.timings.values()) or 1.0
+        for phase, seconds in sorted(self.timings.items(), key=lambda item: -item[1]):
+            calls = self.calls[phase]
+            lines.append(f"{phase:<12} {seconds * 1000:10.3f} ms  {100 * seconds / total:5.1f}%  "
+                         f"{calls:>8} calls  {seconds / calls * 1e6:9.1f} us/call")
+        for name, value in sorted(self.counters.items()):
+            lines.append(f"{name:<24} {value:>12}")
+        for name in sorted(self.last):
+            lines.append(f"{name:<24} last {self.last[name]:>10}  peak {self.peak[name]:>10}")
+        if self.peak_memory is not None:
+            lines.append(f"{'peak memory':<24} {self.peak_memory / 1024:12.1f} KiB")
+        return "\n".join(lines)
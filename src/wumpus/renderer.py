@@ -0,0 +1,88 @@
+import shutil
+import sys
+from typing import Optional, TextIO
+from .agent import Agent
+
+# Lines kept free under the board for prompts and messages
+PROMPT_LINES = 6
+
+
+class TerminalRenderer:
+    """Draws the board through a viewport centred on the agent, rewriting only what changed.
+
+    On a TTY the last frame is kept; each new frame is sent as ANSI cursor
+    moves to the cells (and status lines) that differ, and the cursor is then
+    parked under the board for prompts. Elsewhere every frame is printed in
+    full, still clipped to the viewport.
+    """
+    CLEAR = "\x1b[H\x1b[2J"
+    CLEAR_LINE = "\x1b[K"
+    CLEAR_BELOW = "\x1b[J"
+
+    def __init__(self, agent: Agent, out: Optional[TextIO] = None,
+                 rows: Optional[int] = None, cols: Optional[int] = None,
+                 ansi: Optional[bool] = None):
+        self.agent = agent
+        self.out = out if out is not None else sys.stdout
+        self.ansi = ansi if ansi is not None else self.out.isatty()
+        header = len(agent.status_lines()) + 1
+        if rows is None or cols is None:
+            size = shutil.get_terminal_size()
+            rows = rows or max(3, size.lines - header - PROMPT_LINES)
+            cols = cols or max(3, size.columns // 2)
+        n = len(agent.world)
+        self.rows = min(rows, n)
+        self.cols = min(cols, n)
+        self._frame: Optional[list[str]] = None
+        self.cells_written = 0
+
+    def invalidate(self):
+        """Forget the screen contents, e.g. after other output scrolled it"""
+        self._frame = None
+
+    def viewport(self) -> tuple[int, int]:
+        """Top-left cell of the viewport, clamped to the board"""
+        n = len(self.agent.world)
+        i, j = self.agent.pos
+        top = min(max(i - self.rows // 2, 0), n - self.rows)
+        left = min(max(j - self.cols // 2, 0), n - self.cols)
+        return top, left
+
+    def frame(self) -> list[str]:
+        agent = self.agent
+        top, left = self.viewport()
+        lines = agent.status_lines()
+        lines.append(f"View: rows {top}-{top + self.rows - 1}, "
+                     f"columns {left}-{left + self.cols - 1} of {len(agent.world)}")
+        for i in range(top, top + self.rows):
+            lines.append("".join(agent.cell_glyph((i, j)) + " " for j in range(left, left + self.cols)))
+        return lines
+
+    def render(self):
+        frame = self.frame()
+        if not self.ansi:
+            self.out.write("\n" + "\n".join(frame) + "\n\n")
+            self.cells_written += self.rows * self.cols
+            self.out.flush()
+            return
+
+        header = len(frame) - self.rows
+        if self._frame is None:
+            parts = [self.CLEAR, "\n".join(frame)]
+            self.cells_written += self.rows * self.cols
+        else:
+            parts = []
+            for r, (new, old) in enumerate(zip(frame, self._frame)):
+                if new == old:
+                    continue
+                if r < header:
+                    parts.append(f"\x1b[{r + 1};1H{new}{self.CLEAR_LINE}")
+                    continue
+                for c in range(0, len(new), 2):
+                    if new[c] != old[c]:
+                        parts.append(f"\x1b[{r + 1};{c + 1}H{new[c]}")
+                        self.cells_written += 1
+        parts.append(f"\x1b[{len(frame) + 2};1H{self.CLEAR_BELOW}")
+        self.out.write("".join(parts))
+        self.out.flush()
+        self._frame = frame
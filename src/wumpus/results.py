@@ -0,0 +1,266 @@
+"""
+Episode results - an append-only directory of columnar .npz chunks, and `wumpus stats`.
+
+Each chunk holds one typed array per column plus the policy names its
+policy codes refer to. Chunks are written once via an atomic rename and
+never modified, so writers in different processes only need distinct chunk
+names. Aggregation reads one chunk and only the columns it needs at a
+time, and keeps per-group integer histograms rather than rows, so memory
+depends on the number of groups and distinct values, not on the row count;
+percentiles computed from the histograms are exact.
+"""
+
+import os
+from collections import defaultdict
+from typing import Iterable, Iterator, Optional, Sequence
+import numpy as np
+
+COLUMNS = {
+    'seed': np.int64,
+    'n': np.int32,
+    'policy': np.uint16,  # Index into the chunk's 'policy_names'
+    'score': np.int32,
+    'steps': np.int32,
+    'reason': np.int8,    # Index into REASONS
+    'arrow_used': np.bool_,
+    'wumpus_killed': np.bool_,
+    'bound': np.int32,    # oracle.solve's best achievable score for the world; optional
+}
+OPTIONAL_COLUMNS = ('bound',)  # Only in chunks whose rows all have it
+REASONS = (None, 'gold', 'pit', 'wumpus')  # Agent.end_reason; None if cut short
+METRICS = ('score', 'steps', 'regret')  # regret is bound - score
+GROUP_COLUMNS = ('policy', 'n', 'reason', 'arrow_used', 'wumpus_killed')
+
+
+def encode_rows(rows: Sequence[dict]) -> dict[str, np.ndarray]:
+    """Columns for rows shaped like tournament.run_shard's"""
+    names = sorted({row['policy'] for row in rows})
+    codes = {name: k for k, name in enumerate(names)}
+    present = [name for name in COLUMNS
+               if name not in OPTIONAL_COLUMNS or (rows and all(name in row for row in rows))]
+    columns = {name: np.empty(len(rows), dtype=COLUMNS[name]) for name in present}
+    copied = [name for name in present if name not in ('policy', 'reason')]
+    for k, row in enumerate(rows):
+        for name in copied:
+            columns[name][k] = row[name]
+        columns['policy'][k] = codes[row['policy']]
+        columns['reason'][k] = REASONS.index(row['reason'])
+    columns['policy_names'] = np.array(names, dtype=str)
+    return columns
+
+
+def decode_rows(columns: dict[str, np.ndarray]) -> list[dict]:
+    names = columns['policy_names']
+    rows = []
+    for k in range(len(columns['seed'])):
+        row = {name: columns[name][k].item() for name in COLUMNS if name in columns}
+        row['policy'] = str(names[row['policy']])
+        row['reason'] = REASONS[row['reason']]
+        rows.append(row)
+    return rows
+
+
+class ResultStore:
+    """A directory of result chunks"""
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def write(self, name: str, rows: Sequence[dict]) -> str:
+        """Write rows as chunk `name` (without extension); returns its path"""
+        os.makedirs(self.path, exist_ok=True)
+        path = os.path.join(self.path, name + '.npz')
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            np.savez_compressed(f, **encode_rows(rows))
+        os.replace(tmp_path, path)
+        return path
+
+    def chunks(self) -> list[str]:
+        if not os.path.isdir(self.path):
+            return []
+        return sorted(os.path.join(self.path, name) for name in os.listdir(self.path)
+                      if name.endswith('.npz'))
+
+    def read(self, path: str, columns: Optional[Iterable[str]] = None) -> dict[str, np.ndarray]:
+        """Columns of one chunk; only the ones asked for are read, and optional
+        ones the chunk lacks are left out"""
+        with np.load(path) as chunk:
+            names = list(columns) if columns is not None else list(chunk.files)
+            return {name: chunk[name] for name in names
+                    if name in chunk.files or name not in OPTIONAL_COLUMNS}
+
+    def __len__(self) -> int:
+        return sum(len(self.read(path, ['seed'])['seed']) for path in self.chunks())
+
+
+class ResultWriter:
+    """Buffers rows and writes a chunk every `chunk_rows` rows"""
+
+    def __init__(self, store: ResultStore, prefix: str = 'chunk', chunk_rows: int = 65536):
+        self.store = store
+        self.prefix = prefix
+        self.chunk_rows = chunk_rows
+        self.rows: list[dict] = []
+        existing = [p for p in store.chunks() if os.path.basename(p).startswith(prefix + '-')]
+        self.next_chunk = len(existing)
+
+    def add(self, row: dict):
+        self.rows.append(row)
+        if len(self.rows) >= self.chunk_rows:
+            self.flush()
+
+    def flush(self):
+        if self.rows:
+            self.store.write(f"{self.prefix}-{self.next_chunk:08d}", self.rows)
+            self.next_chunk += 1
+            self.rows = []
+
+    def close(self):
+        self.flush()
+
+    def __enter__(self) -> 'ResultWriter':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class GroupStats:
+    """Running totals for one group of episodes"""
+
+    def __init__(self):
+        self.games = 0
+        self.reasons = [0] * len(REASONS)
+        self.arrow_used = 0
+        self.wumpus_killed = 0
+        self.histograms: dict[str, dict[int, int]] = {metric: defaultdict(int) for metric in METRICS}
+
+    def add(self, columns: dict[str, np.ndarray]):
+        self.games += len(columns['score'])
+        for code, count in enumerate(np.bincount(columns['reason'], minlength=len(REASONS))):
+            self.reasons[code] += int(count)
+        self.arrow_used += int(columns['arrow_used'].sum())
+        self.wumpus_killed += int(columns['wumpus_killed'].sum())
+        for metric in METRICS:
+            values = columns.get(metric)
+            if values is None or not len(values):
+                continue
+            histogram = self.histograms[metric]
+            low = int(values.min())
+            counts = np.bincount((values - low).astype(np.int64))
+            for offset in np.flatnonzero(counts).tolist():
+                histogram[low + offset] += int(counts[offset])
+
+    def rate(self, reason: Optional[str]) -> float:
+        return self.reasons[REASONS.index(reason)] / self.games
+
+    def count(self, metric: str) -> int:
+        """Episodes with a value for metric; regret needs the optional bound"""
+        return sum(self.histograms[metric].values())
+
+    def total(self, metric: str) -> int:
+        return sum(v * c for v, c in self.histograms[metric].items())
+
+    def mean(self, metric: str) -> float:
+        return self.total(metric) / self.count(metric)
+
+    def percentile(self, metric: str, q: float) -> float:
+        """Exact q-th percentile, interpolated between ranks as np.percentile does"""
+        items = sorted(self.histograms[metric].items())
+        position = q / 100 * (self.count(metric) - 1)
+        lo, frac = int(position), position - int(position)
+        below = 0
+        low_value = None
+        for value, count in items:
+            below += count
+            if low_value is None and below > lo:
+                low_value = value
+            if below > lo + (frac > 0):
+                return low_value + (value - low_value) * frac
+        return float(items[-1][0])
+
+
+def aggregate(store: ResultStore, by: Sequence[str] = ('policy', 'n')) -> dict[tuple, GroupStats]:
+    """GroupStats per distinct value of the `by` columns, one chunk at a time"""
+    needed = set(by) | {'score', 'steps', 'bound', 'reason', 'arrow_used', 'wumpus_killed'}
+    groups: dict[tuple, GroupStats] = defaultdict(GroupStats)
+    for path in store.chunks():
+        columns = store.read(path, sorted(needed | {'policy_names'}))
+        names = columns.pop('policy_names')
+        if 'bound' in columns:
+            columns['regret'] = columns.pop('bound').astype(np.int64) - columns['score']
+        if not by:
+            groups[()].add(columns)
+            continue
+        # Pack the group columns into one integer key per row; they are all
+        # small, so a 1-D unique and a radix sort on the group ids do the work
+        keys = np.zeros(len(columns['score']), dtype=np.int64)
+        lows, spans = [], []
+        for name in by:
+            column = columns[name].astype(np.int64)
+            low = int(column.min()) if len(column) else 0
+            span = int(column.max()) - low + 1 if len(column) else 1
+            keys = keys * span + (column - low)
+            lows.append(low)
+            spans.append(span)
+        unique, inverse = np.unique(keys, return_inverse=True)
+        order = np.argsort(inverse.astype(np.int16 if len(unique) < 1 << 15 else np.int64), kind='stable')
+        bounds = np.searchsorted(inverse[order], np.arange(len(unique) + 1))
+        for g, packed in enumerate(unique.tolist()):
+            rows = order[bounds[g]:bounds[g + 1]]
+            key = []
+            for low, span in zip(reversed(lows), reversed(spans)):
+                packed, offset = divmod(packed, span)
+                key.append(low + offset)
+            key.reverse()
+            label = tuple(_label(name, value, names) for name, value in zip(by, key))
+            groups[label].add({name: column[rows] for name, column in columns.items()})
+    return dict(groups)
+
+
+def _label(column: str, value: int, policy_names: np.ndarray):
+    if column == 'policy':
+        return str(policy_names[value])
+    if column == 'reason':
+        return REASONS[value]
+    if column in ('arrow_used', 'wumpus_killed'):
+        return bool(value)
+    return value
+
+
+def format_table(groups: dict[tuple, GroupStats], by: Sequence[str],
+                 percentiles: Sequence[float]) -> Iterator[str]:
+    header = [*by, 'games', 'win', 'pit', 'wumpus', 'mean score',
+              *(f"p{q:g} score" for q in percentiles), 'mean regret', 'mean steps', 'arrow', 'kills']
+    yield '  '.join(f"{h:>10}" for h in header)
+    for key in sorted(groups, key=lambda k: tuple(str(v) for v in k)):
+        group = groups[key]
+        cells = [*(str(v) for v in key), str(group.games),
+                 f"{group.rate('gold'):.3f}", f"{group.rate('pit'):.3f}", f"{group.rate('wumpus'):.3f}",
+                 f"{group.mean('score'):.1f}",
+                 *(f"{group.percentile('score', q):.1f}" for q in percentiles),
+                 f"{group.mean('regret'):.1f}" if group.count('regret') else '-',
+                 f"{group.mean('steps'):.1f}",
+                 f"{group.arrow_used / group.games:.3f}", f"{group.wumpus_killed / group.games:.3f}"]
+        yield '  '.join(f"{c:>10}" for c in cells)
+
+
+def main(argv: Optional[list[str]] = None):
+    import argparse
+    parser = argparse.ArgumentParser(prog='wumpus stats',
+                                     description="Aggregate episode results without loading them all.")
+    parser.add_argument('path', help='Results directory (e.g. wumpus tournament --format npz --out DIR)')
+    parser.add_argument('--by', nargs='*', default=['policy', 'n'], choices=GROUP_COLUMNS,
+                        help='Columns to group by (default: policy n)')
+    parser.add_argument('--percentiles', nargs='*', type=float, default=[5, 50, 95],
+                        help='Score percentiles to report (default: 5 50 95)')
+    args = parser.parse_args(argv)
+
+    store = ResultStore(args.path)
+    groups = aggregate(store, args.by)
+    if not groups:
+        print(f"No results in {args.path}")
+        return
+    for line in format_table(groups, args.by, args.percentiles):
+        print(line)
@@ -0,0 +1,232 @@
+"""
+Game server - many concurrent games in one asyncio event loop.
+
+Clients talk newline-delimited JSON over TCP or a Unix socket. Each request
+is one object with an "op" and, except for "new", the "session" it targets:
+
+    {"op": "new", "n": 4, "seed": 42}        -> {"ok": true, "session": "...", ...}
+    {"op": "act", "session": "...", "action": "forward"}
+    {"op": "observe", "session": "..."}
+    {"op": "close", "session": "..."}
+
+Every reply carries "ok"; failures add an "error" message and successes the
+agent's observation. An "id" in the request is echoed back. Sessions belong
+to the server rather than to a connection, so a client may reconnect and
+carry on, and sessions left idle for `idle_timeout` seconds are evicted.
+A connection's requests are handled one at a time and the next line is not
+read until the previous reply has drained, so a slow reader only ever
+holds one reply in memory.
+"""
+
+import asyncio
+import json
+import secrets
+import time
+from dataclasses import dataclass
+from typing import Callable, Optional
+from .agent import Agent
+from .cell import Cell
+from .game_controller import GameController
+
+ACTIONS = {
+    'top': Agent.TOP, 'north': Agent.TOP,
+    'right': Agent.RIGHT, 'east': Agent.RIGHT,
+    'bottom': Agent.BOTTOM, 'south': Agent.BOTTOM,
+    'left': Agent.LEFT, 'west': Agent.LEFT,
+    'forward': Agent.FORWARD, 'grab': Agent.GRAB, 'shoot': Agent.SHOOT,
+}
+PERCEPTS = {'breeze': Cell.BREEZE, 'stench': Cell.STENCH, 'glitter': Cell.GLITTER,
+            'bump': Cell.BUMP, 'scream': Cell.SCREAM}
+
+
+class ProtocolError(Exception):
+    """A request the server refuses; the message goes back to the client"""
+
+
+@dataclass
+class Session:
+    controller: GameController
+    last_used: float
+
+
+def observation(controller: GameController) -> dict:
+    agent = controller.agent
+    return {
+        'pos': list(agent.pos),
+        'orientation': agent.orientation,
+        'percepts': {name: agent.sensors[flag] for name, flag in PERCEPTS.items()},
+        'score': agent.score,
+        'steps': controller.steps,
+        'has_arrow': agent.has_arrow,
+        'has_gold': agent.has_gold,
+        'state': controller.game_state,
+    }
+
+
+class GameServer:
+    """Hosts GameController sessions behind the JSON-lines protocol"""
+
+    def __init__(self, max_sessions: int = 10_000, idle_timeout: float = 300.0,
+                 max_size: int = 64, max_line: int = 4096,
+                 clock: Callable[[], float] = time.monotonic):
+        self.max_sessions = max_sessions
+        self.idle_timeout = idle_timeout
+        self.max_size = max_size
+        self.max_line = max_line
+        self.clock = clock
+        self.sessions: dict[str, Session] = {}
+        self.evicted = 0
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._sweeper: Optional[asyncio.Task] = None
+
+    def handle(self, request: dict) -> dict:
+        """Answer one decoded request"""
+        try:
+            reply = self._dispatch(request)
+        except ProtocolError as e:
+            reply = {'ok': False, 'error': str(e)}
+        if 'id' in request:
+            reply['id'] = request['id']
+        return reply
+
+    def _dispatch(self, request: dict) -> dict:
+        op = request.get('op')
+        if op == 'new':
+            return self._new(request)
+        if op not in ('act', 'observe', 'close'):
+            raise ProtocolError(f"unknown op {op!r}")
+
+        key = request.get('session')
+        session = self.sessions.get(key) if isinstance(key, str) else None
+        if session is None:
+            raise ProtocolError(f"no session {key!r}")
+        session.last_used = self.clock()
+        if op == 'close':
+            del self.sessions[key]
+            return {'ok': True}
+        if op == 'act':
+            controller = session.controller
+            if controller.game_state is not None:
+                raise ProtocolError("game is over")
+            controller.step(self._action(request.get('action')))
+        return {'ok': True, **observation(session.controller)}
+
+    def _new(self, request: dict) -> dict:
+        n, seed = request.get('n', 4), request.get('seed')
+        if not isinstance(n, int) or isinstance(n, bool) or not 3 <= n <= self.max_size:
+            raise ProtocolError(f"n must be an integer from 3 to {self.max_size}")
+        if seed is not None and (not isinstance(seed, int) or isinstance(seed, bool) or seed < 0):
+            raise ProtocolError("seed must be a non-negative integer")
+        if len(self.sessions) >= self.max_sessions:
+            self.evict_idle()
+            if len(self.sessions) >= self.max_sessions:
+                raise ProtocolError("server is full")
+
+        controller = GameController(n, seed)
+        controller.agent.update_knowledge()
+        key = secrets.token_hex(8)
+        self.sessions[key] = Session(controller, self.clock())
+        return {'ok': True, 'session': key, **observation(controller)}
+
+    @staticmethod
+    def _action(action) -> int:
+        if isinstance(action, str) and action.lower() in ACTIONS:
+            return ACTIONS[action.lower()]
+        if isinstance(action, int) and not isinstance(action, bool) and action in ACTIONS.values():
+            return action
+        raise ProtocolError(f"unknown action {action!r}")
+
+    def evict_idle(self) -> int:
+        """Drop sessions idle for longer than idle_timeout; returns how many went"""
+        cutoff = self.clock() - self.idle_timeout
+        stale = [key for key, session in self.sessions.items() if session.last_used < cutoff]
+        for key in stale:
+            del self.sessions[key]
+        self.evicted += len(stale)
+        return len(stale)
+
+    async def _client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError:  # Line longer than max_line
+                    writer.write(b'{"ok": false, "error": "request too long"}\n')
+                    break
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+                try:
+                    request = json.loads(line)
+                except ValueError:  # Malformed JSON or not UTF-8
+                    request = None
+                if isinstance(request, dict):
+                    reply = self.handle(request)
+                else:
+                    reply = {'ok': False, 'error': "request must be a JSON object"}
+                writer.write(json.dumps(reply).encode() + b'\n')
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def _sweep(self):
+        while True:
+            await asyncio.sleep(max(self.idle_timeout / 4, 0.01))
+            self.evict_idle()
+
+    async def start(self, host: str = '127.0.0.1', port: int = 8765,
+                    path: Optional[str] = None) -> asyncio.AbstractServer:
+        """Listen on a Unix socket at `path` if given, otherwise on host:port"""
+        if path is not None:
+            self._server = await asyncio.start_unix_server(self._client, path, limit=self.max_line)
+        else:
+            self._server = await asyncio.start_server(self._client, host, port, limit=self.max_line)
+        self._sweeper = asyncio.create_task(self._sweep())
+        return self._server
+
+    async def stop(self):
+        if self._sweeper is not None:
+            self._sweeper.cancel()
+            self._sweeper = None
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def serve_forever(self, host: str = '127.0.0.1', port: int = 8765,
+                            path: Optional[str] = None):
+        server = await self.start(host, port, path)
+        try:
+            await server.serve_forever()
+        finally:
+            await self.stop()
+
+
+def main(argv: Optional[list[str]] = None):
+    import argparse
+    parser = argparse.ArgumentParser(prog='wumpus serve',
+                                     description="Host many games over a JSON-lines socket protocol.")
+    parser.add_argument('--host', default='127.0.0.1', help='Address to listen on (default: 127.0.0.1)')
+    parser.add_argument('--port', type=int, default=8765, help='TCP port (default: 8765)')
+    parser.add_argument('--unix', metavar='PATH', help='Listen on a Unix socket instead of TCP')
+    parser.add_argument('--max-sessions', type=int, default=10_000,
+                        help='Concurrent sessions allowed (default: 10000)')
+    parser.add_argument('--idle-timeout', type=float, default=300.0,
+                        help='Seconds before an unused session is dropped (default: 300)')
+    parser.add_argument('--max-size', type=int, default=64, help='Largest world a client may ask for (default: 64)')
+    args = parser.parse_args(argv)
+
+    server = GameServer(args.max_sessions, args.idle_timeout, args.max_size)
+    where = args.unix if args.unix else f"{args.host}:{args.port}"
+    print(f"Serving games on {where}")
+    try:
+        asyncio.run(server.serve_forever(args.host, args.port, args.unix))
+    except KeyboardInterrupt:
+        pass
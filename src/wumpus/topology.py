@@ -0,0 +1,72 @@
+from functools import lru_cache
+from typing import Optional, Tuple
+
+Pos = Tuple[int, int]
+
+# Orientation -> (di, dj); same numbering as Agent.TOP/RIGHT/BOTTOM/LEFT
+DELTAS = ((-1, 0), (0, 1), (1, 0), (0, -1))
+
+# Grids up to this many cells get lookup tables; bigger ones (chunked worlds)
+# are computed per call, since a table would cost more than the world touched
+MAX_TABLE_CELLS = 1 << 16
+
+
+class Topology:
+    """Neighbours and forward moves of an n x n grid.
+
+    For tabled grids both are precomputed tuples indexed by flat cell index
+    (and orientation), so lookups allocate nothing. Neighbours are listed
+    top, bottom, left, right.
+    """
+
+    def __init__(self, n: int):
+        self.n = n
+        self.tabled = n * n <= MAX_TABLE_CELLS
+        if not self.tabled:
+            return
+        # Every entry refers to the same position tuples, one per cell
+        cells = [(i, j) for i in range(n) for j in range(n)]
+        neighbors = []
+        forward: list[Optional[Pos]] = []
+        for k, (i, j) in enumerate(cells):
+            top = cells[k - n] if i > 0 else None
+            bottom = cells[k + n] if i < n - 1 else None
+            left = cells[k - 1] if j > 0 else None
+            right = cells[k + 1] if j < n - 1 else None
+            neighbors.append(tuple(c for c in (top, bottom, left, right) if c is not None))
+            forward += (top, right, bottom, left)
+        self._neighbors = tuple(neighbors)
+        self._forward = tuple(forward)
+
+    def __reduce__(self):
+        # Pickles (trace checkpoints) name the grid size, not the tables
+        return get_topology, (self.n,)
+
+    def adjacent(self, pos: Pos) -> Tuple[Pos, ...]:
+        if self.tabled:
+            return self._neighbors[pos[0] * self.n + pos[1]]
+        return self._compute_adjacent(pos)
+
+    def forward_pos(self, pos: Pos, orientation: int) -> Optional[Pos]:
+        """Cell ahead of pos when facing orientation, or None at the edge"""
+        if not 0 <= orientation < 4:
+            return None
+        if self.tabled:
+            return self._forward[(pos[0] * self.n + pos[1]) * 4 + orientation]
+        return self._compute_forward(pos, orientation)
+
+    def _compute_adjacent(self, pos: Pos) -> Tuple[Pos, ...]:
+        i, j, n = pos[0], pos[1], self.n
+        return tuple((ni, nj) for ni, nj in ((i - 1, j), (i + 1, j), (i, j - 1), (i, j + 1))
+                     if 0 <= ni < n and 0 <= nj < n)
+
+    def _compute_forward(self, pos: Pos, orientation: int) -> Optional[Pos]:
+        di, dj = DELTAS[orientation]
+        i, j = pos[0] + di, pos[1] + dj
+        return (i, j) if 0 <= i < self.n and 0 <= j < self.n else None
+
+
+@lru_cache(maxsize=16)
+def get_topology(n: int) -> Topology:
+    """The shared Topology for grid size n"""
+    return Topology(n)
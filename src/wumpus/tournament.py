@@ -0,0 +1,216 @@
+"""
+Tournament runner - plays a grid of (policy, world size, seed range) across worker processes.
+
+Seeds are split into fixed shards. Every finished shard is written to its own
+JSON-lines file, or with format 'npz' its own results.ResultStore chunk, via
+an atomic rename, so an interrupted run can be restarted with the same
+arguments and only the missing shards are played. With a world corpus the
+seeds are corpus indices, shard names carry WorldCorpus.ident so results
+from another corpus are never taken as finished, and each worker maps the
+file once. On request
+rows carry the world's oracle bound, so results can be compared as regret,
+and worlds the oracle finds unwinnable can be skipped instead of played.
+"""
+
+import json
+import os
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Iterable, NamedTuple, Optional
+from .corpus import WorldCorpus
+from .game_controller import GameController
+from .oracle import seed_planes, solve
+from .policy import POLICIES
+from .results import REASONS, ResultStore, aggregate
+
+# Corpora opened by this process, keyed by path and file identity, so a
+# corpus rebuilt under the same name is opened afresh
+_corpora: dict[tuple[str, int, int], WorldCorpus] = {}
+
+
+def open_corpus(path: str) -> WorldCorpus:
+    stat = os.stat(path)
+    key = (path, stat.st_ino, stat.st_mtime_ns)
+    corpus = _corpora.get(key)
+    if corpus is None:
+        corpus = _corpora[key] = WorldCorpus(path)
+    return corpus
+
+
+class Shard(NamedTuple):
+    policy: str
+    n: int
+    seed_start: int
+    seed_stop: int
+    corpus: str = ''  # WorldCorpus.ident when the seeds index a corpus
+
+    @property
+    def stem(self) -> str:
+        prefix = f"{self.corpus}-" if self.corpus else ''
+        return f"{prefix}{self.policy}-n{self.n}-{self.seed_start:010d}-{self.seed_stop:010d}"
+
+    def path(self, out_dir: str, fmt: str = 'jsonl') -> str:
+        return os.path.join(out_dir, f"{self.stem}.{fmt}")
+
+
+def make_shards(policies: Iterable[str], sizes: Iterable[int], seeds: range,
+                shard_size: int, corpus: str = '') -> list[Shard]:
+    """Deterministic shard list; the same arguments always give the same shards"""
+    shards = []
+    for policy in policies:
+        for n in sizes:
+            for start in range(seeds.start, seeds.stop, shard_size):
+                shards.append(Shard(policy, n, start, min(start + shard_size, seeds.stop), corpus))
+    return shards
+
+
+def run_shard(shard: Shard, max_steps: int, corpus: Optional[str] = None,
+              solvable_only: bool = False, regret: bool = False) -> list[dict]:
+    """Rows of one shard; they carry 'bound' whenever the oracle was needed"""
+    rows = []
+    make_policy = POLICIES[shard.policy]
+    worlds = open_corpus(corpus) if corpus is not None else None
+    seeds = range(shard.seed_start, shard.seed_stop)
+    oracle = None
+    if solvable_only or regret:
+        if worlds is not None:
+            oracle = solve(worlds.planes(shard.seed_start, shard.seed_stop))
+        else:
+            oracle = solve(seed_planes(shard.n, seeds))
+    for k, seed in enumerate(seeds):
+        if solvable_only and not oracle.solvable[k]:
+            continue
+        world = worlds.world(seed) if worlds is not None else None
+        controller = GameController(shard.n, seed, world_manager=world)
+        result = controller.run_episode(make_policy(seed), max_steps)
+        row = {
+            'policy': shard.policy,
+            'n': shard.n,
+            'seed': seed,
+            'outcome': result.outcome,
+            'score': result.score,
+            'steps': result.steps,
+            'reason': result.reason,
+            'arrow_used': result.arrow_used,
+            'wumpus_killed': result.wumpus_killed,
+        }
+        if oracle is not None:
+            row['bound'] = int(oracle.bound[k])
+        rows.append(row)
+    return rows
+
+
+def write_shard(out_dir: str, shard: Shard, rows: list[dict], fmt: str = 'jsonl'):
+    if fmt == 'npz':
+        ResultStore(out_dir).write(shard.stem, rows)
+        return
+    path = shard.path(out_dir)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w') as f:
+        for row in rows:
+            f.write(json.dumps(row) + '\n')
+    os.replace(tmp_path, path)
+
+
+def pending_shards(out_dir: str, shards: list[Shard], fmt: str = 'jsonl') -> list[Shard]:
+    return [s for s in shards if not os.path.exists(s.path(out_dir, fmt))]
+
+
+def run_tournament(shards: list[Shard], out_dir: str, workers: Optional[int] = None,
+                   max_steps: int = 1000, corpus: Optional[str] = None, fmt: str = 'jsonl',
+                   solvable_only: bool = False, regret: bool = False) -> int:
+    """Play every shard not already on disk; returns how many shards were played"""
+    os.makedirs(out_dir, exist_ok=True)
+    todo = pending_shards(out_dir, shards, fmt)
+    if workers == 1:
+        for shard in todo:
+            write_shard(out_dir, shard, run_shard(shard, max_steps, corpus, solvable_only, regret), fmt)
+        return len(todo)
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(run_shard, shard, max_steps, corpus, solvable_only, regret): shard
+                   for shard in todo}
+        for future in as_completed(futures):
+            write_shard(out_dir, futures[future], future.result(), fmt)
+    return len(todo)
+
+
+def summarize(out_dir: str, shards: list[Shard], fmt: str = 'jsonl') -> dict[tuple[str, int], dict]:
+    if fmt == 'npz':
+        # Streams over every chunk in out_dir, one at a time
+        return {key: {'games': group.games, 'wins': group.reasons[REASONS.index('gold')],
+                      'score': group.total('score'), 'regret': group.total('regret'),
+                      'bounded': group.count('regret')}
+                for key, group in aggregate(ResultStore(out_dir)).items()}
+
+    totals: dict[tuple[str, int], dict] = defaultdict(
+        lambda: {'games': 0, 'wins': 0, 'score': 0, 'regret': 0, 'bounded': 0})
+    for shard in shards:
+        path = shard.path(out_dir)
+        if not os.path.exists(path):
+            continue
+        with open(path) as f:
+            for line in f:
+                row = json.loads(line)
+                group = totals[(row['policy'], row['n'])]
+                group['games'] += 1
+                group['wins'] += row['outcome'] == 'win'
+                group['score'] += row['score']
+                if 'bound' in row:
+                    group['regret'] += row['bound'] - row['score']
+                    group['bounded'] += 1
+    return dict(totals)
+
+
+def parse_seed_range(text: str) -> range:
+    start, _, stop = text.partition(':')
+    return range(int(start), int(stop))
+
+
+def main(argv: Optional[list[str]] = None):
+    import argparse
+    parser = argparse.ArgumentParser(
+        prog='wumpus tournament',
+        description="Play many headless games per policy and world size, resumably.",
+    )
+    parser.add_argument('--policies', nargs='+', default=['logic'], choices=sorted(POLICIES),
+                        help='Policies to evaluate (default: logic)')
+    parser.add_argument('--sizes', nargs='+', type=int, default=[4],
+                        help='World sizes to play (default: 4)')
+    parser.add_argument('--seeds', type=parse_seed_range, default=range(0, 1000),
+                        help='Seed range as START:STOP (default: 0:1000)')
+    parser.add_argument('--shard-size', type=int, default=100,
+                        help='Seeds per shard (default: 100)')
+    parser.add_argument('--workers', type=int, help='Worker processes (default: CPU count)')
+    parser.add_argument('--max-steps', type=int, default=1000,
+                        help='Step limit per episode (default: 1000)')
+    parser.add_argument('--out', default='tournament-results',
+                        help='Directory for shard files (default: tournament-results)')
+    parser.add_argument('--corpus', help='Play worlds from this corpus file; seeds index into it')
+    parser.add_argument('--format', choices=['jsonl', 'npz'], default='jsonl',
+                        help="Shard files as JSON lines, or columnar chunks for `wumpus stats` (default: jsonl)")
+    parser.add_argument('--solvable-only', action='store_true',
+                        help='Skip worlds where no policy could reach the gold')
+    parser.add_argument('--regret', action='store_true',
+                        help="Record each world's oracle bound and report mean regret")
+    args = parser.parse_args(argv)
+
+    sizes, corpus_ident = args.sizes, ''
+    if args.corpus:
+        worlds = open_corpus(args.corpus)
+        if not 0 <= args.seeds.start <= args.seeds.stop <= len(worlds):
+            parser.error(f"--seeds {args.seeds.start}:{args.seeds.stop} is outside the corpus, "
+                         f"which holds worlds 0:{len(worlds)}")
+        sizes, corpus_ident = [worlds.n], worlds.ident
+    shards = make_shards(args.policies, sizes, args.seeds, args.shard_size, corpus_ident)
+    played = run_tournament(shards, args.out, args.workers, args.max_steps, args.corpus, args.format,
+                            args.solvable_only, args.regret)
+    print(f"Played {played} shard(s), skipped {len(shards) - played} already finished.")
+
+    for (policy, n), group in sorted(summarize(args.out, shards, args.format).items()):
+        games = group['games']
+        line = (f"{policy:>10} n={n:<5} games={games:<8} "
+                f"win rate={group['wins'] / games:.3f} mean score={group['score'] / games:.1f}")
+        if group['bounded']:
+            line += f" mean regret={group['regret'] / group['bounded']:.1f}"
+        print(line)
@@ -0,0 +1,249 @@
+"""
+Game traces - an append-only binary log of actions and percepts, and a replayer.
+
+The trace file starts with a magic string and then holds tagged records:
+one GAME record (n, seed) per game, one STEP record (action, percept bitmask,
+score delta) per action and an END record with the outcome. A sidecar
+`<path>.idx` gets a fixed-size (game, step, offset) entry at every game start
+and every `index_every` steps, so any step of any game is found with a
+binary search and a short forward read.
+
+When steps are recorded from a GameController, each of those index entries
+points at a CHECKPOINT record: the pickled GameController.checkpoint() of
+the game at that step. replay() resumes from the nearest one, so seeking to
+step N re-simulates at most `index_every` actions. The world itself is not
+stored; it is rebuilt from the seed.
+"""
+
+import os
+import pickle
+import struct
+from bisect import bisect_right
+from typing import Callable, Iterator, NamedTuple, Optional
+from .cell import Cell
+from .game_controller import GameController
+
+MAGIC = b'WUMPTRC2'
+OLD_MAGIC = b'WUMPTRC1'        # Same records, minus checkpoints; still readable
+GAME = struct.Struct('<cIQ')   # tag, n, seed
+STEP = struct.Struct('<cBBi')  # tag, action, percept bitmask, score delta
+END = struct.Struct('<cB')     # tag, outcome code
+CHECKPOINT = struct.Struct('<cI')  # tag, length of the pickle that follows
+INDEX = struct.Struct('<IIQ')  # game, actions before offset, offset
+RECORDS = {b'G': GAME, b'S': STEP, b'E': END, b'C': CHECKPOINT}
+MAX_SEED = 2 ** 64 - 1
+
+PERCEPT_BITS = (Cell.BREEZE, Cell.STENCH, Cell.GLITTER, Cell.BUMP, Cell.SCREAM)
+OUTCOMES = (None, 'win', 'lose')
+
+
+def pack_percepts(sensors: dict[int, bool]) -> int:
+    return sum(1 << bit for bit, flag in enumerate(PERCEPT_BITS) if sensors.get(flag))
+
+
+def unpack_percepts(mask: int) -> dict[int, bool]:
+    return {flag: bool(mask >> bit & 1) for bit, flag in enumerate(PERCEPT_BITS)}
+
+
+class TraceStep(NamedTuple):
+    action: int
+    percepts: int  # Bitmask over PERCEPT_BITS, read after the action
+    score_delta: int
+
+
+class TraceRecorder:
+    """Appends recorded games to a trace file and its index"""
+
+    def __init__(self, path: str, index_every: int = 256):
+        self.path = path
+        self.index_every = index_every
+        index_path = path + '.idx'
+        self.next_game = 0
+        if os.path.exists(index_path) and os.path.getsize(index_path) >= INDEX.size:
+            with open(index_path, 'rb') as f:
+                f.seek(-INDEX.size, os.SEEK_END)
+                self.next_game = INDEX.unpack(f.read(INDEX.size))[0] + 1
+        self._data = open(path, 'ab')
+        if self._data.tell() == 0:
+            self._data.write(MAGIC)
+        self._index = open(index_path, 'ab')
+        self.game: Optional[int] = None
+        self.steps = 0
+
+    def begin(self, n: int, seed: int) -> int:
+        """Start a new game and return its id"""
+        if not 0 <= seed <= MAX_SEED:
+            raise ValueError(f"seed must be from 0 to 2**64 - 1 to be recorded, got {seed}")
+        self.game = self.next_game
+        self.next_game += 1
+        self.steps = 0
+        self._index.write(INDEX.pack(self.game, 0, self._data.tell()))
+        self._data.write(GAME.pack(b'G', n, seed))
+        return self.game
+
+    def record_step(self, action: int, sensors: dict[int, bool], score_delta: int,
+                    controller: Optional[GameController] = None):
+        """Log one action; with the controller that took it, index entries get a checkpoint"""
+        self._data.write(STEP.pack(b'S', action, pack_percepts(sensors), score_delta))
+        self.steps += 1
+        if self.steps % self.index_every == 0:
+            self._index.write(INDEX.pack(self.game, self.steps, self._data.tell()))
+            if controller is not None:
+                blob = pickle.dumps(controller.checkpoint(), pickle.HIGHEST_PROTOCOL)
+                self._data.write(CHECKPOINT.pack(b'C', len(blob)) + blob)
+
+    def end(self, outcome: Optional[str]):
+        self._data.write(END.pack(b'E', OUTCOMES.index(outcome)))
+        self.flush()
+
+    def flush(self):
+        # Data before index, so an index entry never points past the data
+        self._data.flush()
+        self._index.flush()
+
+    def close(self):
+        self.flush()
+        self._data.close()
+        self._index.close()
+
+    def __enter__(self) -> 'TraceRecorder':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class TraceReader:
+    """Random access to the games of a trace file"""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path + '.idx', 'rb') as f:
+            self.entries = list(INDEX.iter_unpack(f.read()))
+        self._keys = [(game, step) for game, step, _ in self.entries]
+        self._file = open(path, 'rb')
+        if self._file.read(len(MAGIC)) not in (MAGIC, OLD_MAGIC):
+            raise ValueError(f"{path} is not a game trace")
+
+    def __len__(self) -> int:
+        return self.entries[-1][0] + 1 if self.entries else 0
+
+    def close(self):
+        self._file.close()
+
+    def _records(self, offset: int) -> Iterator[tuple[bytes, tuple]]:
+        f = self._file
+        f.seek(offset)
+        while True:
+            tag = f.read(1)
+            if not tag:
+                return
+            layout = RECORDS.get(tag)
+            if layout is None:
+                raise ValueError(f"corrupt trace record at offset {f.tell() - 1}")
+            fields = layout.unpack(tag + f.read(layout.size - 1))
+            if tag == b'C':
+                fields = (tag, f.read(fields[1]))  # The pickled checkpoint
+            yield tag, fields
+
+    def _entry(self, key: tuple[int, int]) -> tuple[int, int, int]:
+        """Last index entry at or before key, which must belong to key's game"""
+        k = bisect_right(self._keys, key) - 1
+        if k < 0 or self.entries[k][0] != key[0]:
+            raise IndexError(key[0])
+        return self.entries[k]
+
+    def _game_records(self, entry: tuple[int, int, int]) -> Iterator[tuple[bytes, tuple]]:
+        """Records of one game from an index entry up to its END or the next GAME"""
+        for k, (tag, fields) in enumerate(self._records(entry[2])):
+            if tag == b'G' and (k > 0 or entry[1] > 0):
+                return
+            yield tag, fields
+            if tag == b'E':
+                return
+
+    def game(self, game: int) -> tuple[int, int]:
+        """(n, seed) of a game"""
+        _, (_, n, seed) = next(self._records(self._entry((game, 0))[2]))
+        return n, seed
+
+    def steps(self, game: int, start: int = 0) -> Iterator[TraceStep]:
+        """Steps of a game from `start` on, read from the nearest index entry"""
+        entry = self._entry((game, start))
+        step = entry[1]
+        for tag, fields in self._game_records(entry):
+            if tag == b'S':
+                if step >= start:
+                    yield TraceStep(*fields[1:])
+                step += 1
+
+    def step(self, game: int, index: int) -> TraceStep:
+        """The index-th action (0-based) of a game"""
+        for record in self.steps(game, index):
+            return record
+        raise IndexError(index)
+
+    def outcome(self, game: int) -> Optional[str]:
+        """'win' or 'lose', or None if the game was cut short"""
+        for tag, fields in self._game_records(self._entry((game, 2 ** 32 - 1))):
+            if tag == b'E':
+                return OUTCOMES[fields[1]]
+        return None
+
+    def checkpoint(self, game: int, stop: Optional[int] = None) -> tuple[int, Optional[tuple]]:
+        """(step, GameController.checkpoint()) of the last checkpoint at or before stop, or (0, None)"""
+        entry = self._entry((game, 2 ** 32 - 1 if stop is None else stop))
+        if entry[1]:
+            tag, fields = next(self._game_records(entry), (None, None))
+            if tag == b'C':
+                return entry[1], pickle.loads(fields[1])
+        return 0, None
+
+    def replay(self, game: int, stop: Optional[int] = None,
+               make_controller: Optional[Callable[[int, int], GameController]] = None,
+               verify: bool = True) -> GameController:
+        """Rebuild a game after its first `stop` actions from the seed and the logged actions.
+
+        Without make_controller the game resumes from the nearest checkpoint
+        and only the actions after it are simulated. A make_controller game
+        is always rebuilt from the first action, since checkpoints hold the
+        recording engine's state, not its own. With verify, every replayed
+        percept and score change is checked against the log, so a diverging
+        engine or world is caught at the step where it first differs.
+        """
+        n, seed = self.game(game)
+        controller = make_controller(n, seed) if make_controller else GameController(n, seed)
+        start, checkpoint = (0, None) if make_controller else self.checkpoint(game, stop)
+        if checkpoint is not None:
+            controller.resume(checkpoint)
+        else:
+            controller.agent.update_knowledge()
+        for k, record in enumerate(self.steps(game, start), start):
+            if stop is not None and k >= stop:
+                break
+            score = controller.agent.score
+            controller.step(record.action)
+            if verify and (pack_percepts(controller.agent.sensors) != record.percepts
+                           or controller.agent.score - score != record.score_delta):
+                raise ValueError(f"game {game} diverges from the trace at step {k}")
+        return controller
+
+
+def main(argv: Optional[list[str]] = None):
+    import argparse
+    parser = argparse.ArgumentParser(prog='wumpus replay',
+                                     description="Show a recorded game at any step.")
+    parser.add_argument('trace', help='Trace file written with --record')
+    parser.add_argument('--game', type=int, default=0, help='Game id (default: 0)')
+    parser.add_argument('--step', type=int, help='Actions to replay (default: the whole game)')
+    args = parser.parse_args(argv)
+
+    reader = TraceReader(args.trace)
+    n, seed = reader.game(args.game)
+    controller = reader.replay(args.game, args.step)
+    print(f"Game {args.game}: n={n} seed={seed} outcome={reader.outcome(args.game)} "
+          f"after {controller.steps} action(s)")
+    controller.display_world()
+    upcoming = next(reader.steps(args.game, controller.steps), None)
+    if upcoming is not None:
+        print(f"Next action: {upcoming.action}")
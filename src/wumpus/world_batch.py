@@ -0,0 +1,61 @@
+from .array_world import ArrayWorldManager, spread_adjacent
+from .cell import Cell
+from .worldmanager import WorldManager
+from .world_spec import WorldSpec
+import numpy as np
+from typing import Optional, Sequence
+
+
+def world_rng(base_seed: int, index: int) -> np.random.Generator:
+    """Independent generator for world `index` of the stream rooted at `base_seed`"""
+    return np.random.default_rng(np.random.SeedSequence(base_seed, spawn_key=(index,)))
+
+
+class WorldBatch:
+    """B worlds of size n stored as stacked (B, n, n) boolean planes.
+
+    World k of a batch always comes from world_rng(base_seed, start + k), so a
+    world is identical no matter how a range of indices is split into batches.
+    """
+
+    def __init__(self, n: int, base_seed: int, count: int, start: int = 0,
+                 spec: Optional[WorldSpec] = None):
+        self.n = n
+        self.base_seed = base_seed
+        self.start = start
+        self.planes: dict[int, np.ndarray] = {
+            flag: np.zeros((count, n, n), dtype=bool) for flag in ArrayWorldManager.PLANES
+        }
+
+        layouts = [WorldManager.sample_layout(n, world_rng(base_seed, start + b), spec) for b in range(count)]
+        self.planes.update(self.layout_planes(n, layouts))
+
+        self.planes[Cell.STENCH] |= spread_adjacent(self.planes[Cell.WUMPUS])
+        self.planes[Cell.BREEZE] |= spread_adjacent(self.planes[Cell.PIT])
+
+    @staticmethod
+    def layout_planes(n: int, layouts: Sequence[dict[int, list[tuple[int, int]]]]) -> dict[int, np.ndarray]:
+        """(len(layouts), n, n) WUMPUS, PIT and GOLD planes for WorldManager.sample_layout results"""
+        # Gather every position first, then scatter each flag in one indexed write
+        hits: dict[int, tuple[list[int], list[int], list[int]]] = {
+            flag: ([], [], []) for flag in (Cell.WUMPUS, Cell.PIT, Cell.GOLD)
+        }
+        for b, layout in enumerate(layouts):
+            for flag, positions in layout.items():
+                bs, is_, js = hits[flag]
+                for i, j in positions:
+                    bs.append(b)
+                    is_.append(i)
+                    js.append(j)
+        planes = {}
+        for flag, (bs, is_, js) in hits.items():
+            planes[flag] = np.zeros((len(layouts), n, n), dtype=bool)
+            planes[flag][bs, is_, js] = True
+        return planes
+
+    def __len__(self) -> int:
+        return self.planes[Cell.PIT].shape[0]
+
+    def world(self, k: int) -> ArrayWorldManager:
+        """WorldManager-compatible view of world k (shares memory with the batch)"""
+        return ArrayWorldManager.from_planes({flag: plane[k] for flag, plane in self.planes.items()})
@@ -0,0 +1,65 @@
+from dataclasses import dataclass
+from typing import Optional, Sequence, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import numpy as np
+
+
+@dataclass(frozen=True)
+class WorldSpec:
+    """How many hazards a generated world gets.
+
+    Pits come from `num_pits` when given, otherwise from `pit_density` times
+    the number of free cells, otherwise from the classic round(n * 0.2).
+    Cells within Manhattan distance `start_clearance` of the start never get
+    a hazard or gold.
+    """
+    pit_density: Optional[float] = None
+    num_pits: Optional[int] = None
+    num_wumpus: int = 1
+    num_gold: int = 1
+    start_clearance: int = 0
+
+    def excluded_cells(self, n: int) -> list[tuple[int, int]]:
+        r = self.start_clearance
+        return [(i, j) for i in range(min(r, n - 1) + 1) for j in range(min(r - i, n - 1) + 1)]
+
+    def pit_count(self, n: int) -> int:
+        if self.num_pits is not None:
+            return self.num_pits
+        if self.pit_density is not None:
+            return int(round(self.pit_density * (n * n - len(self.excluded_cells(n)))))
+        return int(round(n * 0.2))  # Half to even, as np.round
+
+
+def sample_cells(n: int, k: int, rng: 'np.random.Generator',
+                 excluded: Sequence[tuple[int, int]] = ()) -> list[tuple[int, int]]:
+    """Pick k distinct cells of an n x n grid, none in `excluded`, in random order.
+
+    Uses Floyd's algorithm over the flat indices that remain after removing
+    `excluded`, followed by a Fisher-Yates shuffle, so it costs O(k + len(excluded))
+    draws and memory regardless of n. Asking for more cells than exist returns
+    every free cell.
+    """
+    skipped = sorted({i * n + j for i, j in excluded})
+    total = n * n - len(skipped)
+    k = min(k, total)
+
+    chosen: dict[int, None] = {}
+    for top in range(total - k, total):
+        t = int(rng.integers(top + 1))
+        chosen[top if t in chosen else t] = None
+    picks = list(chosen)
+    for a in range(len(picks) - 1, 0, -1):
+        b = int(rng.integers(a + 1))
+        picks[a], picks[b] = picks[b], picks[a]
+
+    cells = []
+    for t in picks:
+        for e in skipped:
+            if t >= e:
+                t += 1
+            else:
+                break
+        cells.append(divmod(t, n))
+    return cells
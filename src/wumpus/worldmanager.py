@@ -1,45 +1,56 @@
 from .cell import Cell
-import numpy as np
-from typing import Optional
+from .pcg64 import default_rng
+from .topology import get_topology
+from .world_spec import WorldSpec, sample_cells
+from typing import Optional, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import numpy as np
 
 class WorldManager:
     STARTPOS = (0,0)
-    def __init__(self, n: int, seed: Optional[int] = None):
+    def __init__(self, n: int, seed: Optional[int] = None,
+                 rng: Optional['np.random.Generator'] = None,
+                 spec: Optional[WorldSpec] = None):
         self.n = n
+        self.topology = get_topology(n)
         self.world: list[list[Cell]] = []
         #populate map
         for _ in range(n):
             cells = [Cell() for i in range(n)]
             self.world.append(cells)
 
-        self.setup(seed)
+        self.setup(seed, rng, spec)
         self.setup_perceptions()
-    def setup(self, seed: Optional[int] = None):
-        if seed is not None:
-            np.random.seed(seed)
+    def setup(self, seed: Optional[int] = None, rng: Optional['np.random.Generator'] = None,
+              spec: Optional[WorldSpec] = None):
+        if rng is None:
+            # Same draws as np.random.default_rng(seed), without importing numpy
+            rng = default_rng(seed)
 
-        num_pits = int(np.round(self.n * 0.2))
-        available_positions = [(i,j) for i in range(self.n) for j in range(self.n)]
-        available_positions.remove(WorldManager.STARTPOS)
+        for flag, positions in self.sample_layout(self.n, rng, spec).items():
+            for pos in positions:
+                self.place(pos, flag)
 
-        # Place wumpus
-        wumpus_idx = np.random.randint(len(available_positions))
-        wumpus_pos = available_positions.pop(wumpus_idx)
-        self.world[wumpus_pos[0]][wumpus_pos[1]].set_flag(Cell.WUMPUS)
+    @staticmethod
+    def sample_layout(n: int, rng: 'np.random.Generator',
+                      spec: Optional[WorldSpec] = None) -> dict[int, list[tuple[int, int]]]:
+        """Returns the positions of each entity flag, drawn from rng only"""
+        if spec is None:
+            spec = WorldSpec()
+        counts = [(Cell.WUMPUS, spec.num_wumpus), (Cell.PIT, spec.pit_count(n)), (Cell.GOLD, spec.num_gold)]
+        cells = sample_cells(n, sum(k for _, k in counts), rng, spec.excluded_cells(n))
 
-        # Place pits
-        for _ in range(num_pits):
-            if not available_positions:
-                break
-            pit_idx = np.random.randint(len(available_positions))
-            pit_pos = available_positions.pop(pit_idx)
-            self.world[pit_pos[0]][pit_pos[1]].set_flag(Cell.PIT)
+        # Hand out the sampled cells in order: wumpus first, then pits, then gold
+        layout: dict[int, list[tuple[int, int]]] = {}
+        taken = 0
+        for flag, k in counts:
+            layout[flag] = cells[taken:taken + k]
+            taken += k
+        return layout
 
-        # Place gold
-        if available_positions:
-            gold_idx = np.random.randint(len(available_positions))
-            gold_pos = available_positions.pop(gold_idx)
-            self.world[gold_pos[0]][gold_pos[1]].set_flag(Cell.GOLD)
+    def place(self, pos: tuple[int, int], flag: int):
+        self.get_pos(pos).set_flag(flag)
         
     def setup_perceptions(self):
         for i in range(self.n):
@@ -63,14 +74,5 @@ class WorldManager:
         return self.world
     
     def get_adjacent_cells(self, pos: tuple[int, int]) -> list[Cell]:
-        i, j = pos
-        cells: list[Cell] = []
-        if i > 0:
-            cells.append(self.world[i - 1][j])
-        if i < self.n - 1:
-            cells.append(self.world[i + 1][j])
-        if j > 0:
-            cells.append(self.world[i][j - 1])
-        if j < self.n - 1:
-            cells.append(self.world[i][j + 1])
-        return cells
\ No newline at end of file
+        world = self.world
+        return [world[i][j] for i, j in self.topology.adjacent(pos)]
@@ -0,0 +1,9 @@
+from wumpus.trace_log import unpack_percepts
+
+
+def percepts(*flags):
+    """A sensor dict with only the given flags set"""
+    sensors = unpack_percepts(0)
+    for flag in flags:
+        sensors[flag] = True
+    return sensors
@@ -0,0 +1,39 @@
+import numpy as np
+import pytest
+from wumpus.agent import Agent
+from wumpus.array_world import ArrayWorldManager
+from wumpus.cell import Cell
+from wumpus.worldmanager import WorldManager
+
+class TestArrayWorldManager:
+    def test_matches_cell_world(self):
+        for seed in range(10):
+            cells = WorldManager(6, seed)
+            arrays = ArrayWorldManager(6, seed)
+            for i in range(6):
+                for j in range(6):
+                    assert arrays.get_pos((i, j)).flags == cells.get_pos((i, j)).flags
+
+    def test_perceptions_from_planes(self):
+        world = ArrayWorldManager(5, seed=3)
+        i, j = np.argwhere(world.planes[Cell.WUMPUS])[0]
+        wumpus = (int(i), int(j))
+        for cell in world.get_adjacent_cells(wumpus):
+            assert cell.check_flag(Cell.STENCH)
+
+    def test_cell_view_writes_planes(self):
+        world = ArrayWorldManager(4, seed=1)
+        cell = world.get_pos((2, 2))
+        cell.set_flag(Cell.GOLD)
+        assert world.planes[Cell.GOLD][2, 2]
+        cell.clear_flag(Cell.GOLD)
+        assert not cell.check_flag(Cell.GOLD)
+
+    def test_agent_with_array_backend(self):
+        agent = Agent(4, world_manager=ArrayWorldManager(4, seed=42))
+        assert set(agent.sense()) == {Cell.BREEZE, Cell.STENCH, Cell.BUMP, Cell.GLITTER, Cell.SCREAM}
+        agent.world_manager.get_pos(agent.pos).set_flag(Cell.GOLD)
+        assert agent.grab_gold()
+        assert not agent.gold_at(agent.pos)
+        assert not agent.sense()[Cell.GLITTER]
+        assert agent.check_game_end() == 'win'
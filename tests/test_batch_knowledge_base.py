@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+from wumpus.agent import Agent
+from wumpus.batch_knowledge_base import BatchKnowledgeBase
+from wumpus.cell import Cell
+from wumpus.game_controller import GameController
+from wumpus.policy import RandomPolicy
+
+def as_set(plane):
+    return {(int(i), int(j)) for i, j in np.argwhere(plane)}
+
+class TestBatchKnowledgeBase:
+    def test_init(self):
+        kb = BatchKnowledgeBase(3, 4)
+        assert kb.safe[:, 0, 0].all()
+        assert not kb.possible_pits[:, 0, 0].any()
+        assert kb.possible_pits.sum() == 3 * 15
+
+    def test_mirrors_knowledge_base(self):
+        n, games = 5, 12
+        controllers = [GameController(n, seed) for seed in range(games)]
+        policies = [RandomPolicy(seed) for seed in range(games)]
+        batch = BatchKnowledgeBase(games, n)
+
+        def observe(active):
+            positions = np.array([c.agent.pos for c in controllers])
+            breeze = np.array([c.agent.sensors[Cell.BREEZE] for c in controllers])
+            stench = np.array([c.agent.sensors[Cell.STENCH] for c in controllers])
+            batch.update_knowledge(positions, breeze, stench, active)
+
+        for c in controllers:
+            c.agent.update_knowledge()
+        observe(np.ones(games, dtype=bool))
+        for _ in range(30):
+            active = np.array([c.game_state is None for c in controllers])
+            for c, policy, live in zip(controllers, policies, active):
+                if live:
+                    c.step(policy.choose_action(c.agent.sensors, c.agent.kb, c.agent.pos, c.agent.orientation))
+            observe(active)
+
+        for b, c in enumerate(controllers):
+            kb = c.agent.kb
+            assert as_set(batch.visited[b]) == kb.visited
+            assert as_set(batch.safe[b]) == kb.safe
+            assert as_set(batch.possible_pits[b]) == kb.possible_pits
+            assert as_set(batch.possible_wumpus[b]) == kb.possible_wumpus
+            assert as_set(batch.definite_pits[b]) == kb.definite_pits
+            assert as_set(batch.definite_wumpus[b]) == kb.definite_wumpus
+
+    def test_should_shoot(self):
+        kb = BatchKnowledgeBase(2, 4)
+        kb.definite_wumpus[0, 0, 3] = True
+        kb.definite_wumpus[1, 2, 0] = True
+        positions = np.array([[0, 0], [0, 0]])
+        orientations = np.array([Agent.RIGHT, Agent.RIGHT])
+        assert kb.should_shoot(positions, orientations).tolist() == [True, False]
+        kb.mark_wumpus_dead(np.array([True, False]))
+        assert not kb.should_shoot(positions, orientations)[0]
@@ -0,0 +1,35 @@
+from wumpus.cellset import CellSet
+
+
+class TestCellSet:
+    def test_complement_membership_and_length(self):
+        cells = CellSet.everything_except(3, [(0, 0)])
+        assert len(cells) == 8
+        assert (0, 0) not in cells
+        assert (2, 2) in cells
+        assert (3, 0) not in cells
+        cells.discard((1, 1))
+        cells.discard((5, 5))
+        assert len(cells) == 7
+        cells.add((1, 1))
+        assert (1, 1) in cells
+
+    def test_complement_iterates_like_a_set(self):
+        cells = CellSet.everything_except(3, [(0, 0), (1, 2)])
+        expected = {(i, j) for i in range(3) for j in range(3)} - {(0, 0), (1, 2)}
+        assert set(cells) == expected
+        assert cells == expected
+        assert expected == cells
+
+    def test_union_and_inverted(self):
+        everything = CellSet.everything_except(4, [(0, 0), (1, 1)])
+        assert (everything | {(1, 1)}).inverted() == {(0, 0)}
+        assert (CellSet(4, [(2, 2)]) | CellSet(4, [(3, 3)])) == {(2, 2), (3, 3)}
+        assert (everything | CellSet.everything_except(4, [(0, 0)])).inverted() == {(0, 0)}
+
+    def test_replace_leaves_complement_mode(self):
+        cells = CellSet.everything_except(4)
+        cells.replace([(0, 1), (1, 0)])
+        assert not cells.complement
+        assert cells == {(0, 1), (1, 0)}
+        assert cells <= {(0, 1), (1, 0), (2, 2)}
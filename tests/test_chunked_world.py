@@ -0,0 +1,46 @@
+from wumpus.cell import Cell
+from wumpus.chunked_world import ChunkedWorldManager
+from wumpus.game_controller import GameController
+from wumpus.policy import ExplorerPolicy
+from wumpus.world_spec import WorldSpec
+
+
+def snapshot(world, n):
+    return [[frozenset(world.get_pos((i, j)).flags) for j in range(n)] for i in range(n)]
+
+
+class TestChunkedWorldManager:
+    def test_evicted_chunks_regenerate_identically(self):
+        roomy = snapshot(ChunkedWorldManager(20, seed=5, chunk_size=8), 20)
+        tight = ChunkedWorldManager(20, seed=5, chunk_size=8, max_chunks=1)
+        assert snapshot(tight, 20) == roomy
+        assert tight.generated > 9
+        assert snapshot(tight, 20) == roomy
+
+    def test_percepts_agree_across_chunk_borders(self):
+        spec = WorldSpec(pit_density=0.15)
+        world = ChunkedWorldManager(21, seed=3, spec=spec, chunk_size=5, max_chunks=4)
+        grid = snapshot(world, 21)
+        for i in range(21):
+            for j in range(21):
+                near = [grid[a][b] for a, b in ((i - 1, j), (i + 1, j), (i, j - 1), (i, j + 1))
+                        if 0 <= a < 21 and 0 <= b < 21]
+                assert (Cell.BREEZE in grid[i][j]) == any(Cell.PIT in f for f in near)
+                assert (Cell.STENCH in grid[i][j]) == any(Cell.WUMPUS in f for f in near)
+
+    def test_edits_survive_eviction(self):
+        world = ChunkedWorldManager(16, seed=1, chunk_size=4, max_chunks=1)
+        world.get_pos((0, 1)).set_flag(Cell.GOLD)
+        world.get_pos((15, 15))
+        assert world.get_pos((0, 1)).check_flag(Cell.GOLD)
+        world.get_pos((0, 1)).clear_flag(Cell.GOLD)
+        world.get_pos((15, 15))
+        assert not world.get_pos((0, 1)).check_flag(Cell.GOLD)
+
+    def test_huge_world_episode(self):
+        n = 10 ** 9
+        world = ChunkedWorldManager(n, seed=2, chunk_size=32, max_chunks=8)
+        controller = GameController(n, world_manager=world)
+        result = controller.run_episode(ExplorerPolicy(), max_steps=100)
+        assert result.steps > 0
+        assert len(world._chunks) <= 8
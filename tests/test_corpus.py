@@ -0,0 +1,65 @@
+import os
+import numpy as np
+import pytest
+from wumpus.cell import Cell
+from wumpus.corpus import WorldCorpus, build_corpus
+from wumpus.tournament import main as tournament_main, make_shards, run_tournament, summarize
+from wumpus.world_batch import WorldBatch
+
+
+class TestWorldCorpus:
+    def test_matches_world_batch(self, tmp_path):
+        path = str(tmp_path / 'worlds.wcorp')
+        build_corpus(path, 5, base_seed=9, count=23, workers=2, batch_size=7)
+        corpus = WorldCorpus(path)
+        batch = WorldBatch(5, 9, 23)
+        assert len(corpus) == 23 and corpus.n == 5
+        planes = corpus.planes(0, 23)
+        for flag, plane in batch.planes.items():
+            assert np.array_equal(planes[flag], plane)
+
+    def test_world_view_reads_bits_and_overlays_writes(self, tmp_path):
+        path = str(tmp_path / 'worlds.wcorp')
+        build_corpus(path, 6, base_seed=1, count=4, workers=1)
+        corpus = WorldCorpus(path)
+        expected = WorldBatch(6, 1, 4).world(3)
+        world = corpus.world(3)
+        for i in range(6):
+            for j in range(6):
+                assert world.get_pos((i, j)).flags == expected.get_pos((i, j)).flags
+
+        gold = next((i, j) for i in range(6) for j in range(6) if world.get_pos((i, j)).check_flag(Cell.GOLD))
+        world.get_pos(gold).clear_flag(Cell.GOLD)
+        assert not world.get_pos(gold).check_flag(Cell.GOLD)
+        assert corpus.world(3).get_pos(gold).check_flag(Cell.GOLD)
+
+    def test_rejects_other_files(self, tmp_path):
+        path = tmp_path / 'junk.bin'
+        path.write_bytes(b'\0' * 64)
+        with pytest.raises(ValueError):
+            WorldCorpus(str(path))
+
+    def test_tournament_checks_the_corpus(self, tmp_path, capsys):
+        first, second = str(tmp_path / 'first.wcorp'), str(tmp_path / 'second.wcorp')
+        build_corpus(first, 4, base_seed=0, count=10, workers=1)
+        with pytest.raises(SystemExit):
+            tournament_main(['--corpus', first, '--seeds', '5:11', '--workers', '1'])
+        assert 'outside the corpus' in capsys.readouterr().err
+
+        out = str(tmp_path / 'out')
+        args = ['--seeds', '0:10', '--shard-size', '5', '--workers', '1', '--max-steps', '50', '--out', out]
+        tournament_main(['--corpus', first] + args)
+        tournament_main(['--corpus', first] + args)
+        assert "skipped 2 already finished" in capsys.readouterr().out
+        # Same file name, other worlds: nothing is reused
+        build_corpus(second, 4, base_seed=1, count=10, workers=1)
+        os.replace(second, first)
+        tournament_main(['--corpus', first] + args)
+        assert "Played 2 shard(s)" in capsys.readouterr().out
+
+    def test_tournament_over_corpus(self, tmp_path):
+        path = str(tmp_path / 'worlds.wcorp')
+        build_corpus(path, 4, base_seed=0, count=10, workers=1)
+        shards = make_shards(['logic'], [4], range(0, 10), 5)
+        assert run_tournament(shards, str(tmp_path / 'out'), workers=1, max_steps=50, corpus=path) == 2
+        assert summarize(str(tmp_path / 'out'), shards)[('logic', 4)]['games'] == 10
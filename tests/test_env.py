@@ -0,0 +1,84 @@
+import numpy as np
+import pytest
+from wumpus.agent import Agent
+from wumpus.env import BELIEF_PLANES, VectorEnv
+from wumpus.game_controller import GameController
+from wumpus.policy import LogicPolicy
+from wumpus.trace_log import OUTCOMES, pack_percepts
+
+
+def percept_mask(row):
+    return sum(1 << bit for bit, flag in enumerate(row) if flag)
+
+
+class TestVectorEnv:
+    def test_matches_game_controller(self):
+        n, games = 5, 16
+        env = VectorEnv(n, games)
+        obs = env.reset(range(games))
+        controllers = [GameController(n, seed) for seed in range(games)]
+        policies = [LogicPolicy() for _ in range(games)]
+        for c in controllers:
+            c.agent.update_knowledge()
+        live = np.ones(games, dtype=bool)
+        for _ in range(60):
+            actions = np.zeros(games, dtype=int)
+            for b, (c, policy) in enumerate(zip(controllers, policies)):
+                if live[b]:
+                    a = c.agent
+                    action = policy.choose_action(a.sensors, a.kb, a.pos, a.orientation)
+                    if action is None:
+                        live[b] = False
+                    else:
+                        actions[b] = action
+            if not live.any():
+                break
+            score = [c.agent.score for c in controllers]
+            obs, reward, terminated, truncated, info = env.step(actions)
+            for b, c in enumerate(controllers):
+                if not live[b]:
+                    continue
+                c.step(int(actions[b]))
+                assert reward[b] == c.agent.score - score[b]
+                assert terminated[b] == (c.game_state is not None)
+                assert OUTCOMES[info['outcome'][b]] == c.game_state
+                assert info['score'][b] == c.agent.score
+                if c.game_state is not None:
+                    live[b] = False
+                    continue
+                assert percept_mask(obs['percepts'][b]) == pack_percepts(c.agent.sensors)
+                assert tuple(obs['pose'][b]) == (*c.agent.pos, c.agent.orientation)
+                assert obs['has_arrow'][b] == c.agent.has_arrow
+                assert {tuple(p) for p in np.argwhere(env.kb.safe[b])} == c.agent.kb.safe
+        assert not truncated.any()
+        assert any(c.game_state == 'win' for c in controllers)
+
+    def test_auto_reset(self):
+        env = VectorEnv(4, 3, max_steps=2)
+        env.reset([10, 11, 12])
+        env.step([Agent.BOTTOM] * 3)
+        obs, reward, terminated, truncated, info = env.step([Agent.TOP] * 3)
+        assert truncated.all() and not terminated.any()
+        assert list(info['steps']) == [2, 2, 2] and list(info['score']) == [-2, -2, -2]
+        assert list(env.seeds) == [13, 14, 15]
+        assert (obs['pose'] == [0, 0, Agent.RIGHT]).all()
+        assert (env.steps == 0).all() and (env.score == 0).all()
+        assert env.kb.visited.sum() == 3
+
+    def test_belief_crop(self):
+        env = VectorEnv(4, 2, crop=1)
+        obs = env.reset([0, 1])
+        crop = obs['belief']
+        assert crop.shape == (2, len(BELIEF_PLANES) + 1, 3, 3)
+        # At the corner, the row above and the column to the left are off the board
+        assert crop[:, -1, 0].all() and crop[:, -1, :, 0].all()
+        assert not crop[:, -1, 1:, 1:].any()
+        assert crop[:, BELIEF_PLANES.index('visited'), 1, 1].all()
+
+    def test_rejects_bad_actions(self):
+        env = VectorEnv(4, 2)
+        env.reset()
+        with pytest.raises(ValueError):
+            env.step([Agent.FORWARD, 9])
+        with pytest.raises(ValueError):
+            env.step([Agent.FORWARD])
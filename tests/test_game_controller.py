@@ -0,0 +1,61 @@
+import pytest
+from wumpus.agent import Agent
+from wumpus.cell import Cell
+from wumpus.game_controller import GameController
+from wumpus.knowledge_base import KnowledgeBase
+from wumpus.policy import LogicPolicy
+from .helpers import percepts
+
+class ScriptedPolicy:
+    def __init__(self, actions):
+        self.actions = list(actions)
+
+    def choose_action(self, percepts, kb, pos, orientation):
+        return self.actions.pop(0) if self.actions else None
+
+class TestGameController:
+    def test_step_is_silent(self, capsys):
+        controller = GameController(4, seed=42)
+        controller.agent.update_knowledge()
+        controller.step(Agent.LEFT)
+        assert capsys.readouterr().out == ""
+        assert controller.steps == 1
+        assert controller.get_score() == -1
+
+    def test_bump_survives_sensing(self):
+        controller = GameController(4, seed=42)
+        controller.step(Agent.TOP)
+        controller.step(Agent.FORWARD)
+        assert controller.agent.sensors[Cell.BUMP]
+        controller.step(Agent.RIGHT)
+        assert not controller.agent.sensors[Cell.BUMP]
+
+    def test_run_episode_scripted(self, capsys):
+        controller = GameController(4, seed=42)
+        result = controller.run_episode(ScriptedPolicy([Agent.BOTTOM, Agent.RIGHT]))
+        assert capsys.readouterr().out == ""
+        assert result.steps == 2
+        assert result.outcome is None
+        assert result.score == -2
+
+    def test_run_episode_logic_policy(self):
+        for seed in range(20):
+            result = GameController(5, seed).run_episode(LogicPolicy(), max_steps=200)
+            assert result.outcome in ('win', 'lose', None)
+            assert result.steps <= 200
+
+class TestLogicPolicy:
+    def test_grabs_glitter(self):
+        action = LogicPolicy().choose_action(percepts(Cell.GLITTER), KnowledgeBase(4), (0, 0), Agent.RIGHT)
+        assert action == Agent.GRAB
+
+    def test_moves_into_safe_cell(self):
+        kb = KnowledgeBase(4)
+        kb.update_knowledge((0, 0), percepts())
+        assert LogicPolicy().choose_action(percepts(), kb, (0, 0), Agent.RIGHT) == Agent.FORWARD
+
+    def test_gives_up_without_safe_cells(self):
+        kb = KnowledgeBase(4)
+        breeze = percepts(Cell.BREEZE)
+        kb.update_knowledge((0, 0), breeze)
+        assert LogicPolicy().choose_action(breeze, kb, (0, 0), Agent.RIGHT) is None
@@ -2,6 +2,7 @@ import pytest
 from wumpus.knowledge_base import KnowledgeBase
 from wumpus.cell import Cell
 from wumpus.agent import Agent
+from .helpers import percepts
 
 class TestKnowledgeBase:
     def test_init(self):
@@ -13,15 +14,13 @@ class TestKnowledgeBase:
 
     def test_update_knowledge_breeze(self):
         kb = KnowledgeBase(4)
-        sensors = {Cell.BREEZE: True, Cell.STENCH: False, Cell.GLITTER: False, Cell.BUMP: False, Cell.SCREAM: False}
-        kb.update_knowledge((0, 0), sensors)
+        kb.update_knowledge((0, 0), percepts(Cell.BREEZE))
         assert (0, 0) in kb.visited
         assert (0, 0) in kb.breeze_cells
 
     def test_update_knowledge_stench(self):
         kb = KnowledgeBase(4)
-        sensors = {Cell.BREEZE: False, Cell.STENCH: True, Cell.GLITTER: False, Cell.BUMP: False, Cell.SCREAM: False}
-        kb.update_knowledge((0, 0), sensors)
+        kb.update_knowledge((0, 0), percepts(Cell.STENCH))
         assert (0, 0) in kb.stench_cells
 
     def test_is_safe(self):
@@ -47,4 +46,46 @@ class TestKnowledgeBase:
     def test_mark_arrow_used(self):
         kb = KnowledgeBase(4)
         kb.mark_arrow_used()
-        assert kb.arrow_used
\ No newline at end of file
+        assert kb.arrow_used
+
+    def test_incremental_safe_matches_full_scan(self):
+        from wumpus.game_controller import GameController
+        from wumpus.policy import RandomPolicy
+        for seed in range(30):
+            controller = GameController(5, seed)
+            controller.run_episode(RandomPolicy(seed), max_steps=40)
+            kb = controller.agent.kb
+            dangers = kb.possible_pits | kb.possible_wumpus | kb.definite_pits | kb.definite_wumpus
+            expected = {(i, j) for i in range(5) for j in range(5) if (i, j) not in dangers}
+            assert kb.safe == expected
+
+    def test_definite_hazard_is_not_safe(self):
+        kb = KnowledgeBase(3)
+        kb.update_knowledge((0, 0), percepts())
+        kb.update_knowledge((0, 1), percepts(Cell.STENCH))
+        kb.update_knowledge((1, 0), percepts(Cell.STENCH))
+        assert kb.definite_wumpus == {(1, 1)}
+        assert not kb.is_safe((1, 1))
+        kb.mark_wumpus_dead()
+        assert kb.is_safe((1, 1)) == ((1, 1) not in kb.possible_pits)
+
+    def test_large_grid_stores_only_explored_cells(self):
+        kb = KnowledgeBase(100_000)
+        kb.update_knowledge((0, 0), percepts())
+        kb.update_knowledge((0, 1), percepts(Cell.BREEZE))
+        assert len(kb.possible_wumpus) == 100_000 ** 2 - 5
+        assert len(kb.possible_wumpus.cells) == 5
+        assert kb.possible_pits == {(0, 2), (1, 1)}
+        assert kb.is_safe((1, 0)) and not kb.is_safe((0, 2))
+
+    def test_safe_becomes_complement(self):
+        kb = KnowledgeBase(50)
+        kb.update_knowledge((0, 0), percepts())
+        kb.update_knowledge((0, 1), percepts(Cell.BREEZE))
+        kb.mark_wumpus_dead()
+        assert kb.safe_resets == 1
+        assert kb.safe == {(i, j) for i in range(50) for j in range(50)} - {(0, 2), (1, 1)}
+        # Only cells bordering the explored area are logged
+        assert set(kb.safe_log) == {(0, 0), (0, 1), (1, 0)}
+        kb.update_knowledge((1, 0), percepts())
+        assert (2, 0) in kb.safe_log
@@ -0,0 +1,69 @@
+import pytest
+from wumpus.cell import Cell
+from wumpus.game_controller import GameController
+from wumpus.logic import IncrementalSolver, LogicKnowledgeBase
+from wumpus.policy import LogicPolicy
+from wumpus.world_spec import WorldSpec
+from wumpus.worldmanager import WorldManager
+from .helpers import percepts
+
+
+class TestIncrementalSolver:
+    def test_sat_and_unsat(self):
+        solver = IncrementalSolver()
+        a, b, c = solver.new_var(), solver.new_var(), solver.new_var()
+        solver.add_clause([a, b])
+        solver.add_clause([-a, c])
+        assert solver.solve()
+        assert solver.solve([-b])
+        assert solver.model[a] and solver.model[c]
+        assert not solver.solve([-b, -c])
+
+    def test_entails_keeps_proof(self):
+        solver = IncrementalSolver()
+        a, b = solver.new_var(), solver.new_var()
+        solver.add_clause([a, b])
+        solver.add_clause([a, -b])
+        assert solver.entails(a)
+        assert solver.lit_value(a) is True
+        assert not solver.entails(b)
+
+    def test_pigeonhole_unsat(self):
+        solver = IncrementalSolver()
+        # 3 pigeons, 2 holes
+        x = [[solver.new_var() for _ in range(2)] for _ in range(3)]
+        for row in x:
+            solver.add_clause(row)
+        for h in range(2):
+            for p in range(3):
+                for q in range(p + 1, 3):
+                    solver.add_clause([-x[p][h], -x[q][h]])
+        assert not solver.solve()
+
+class TestLogicKnowledgeBase:
+    def test_multiple_pits_stay_possible(self):
+        kb = LogicKnowledgeBase(4)
+        kb.update_knowledge((0, 0), percepts())
+        kb.update_knowledge((0, 1), percepts(Cell.BREEZE))
+        # A breeze elsewhere says nothing about far cells
+        assert (3, 3) in kb.possible_pits
+        kb.update_knowledge((1, 0), percepts())
+        assert kb.definite_pits == {(0, 2)}
+        assert kb.is_safe((1, 1))
+        assert not kb.is_safe((0, 2))
+
+    def test_wumpus_located_by_two_stenches(self):
+        kb = LogicKnowledgeBase(4)
+        kb.update_knowledge((0, 0), percepts())
+        kb.update_knowledge((0, 1), percepts(Cell.STENCH))
+        kb.update_knowledge((1, 0), percepts(Cell.STENCH))
+        assert kb.definite_wumpus == {(1, 1)}
+        assert kb.should_shoot((1, 0), LogicKnowledgeBase.RIGHT)
+
+    def test_never_walks_into_hazard(self):
+        spec = WorldSpec(pit_density=0.2)
+        for seed in range(40):
+            world = WorldManager(6, seed, spec=spec)
+            controller = GameController(6, world_manager=world, knowledge_base=LogicKnowledgeBase(6))
+            result = controller.run_episode(LogicPolicy(), max_steps=300)
+            assert result.outcome != 'lose'
@@ -0,0 +1,71 @@
+from wumpus.cell import Cell
+from wumpus.game_controller import GameController
+from wumpus.knowledge_base import KnowledgeBase
+from wumpus.mcts import MCTSPolicy, _SampledWorld, belief_hash
+from wumpus.policy import POLICIES
+from .helpers import percepts
+
+
+class TestBeliefHash:
+    def test_same_observations_in_any_order_hash_equal(self):
+        a, b = KnowledgeBase(4), KnowledgeBase(4)
+        observations = [((0, 0), percepts()), ((0, 1), percepts(Cell.BREEZE)), ((1, 0), percepts())]
+        for pos, s in observations:
+            a.update_knowledge(pos, s)
+        for pos, s in reversed(observations):
+            b.update_knowledge(pos, s)
+        assert belief_hash(a, (1, 0), 2) == belief_hash(b, (1, 0), 2)
+
+    def test_percepts_and_pose_change_the_hash(self):
+        a, b = KnowledgeBase(4), KnowledgeBase(4)
+        a.update_knowledge((0, 0), percepts())
+        b.update_knowledge((0, 0), percepts(Cell.BREEZE))
+        assert belief_hash(a, (0, 0), 1) != belief_hash(b, (0, 0), 1)
+        assert belief_hash(a, (0, 0), 1) != belief_hash(a, (0, 0), 2)
+
+
+class TestMCTSPolicy:
+    def test_search_leaves_the_knowledge_base_untouched(self):
+        controller = GameController(5, 2)
+        kb = controller.agent.kb
+        controller.agent.update_knowledge()
+        before = (set(kb.visited), set(kb.safe), set(kb.possible_pits), set(kb.possible_wumpus))
+        policy = MCTSPolicy(iterations=50, seed=0)
+        policy.choose_action(controller.agent.sensors, kb, controller.agent.pos,
+                             controller.agent.orientation)
+        assert (set(kb.visited), set(kb.safe), set(kb.possible_pits), set(kb.possible_wumpus)) == before
+        assert kb._trail is None
+        assert policy.last_iterations == 50
+
+    def test_table_is_bounded(self):
+        policy = MCTSPolicy(iterations=100, max_nodes=20, seed=0)
+        GameController(6, 1).run_episode(policy, max_steps=10)
+        assert len(policy.table) <= 20
+        assert policy.evictions > 0
+
+    def test_time_budget_stops_early(self):
+        controller = GameController(8, 0)
+        controller.agent.update_knowledge()
+        policy = MCTSPolicy(iterations=10 ** 6, time_budget=0.05, seed=0)
+        policy.choose_action(controller.agent.sensors, controller.agent.kb,
+                             controller.agent.pos, controller.agent.orientation)
+        assert 0 < policy.last_iterations < 10 ** 6
+
+    def test_wins_most_small_worlds(self):
+        results = [GameController(4, seed).run_episode(POLICIES['mcts'](seed), max_steps=100)
+                   for seed in range(10)]
+        assert sum(r.outcome == 'win' for r in results) >= 6
+        assert not any(r.outcome == 'lose' for r in results)
+
+    def test_sampled_worlds_agree_with_breezes(self):
+        kb = KnowledgeBase(4)
+        kb.update_knowledge((0, 0), percepts())
+        kb.update_knowledge((0, 1), percepts(Cell.BREEZE))
+        kb.update_knowledge((1, 0), percepts(Cell.BREEZE))
+        policy = MCTSPolicy(seed=0)
+        policy._prepare(kb)
+        for _ in range(200):
+            world = _SampledWorld(policy, kb, policy.rng)
+            assert world.is_pit((0, 2)) or world.is_pit((1, 1))
+            assert world.is_pit((1, 1)) or world.is_pit((2, 0))
+            assert world.gold is None or not world.is_pit(world.gold)
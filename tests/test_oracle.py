@@ -0,0 +1,128 @@
+import heapq
+import numpy as np
+from wumpus import oracle
+from wumpus.agent import Agent
+from wumpus.cell import Cell
+from wumpus.corpus import WorldCorpus, build_corpus
+from wumpus.game_controller import GameController
+from wumpus.oracle import UNREACHABLE, line_of_fire, seed_planes, solve
+from wumpus.policy import LogicPolicy
+from wumpus.topology import get_topology
+from wumpus.results import ResultStore, aggregate
+from wumpus.tournament import Shard, make_shards, run_shard, run_tournament, summarize
+from wumpus.world_batch import WorldBatch
+from wumpus.world_spec import WorldSpec
+
+
+def planes_for(n, wumpus=(), pits=(), gold=()):
+    planes = {flag: np.zeros((1, n, n), dtype=bool) for flag in (Cell.WUMPUS, Cell.PIT, Cell.GOLD)}
+    for flag, cells in ((Cell.WUMPUS, wumpus), (Cell.PIT, pits), (Cell.GOLD, gold)):
+        for pos in cells:
+            planes[flag][0][pos] = True
+    return planes
+
+
+def best_score(n, planes, b):
+    """Dijkstra over (cost, pos, orientation, wumpus killed), one world at a time"""
+    wumpus, pit, gold = (planes[flag][b] for flag in (Cell.WUMPUS, Cell.PIT, Cell.GOLD))
+    topology = get_topology(n)
+    best, seen = 0, set()
+    queue = [(0, (0, 0), Agent.RIGHT, False)]
+    while queue:
+        cost, pos, facing, killed = heapq.heappop(queue)
+        if (pos, facing, killed) in seen:
+            continue
+        seen.add((pos, facing, killed))
+        if gold[pos]:
+            best = max(best, 1000 + 490 * killed - cost)
+        if killed:
+            best = max(best, 490 - cost)
+        moves = [(cost + 1, pos, o, killed) for o in range(4) if o != facing]
+        ahead = topology.forward_pos(pos, facing)
+        if ahead and not pit[ahead] and (killed or not wumpus[ahead]):
+            moves.append((cost + 1, ahead, facing, killed))
+        while not killed and ahead is not None:
+            if wumpus[ahead]:
+                moves.append((cost, pos, facing, True))
+                break
+            ahead = topology.forward_pos(ahead, facing)
+        for move in moves:
+            heapq.heappush(queue, move)
+    return best
+
+
+class TestOracle:
+    def test_straight_line(self):
+        result = solve(planes_for(4, wumpus=[(3, 3)], gold=[(0, 3)]))
+        assert result.plain_cost[0] == 3 and result.solvable[0]
+        # Face down the last column from (0, 3) and shoot before grabbing
+        assert result.fire_cost[0] == 4 and result.bound[0] == 1000 + 490 - 4
+        assert result.shoot_helps[0]
+
+    def test_walled_in(self):
+        result = solve(planes_for(4, wumpus=[(3, 0)], pits=[(0, 1), (1, 0)], gold=[(3, 3)]))
+        assert not result.solvable[0]
+        assert result.plain_cost[0] == result.shoot_cost[0] == UNREACHABLE
+        # Turning to face the wumpus down the column is still worth a shot
+        assert result.fire_cost[0] == 1 and result.bound[0] == 489
+
+    def test_matches_dijkstra(self):
+        for n, spec in ((4, None), (8, WorldSpec(pit_density=0.3)), (7, WorldSpec(pit_density=0.5, num_wumpus=2))):
+            planes = seed_planes(n, range(80), spec)
+            result = solve(planes)
+            assert [best_score(n, planes, b) for b in range(80)] == result.bound.tolist()
+        assert not result.solvable.all()
+
+    def test_line_of_fire(self):
+        target = np.zeros((1, 4, 4), dtype=bool)
+        target[0, 1, 2] = True
+        fire = line_of_fire(target)[0]
+        assert fire[Agent.RIGHT, 1, :2].all() and not fire[Agent.RIGHT, 1, 2:].any()
+        assert fire[Agent.TOP, 2:, 2].all() and fire[Agent.BOTTOM, 0, 2]
+        assert fire.sum() == 2 + 1 + 2 + 1
+
+    def test_batch_planes(self):
+        batch = WorldBatch(6, base_seed=3, count=20)
+        result = solve(batch.planes)
+        assert result.bound.shape == (20,)
+        for k in (0, 7, 19):
+            assert result.bound[k] == solve({f: p[k:k + 1] for f, p in batch.planes.items()}).bound[0]
+
+    def test_blocks_match_one_batch(self, monkeypatch):
+        planes = seed_planes(6, range(25), WorldSpec(pit_density=0.3))
+        whole = solve(planes)
+        monkeypatch.setattr(oracle, 'BLOCK_CELLS', 4 * 36)
+        blocked = solve(planes)
+        for field in ('plain_cost', 'shoot_cost', 'fire_cost', 'bound'):
+            assert np.array_equal(getattr(whole, field), getattr(blocked, field))
+        assert whole.plain_cost.dtype == np.int32
+
+    def test_regret_is_never_negative(self):
+        seeds = range(40)
+        scores = [GameController(5, seed).run_episode(LogicPolicy(), 200).score for seed in seeds]
+        regret = solve(seed_planes(5, seeds)).regret(scores)
+        assert (regret >= 0).all()
+
+
+class TestTournamentBound:
+    def test_rows_carry_bound(self):
+        rows = run_shard(Shard('logic', 4, 0, 5), max_steps=100, regret=True)
+        assert [row['bound'] for row in rows] == solve(seed_planes(4, range(5))).bound.tolist()
+        assert all(row['bound'] >= row['score'] for row in rows)
+
+    def test_bound_only_on_request(self, tmp_path):
+        assert not any('bound' in row for row in run_shard(Shard('logic', 4, 0, 5), max_steps=100))
+        shards = make_shards(['logic'], [4], range(0, 6), 3)
+        run_tournament(shards[:1], str(tmp_path), workers=1, max_steps=50, fmt='npz')
+        run_tournament(shards[1:], str(tmp_path), workers=1, max_steps=50, fmt='npz', regret=True)
+        groups = aggregate(ResultStore(str(tmp_path)))
+        assert groups[('logic', 4)].games == 6 and groups[('logic', 4)].count('regret') == 3
+        assert summarize(str(tmp_path), shards, fmt='npz')[('logic', 4)]['bounded'] == 3
+
+    def test_solvable_only(self, tmp_path):
+        path = str(tmp_path / 'dense.wcorp')
+        build_corpus(path, 5, base_seed=0, count=20, spec=WorldSpec(pit_density=0.5), workers=1)
+        solvable = solve(WorldCorpus(path).planes(0, 20)).solvable
+        assert 0 < solvable.sum() < 20
+        rows = run_shard(Shard('logic', 5, 0, 20), max_steps=20, corpus=path, solvable_only=True)
+        assert [row['seed'] for row in rows] == np.flatnonzero(solvable).tolist()
@@ -0,0 +1,67 @@
+import pytest
+from wumpus.agent import Agent
+from wumpus.game_controller import GameController
+from wumpus.knowledge_base import KnowledgeBase
+from wumpus.logic import LogicKnowledgeBase
+from wumpus.planner import PathPlanner
+from wumpus.policy import ExplorerPolicy
+
+def open_cells(kb, cells):
+    for cell in cells:
+        kb.safe.add(cell)
+        kb.safe_log.append(cell)
+
+class TestPathPlanner:
+    def test_turn_aware_route(self):
+        kb = KnowledgeBase(5)
+        open_cells(kb, [(0, 1), (0, 2), (1, 2), (2, 2), (2, 1), (2, 0)])
+        actions = PathPlanner(kb).plan((0, 0), Agent.RIGHT, (2, 0))
+        assert actions == [Agent.FORWARD, Agent.FORWARD, Agent.BOTTOM, Agent.FORWARD,
+                           Agent.FORWARD, Agent.LEFT, Agent.FORWARD, Agent.FORWARD]
+
+    def test_unreachable_goal(self):
+        kb = KnowledgeBase(4)
+        open_cells(kb, [(3, 3)])
+        assert PathPlanner(kb).plan((0, 0), Agent.RIGHT, (3, 3)) is None
+
+    def test_repairs_when_cells_open(self):
+        kb = KnowledgeBase(5)
+        open_cells(kb, [(0, 1), (0, 2), (1, 2), (2, 2), (2, 1), (2, 0)])
+        planner = PathPlanner(kb)
+        planner.plan((0, 0), Agent.RIGHT, (2, 0))
+        assert len(planner.plan((0, 1), Agent.RIGHT, (2, 0))) == 7
+        open_cells(kb, [(1, 0)])
+        assert planner.plan((0, 1), Agent.RIGHT, (2, 0)) == [Agent.LEFT, Agent.FORWARD, Agent.BOTTOM,
+                                                             Agent.FORWARD, Agent.FORWARD]
+
+    def test_restore_then_new_cells(self):
+        kb = KnowledgeBase(5)
+        mark = kb.snapshot()
+        for cell in [(0, 1), (0, 2), (1, 2), (2, 2), (2, 1), (2, 0)]:
+            kb._add(kb.safe, cell)
+            kb._log_safe(cell)
+        planner = PathPlanner(kb)
+        assert len(planner.plan((0, 0), Agent.RIGHT, (2, 0))) == 8
+        kb.restore(mark)
+        # Another branch opens as many cells, so the log is no shorter than before
+        for cell in [(1, 0), (2, 0), (3, 0), (4, 0), (4, 1), (4, 2)]:
+            kb._add(kb.safe, cell)
+            kb._log_safe(cell)
+        assert planner.plan((0, 0), Agent.RIGHT, (2, 0)) == [Agent.BOTTOM, Agent.FORWARD, Agent.FORWARD]
+
+    def test_incremental_replan_is_cheaper(self):
+        kb = KnowledgeBase(30)
+        open_cells(kb, [(i, j) for i in range(30) for j in range(30) if (i, j) != (0, 0)])
+        planner = PathPlanner(kb)
+        path = planner.plan((0, 0), Agent.RIGHT, (29, 29))
+        first = planner.expanded
+        planner.plan((0, 1), Agent.RIGHT, (29, 29))
+        assert planner.expanded - first < first / 10
+        assert len(path) == 58 + 1
+
+class TestExplorerPolicy:
+    def test_explores_without_dying(self):
+        for seed in range(20):
+            controller = GameController(6, seed, knowledge_base=LogicKnowledgeBase(6))
+            result = controller.run_episode(ExplorerPolicy(), max_steps=300)
+            assert result.outcome != 'lose'
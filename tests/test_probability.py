@@ -0,0 +1,55 @@
+import pytest
+from wumpus.cell import Cell
+from wumpus.knowledge_base import KnowledgeBase
+from wumpus.probability import HazardProbability
+from .helpers import percepts
+
+
+class TestHazardProbability:
+    def test_classic_two_breezes(self):
+        # Textbook layout: breezes at (0,1) and (1,0), start quiet
+        kb = KnowledgeBase(4)
+        kb.update_knowledge((0, 0), percepts())
+        kb.update_knowledge((0, 1), percepts(Cell.BREEZE))
+        kb.update_knowledge((1, 0), percepts(Cell.BREEZE))
+        probs = HazardProbability(pit_prior=0.2).pit_probabilities(kb)
+        assert probs[(1, 1)] == pytest.approx(0.86, abs=0.01)
+        assert probs[(0, 2)] == pytest.approx(0.31, abs=0.01)
+        assert probs[(2, 0)] == pytest.approx(0.31, abs=0.01)
+
+    def test_quiet_neighbours_are_zero(self):
+        kb = KnowledgeBase(4)
+        kb.update_knowledge((0, 0), percepts())
+        probs = HazardProbability().probabilities(kb)
+        assert probs[(0, 1)][0] == 0.0
+        assert probs[(1, 0)][0] == 0.0
+
+    def test_single_wumpus_candidates(self):
+        kb = KnowledgeBase(4)
+        kb.update_knowledge((0, 0), percepts())
+        kb.update_knowledge((0, 1), percepts(Cell.STENCH))
+        probs = HazardProbability().wumpus_probabilities(kb)
+        assert probs[(1, 1)] == pytest.approx(0.5)
+        assert probs[(0, 2)] == pytest.approx(0.5)
+        assert probs[(1, 0)] == 0.0
+
+    def test_components_are_memoized(self):
+        engine = HazardProbability()
+        kb = KnowledgeBase(8)
+        kb.update_knowledge((0, 0), percepts())
+        kb.update_knowledge((0, 1), percepts(Cell.BREEZE))
+        engine.pit_probabilities(kb)
+        misses = engine.cache_misses
+        engine.pit_probabilities(kb)
+        assert engine.cache_misses == misses
+        assert engine.cache_hits >= 1
+
+class TestRiskAwarePolicy:
+    def test_gambles_only_below_threshold(self):
+        from wumpus.agent import Agent
+        from wumpus.policy import RiskAwarePolicy
+        kb = KnowledgeBase(4)
+        kb.update_knowledge((0, 0), percepts(Cell.BREEZE))
+        # Each neighbour holds a pit with probability 0.2 / 0.36
+        assert RiskAwarePolicy(max_risk=0.5).choose_action(percepts(Cell.BREEZE), kb, (0, 0), Agent.RIGHT) is None
+        assert RiskAwarePolicy(max_risk=0.6).choose_action(percepts(Cell.BREEZE), kb, (0, 0), Agent.RIGHT) == Agent.FORWARD
@@ -0,0 +1,36 @@
+import tracemalloc
+import pytest
+from wumpus.agent import Agent
+from wumpus.game_controller import GameController
+from wumpus.policy import LogicPolicy
+from wumpus.profiling import Stats
+
+class TestStats:
+    def test_disabled_by_default(self):
+        controller = GameController(4, seed=1)
+        controller.run_episode(LogicPolicy(), max_steps=10)
+        assert controller.stats is None
+        assert controller.agent.kb.stats is None
+
+    def test_collects_phases_and_counters(self):
+        controller = GameController(5, seed=3)
+        stats = controller.enable_profiling()
+        result = controller.run_episode(LogicPolicy(), max_steps=20)
+        assert stats.calls['act'] == result.steps
+        assert stats.calls['end_check'] == result.steps
+        # run_episode senses once before the first action
+        assert stats.calls['sense'] == stats.calls['infer'] == result.steps + 1
+        assert stats.counters['cells_rescanned'] > 0
+        assert stats.peak['possible_pits'] >= stats.last['possible_pits']
+        assert stats.last['safe'] == len(controller.agent.kb.safe)
+
+    def test_render_timing_and_memory(self, capsys):
+        controller = GameController(4, seed=2)
+        with controller.enable_profiling(track_memory=True) as stats:
+            assert tracemalloc.is_tracing()
+            controller.start_game()
+            controller.process_action(Agent.RIGHT)
+            assert stats.calls['render'] == 2
+            assert stats.peak_memory is not None
+            assert "render" in stats.report()
+        assert not tracemalloc.is_tracing()
@@ -0,0 +1,72 @@
+import io
+import re
+from wumpus.agent import Agent
+from wumpus.renderer import TerminalRenderer
+
+ESCAPE = re.compile(r'\x1b\[(?:(\d+);(\d+))?([HJK])|\x1b\[2J')
+
+
+def play(stream: str, height: int = 60, width: int = 200) -> list[str]:
+    """Apply the renderer's ANSI subset to a blank screen"""
+    screen = [[' '] * width for _ in range(height)]
+    row = col = 0
+    pos = 0
+    while pos < len(stream):
+        match = ESCAPE.match(stream, pos)
+        if match:
+            if match.group(0) == '\x1b[2J':
+                screen = [[' '] * width for _ in range(height)]
+            elif match.group(3) == 'H':
+                row, col = (int(match.group(1)) - 1, int(match.group(2)) - 1) if match.group(1) else (0, 0)
+            elif match.group(3) == 'K':
+                screen[row][col:] = [' '] * (width - col)
+            else:
+                screen[row][col:] = [' '] * (width - col)
+                for r in range(row + 1, height):
+                    screen[r] = [' '] * width
+            pos = match.end()
+            continue
+        char = stream[pos]
+        if char == '\n':
+            row, col = row + 1, 0
+        else:
+            screen[row][col] = char
+            col += 1
+        pos += 1
+    return [''.join(line).rstrip() for line in screen]
+
+
+class TestTerminalRenderer:
+    def test_diff_frames_rebuild_the_screen(self):
+        agent = Agent(30, seed=4)
+        out = io.StringIO()
+        renderer = TerminalRenderer(agent, out, rows=9, cols=9, ansi=True)
+        renderer.render()
+        first = renderer.cells_written
+        agent.make_move(Agent.BOTTOM)
+        agent.make_move(Agent.FORWARD)
+        agent.kb.visited.add(agent.pos)
+        renderer.render()
+        assert renderer.cells_written - first <= 2
+        expected = [line.rstrip() for line in renderer.frame()]
+        assert play(out.getvalue())[:len(expected)] == expected
+
+    def test_viewport_follows_the_agent(self):
+        agent = Agent(50, seed=1)
+        renderer = TerminalRenderer(agent, io.StringIO(), rows=11, cols=11, ansi=True)
+        assert renderer.viewport() == (0, 0)
+        agent.pos = (25, 30)
+        assert renderer.viewport() == (20, 25)
+        agent.pos = (49, 49)
+        assert renderer.viewport() == (39, 39)
+        assert renderer.frame()[-1].split()[-1] == 'A'
+
+    def test_full_redraw_without_tty(self):
+        agent = Agent(6, seed=2)
+        out = io.StringIO()
+        renderer = TerminalRenderer(agent, out, rows=20, cols=20)
+        renderer.render()
+        renderer.render()
+        assert '\x1b' not in out.getvalue()
+        assert out.getvalue().count('Score: 0') == 2
+        assert renderer.rows == 6
@@ -0,0 +1,73 @@
+import numpy as np
+from wumpus.game_controller import GameController
+from wumpus.policy import LogicPolicy
+from wumpus.results import ResultStore, ResultWriter, aggregate, decode_rows, format_table
+from wumpus.tournament import make_shards, run_tournament, summarize
+
+
+def row(seed, policy='logic', n=4, score=0, steps=1, reason=None):
+    return {'seed': seed, 'n': n, 'policy': policy, 'outcome': None, 'score': score, 'steps': steps,
+            'reason': reason, 'arrow_used': seed % 2 == 0, 'wumpus_killed': False, 'bound': 1480}
+
+
+class TestResultStore:
+    def test_round_trip(self, tmp_path):
+        store = ResultStore(str(tmp_path))
+        rows = [row(0, 'logic', reason='gold'), row(1, 'random', n=5, score=-1003, reason='pit')]
+        path = store.write('part', rows)
+        stored = decode_rows(store.read(path))
+        assert [{k: r[k] for k in stored[0]} for r in rows] == stored
+        assert store.read(path, ['score'])['score'].dtype == np.int32
+
+    def test_writer_appends_chunks(self, tmp_path):
+        store = ResultStore(str(tmp_path))
+        with ResultWriter(store, chunk_rows=4) as writer:
+            for seed in range(10):
+                writer.add(row(seed))
+        assert len(store.chunks()) == 3 and len(store) == 10
+        with ResultWriter(store, chunk_rows=4) as writer:
+            writer.add(row(10))
+        assert len(store.chunks()) == 4 and len(store) == 11
+
+
+class TestAggregate:
+    def test_matches_numpy_over_chunks(self, tmp_path):
+        rng = np.random.default_rng(0)
+        store = ResultStore(str(tmp_path))
+        writer = ResultWriter(store, chunk_rows=300)
+        scores = {'logic': [], 'risk': []}
+        reasons = (None, 'gold', 'pit', 'wumpus')
+        for seed in range(1000):
+            policy = ('logic', 'risk')[seed % 2]
+            score = int(rng.integers(-1100, 1000))
+            scores[policy].append(score)
+            writer.add(row(seed, policy, score=score, reason=reasons[seed % 4]))
+        writer.close()
+
+        groups = aggregate(store, ['policy'])
+        for policy, values in scores.items():
+            group = groups[(policy,)]
+            assert group.games == 500
+            assert group.mean('score') == np.mean(values)
+            for q in (0, 5, 37.5, 50, 95, 100):
+                assert np.isclose(group.percentile('score', q), np.percentile(values, q))
+        assert groups[('logic',)].rate('gold') == 0.0 and groups[('risk',)].rate('gold') == 0.5
+        assert len(list(format_table(groups, ['policy'], [50]))) == 3
+
+    def test_episode_reason(self):
+        reasons = set()
+        for seed in range(30):
+            result = GameController(4, seed).run_episode(LogicPolicy(), max_steps=100)
+            assert (result.reason == 'gold') == (result.outcome == 'win')
+            assert (result.reason in ('pit', 'wumpus')) == (result.outcome == 'lose')
+            reasons.add(result.reason)
+        assert 'gold' in reasons
+
+    def test_tournament_npz(self, tmp_path):
+        out = str(tmp_path)
+        shards = make_shards(['logic', 'random'], [4], range(0, 6), 3)
+        assert run_tournament(shards, out, workers=1, max_steps=50, fmt='npz') == 4
+        assert run_tournament(shards, out, workers=1, max_steps=50, fmt='npz') == 0
+        totals = summarize(out, shards, fmt='npz')
+        run_tournament(shards, str(tmp_path / 'jsonl'), workers=1, max_steps=50)
+        assert totals == summarize(str(tmp_path / 'jsonl'), shards)
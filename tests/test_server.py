@@ -0,0 +1,90 @@
+import asyncio
+import json
+from wumpus.game_controller import GameController
+from wumpus.server import GameServer, observation
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestGameServer:
+    def test_session_matches_a_local_game(self):
+        server = GameServer()
+        reply = server.handle({'op': 'new', 'n': 5, 'seed': 3, 'id': 1})
+        assert reply['ok'] and reply['id'] == 1
+        key = reply['session']
+        local = GameController(5, 3)
+        local.agent.update_knowledge()
+        for action in ('bottom', 'forward', 'right', 'forward', 'left', 'shoot'):
+            reply = server.handle({'op': 'act', 'session': key, 'action': action})
+            local.step(server._action(action))
+            assert {k: v for k, v in reply.items() if k != 'ok'} == observation(local)
+            if local.game_state is not None:
+                break
+        assert server.handle({'op': 'observe', 'session': key})['steps'] == local.steps
+
+    def test_errors(self):
+        server = GameServer(max_size=8)
+        assert server.handle({'op': 'nope'})['error'] == "unknown op 'nope'"
+        assert not server.handle({'op': 'act', 'session': 'missing', 'action': 'forward'})['ok']
+        assert not server.handle({'op': 'new', 'n': 9})['ok']
+        for seed in (-1, True, 1.5, '3'):
+            reply = server.handle({'op': 'new', 'seed': seed})
+            assert reply['error'] == "seed must be a non-negative integer"
+        key = server.handle({'op': 'new'})['session']
+        assert not server.handle({'op': 'act', 'session': key, 'action': 'jump'})['ok']
+        assert server.handle({'op': 'close', 'session': key}) == {'ok': True}
+        assert not server.sessions
+
+    def test_idle_sessions_are_evicted(self):
+        clock = FakeClock()
+        server = GameServer(max_sessions=2, idle_timeout=10, clock=clock)
+        old = server.handle({'op': 'new'})['session']
+        clock.now = 5
+        kept = server.handle({'op': 'new'})['session']
+        clock.now = 12
+        server.handle({'op': 'observe', 'session': kept})
+        # Full, so the idle session makes room
+        assert server.handle({'op': 'new'})['ok']
+        assert old not in server.sessions and kept in server.sessions
+        assert server.evicted == 1
+        assert server.handle({'op': 'new'})['error'] == "server is full"
+
+    def test_tcp_clients_share_the_loop(self):
+        async def client(port, seed):
+            reader, writer = await asyncio.open_connection('127.0.0.1', port)
+            replies = []
+            for request in ({'op': 'new', 'n': 4, 'seed': seed},
+                            {'op': 'act', 'action': 'forward'}, {'op': 'close'}):
+                if replies:
+                    request['session'] = replies[0]['session']
+                writer.write(json.dumps(request).encode() + b'\n')
+                await writer.drain()
+                replies.append(json.loads(await reader.readline()))
+            for bad in (b'\xff\xfe\n', b'not json\n'):
+                writer.write(bad)
+                replies.append(json.loads(await reader.readline()))
+            writer.close()
+            await writer.wait_closed()
+            return replies
+
+        async def run():
+            server = GameServer()
+            listener = await server.start(port=0)
+            port = listener.sockets[0].getsockname()[1]
+            try:
+                results = await asyncio.gather(*(client(port, seed) for seed in range(20)))
+            finally:
+                await server.stop()
+            return server, results
+
+        server, results = asyncio.run(run())
+        for new, act, close, *bad in results:
+            assert new['ok'] and act['ok'] and act['steps'] == 1 and close == {'ok': True}
+            assert bad == [{'ok': False, 'error': "request must be a JSON object"}] * 2
+        assert not server.sessions
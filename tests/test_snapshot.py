@@ -0,0 +1,95 @@
+import copy
+from wumpus.cell import Cell
+from wumpus.game_controller import GameController
+from wumpus.logic import LogicKnowledgeBase
+from wumpus.mcts import MCTSPolicy
+from wumpus.policy import RandomPolicy
+
+
+def belief(kb):
+    return (set(kb.visited), set(kb.safe), list(kb.safe_log), set(kb.possible_pits),
+            set(kb.possible_wumpus), set(kb.definite_pits), set(kb.definite_wumpus),
+            kb.wumpus_alive, kb.arrow_used)
+
+
+def agent_state(agent):
+    return (agent.pos, agent.orientation, agent.score, agent.alive, agent.has_gold,
+            agent.has_arrow, dict(agent.sensors), belief(agent.kb))
+
+
+class TestSnapshot:
+    def test_restore_undoes_a_rollout(self):
+        for seed in range(20):
+            controller = GameController(5, seed)
+            controller.run_episode(RandomPolicy(seed), max_steps=5)
+            before = agent_state(controller.agent), controller.steps
+            mark = controller.snapshot()
+            controller.run_episode(RandomPolicy(seed + 100), max_steps=60)
+            controller.restore(mark)
+            assert (agent_state(controller.agent), controller.steps) == before
+            assert controller.agent.kb._trail is None
+
+    def test_nested_snapshots(self):
+        controller = GameController(6, 3)
+        controller.agent.update_knowledge()
+        outer = controller.snapshot()
+        controller.step(controller.agent.BOTTOM)
+        controller.step(controller.agent.FORWARD)
+        middle_state = agent_state(controller.agent)
+        inner = controller.snapshot()
+        controller.step(controller.agent.RIGHT)
+        controller.step(controller.agent.FORWARD)
+        controller.restore(inner)
+        assert agent_state(controller.agent) == middle_state
+        controller.restore(outer)
+        assert controller.agent.pos == (0, 0) and controller.steps == 0
+
+    def test_back_to_back_snapshots(self):
+        controller = GameController(6, 3)
+        controller.agent.update_knowledge()
+        before = agent_state(controller.agent)
+        outer = controller.snapshot()
+        inner = controller.snapshot()
+        controller.restore(inner)
+        controller.step(controller.agent.BOTTOM)
+        controller.step(controller.agent.FORWARD)
+        controller.restore(outer)
+        assert agent_state(controller.agent) == before and controller.steps == 0
+        assert controller.agent.kb._trail is None
+
+    def test_search_inside_a_snapshot(self):
+        controller = GameController(5, 2)
+        agent = controller.agent
+        agent.update_knowledge()
+        before = agent_state(agent)
+        mark = controller.snapshot()
+        MCTSPolicy(iterations=20, seed=0).choose_action(agent.sensors, agent.kb, agent.pos, agent.orientation)
+        controller.step(agent.BOTTOM)
+        controller.step(agent.FORWARD)
+        controller.restore(mark)
+        assert agent_state(agent) == before
+
+    def test_grab_leaves_the_shared_world_alone(self):
+        controller = GameController(4, 8)
+        world = controller.agent.world_manager
+        gold = next((i, j) for i in range(4) for j in range(4) if world.get_pos((i, j)).check_flag(Cell.GOLD))
+        mark = controller.snapshot()
+        controller.agent.pos = gold
+        controller.step(controller.agent.GRAB)
+        assert controller.game_state == 'win'
+        assert world.get_pos(gold).check_flag(Cell.GOLD)
+        controller.restore(mark)
+        assert controller.agent.gold_at(gold) and controller.game_state is None
+
+    def test_logic_knowledge_base_solver_is_restored(self):
+        for seed in range(10):
+            controller = GameController(5, seed, knowledge_base=LogicKnowledgeBase(5))
+            controller.run_episode(RandomPolicy(seed), max_steps=4)
+            kb = controller.agent.kb
+            reference = copy.deepcopy(kb)
+            mark = controller.snapshot()
+            controller.run_episode(RandomPolicy(seed + 1), max_steps=40)
+            controller.restore(mark)
+            assert belief(kb) == belief(reference)
+            assert kb.solver.clauses == reference.solver.clauses
+            assert kb.frontier == reference.frontier
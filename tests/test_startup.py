@@ -0,0 +1,52 @@
+import os
+import subprocess
+import sys
+import numpy as np
+import pytest
+import wumpus
+from wumpus import pcg64
+from wumpus.worldmanager import WorldManager
+from wumpus.world_spec import WorldSpec
+
+WORKER = """
+import sys
+import wumpus
+from wumpus import GameController, KnowledgeBase, LogicPolicy
+GameController(8, 3).run_episode(LogicPolicy(), max_steps=100)
+print(' '.join(m for m in ('numpy', 'argparse', 'tracemalloc', 'wumpus.cli_view', 'wumpus.main')
+               if m in sys.modules))
+"""
+
+
+class TestPureGenerator:
+    def test_matches_numpy(self):
+        bounds = [1, 2, 3, 10, 17, 100, 2 ** 32 - 1, 2 ** 32, 2 ** 32 + 1, 2 ** 40, 2 ** 63 - 1]
+        for seed in (0, 1, 42, 2 ** 32 + 7, 2 ** 100 + 3):
+            expected = np.random.default_rng(seed)
+            actual = pcg64.default_rng(seed)
+            for high in bounds * 5:
+                assert actual.integers(high) == int(expected.integers(high))
+
+    def test_same_worlds_as_numpy(self):
+        for n, spec in ((4, None), (9, None), (32, WorldSpec(pit_density=0.2, start_clearance=2))):
+            for seed in range(30):
+                pure = WorldManager.sample_layout(n, pcg64.default_rng(seed), spec)
+                assert pure == WorldManager.sample_layout(n, np.random.default_rng(seed), spec)
+
+    def test_rejects_negative_seeds(self):
+        with pytest.raises(ValueError):
+            pcg64.default_rng(-1)
+
+
+class TestLazyImport:
+    def test_worker_imports_stay_small(self):
+        out = subprocess.run([sys.executable, '-c', WORKER], capture_output=True, text=True,
+                             check=True, env={**os.environ, 'PYTHONPATH': os.pathsep.join(sys.path)})
+        assert out.stdout.split() == []
+
+    def test_public_names(self):
+        assert wumpus.KnowledgeBase.__name__ == 'KnowledgeBase'
+        assert set(wumpus.__all__) <= set(dir(wumpus))
+        assert callable(wumpus.main)
+        with pytest.raises(AttributeError):
+            wumpus.NoSuchThing
@@ -0,0 +1,36 @@
+from wumpus.knowledge_base import KnowledgeBase
+from wumpus.topology import DELTAS, MAX_TABLE_CELLS, Topology, get_topology
+
+
+def brute_adjacent(n, pos):
+    i, j = pos
+    return tuple((a, b) for a, b in ((i - 1, j), (i + 1, j), (i, j - 1), (i, j + 1))
+                 if 0 <= a < n and 0 <= b < n)
+
+
+class TestTopology:
+    def test_tables_match_direct_computation(self):
+        n = 5
+        topology = get_topology(n)
+        assert topology.tabled
+        for i in range(n):
+            for j in range(n):
+                assert topology.adjacent((i, j)) == brute_adjacent(n, (i, j))
+                for o, (di, dj) in enumerate(DELTAS):
+                    inside = 0 <= i + di < n and 0 <= j + dj < n
+                    assert topology.forward_pos((i, j), o) == ((i + di, j + dj) if inside else None)
+        assert topology.forward_pos((2, 2), 4) is None
+
+    def test_shared_per_size(self):
+        assert get_topology(7) is get_topology(7)
+        assert KnowledgeBase(7).topology is get_topology(7)
+        # Lookups hand out the same tuples rather than building new ones
+        assert get_topology(7).adjacent((3, 3)) is get_topology(7).adjacent((3, 3))
+
+    def test_huge_grids_are_computed_on_the_fly(self):
+        n = 10 ** 9
+        topology = Topology(n)
+        assert n * n > MAX_TABLE_CELLS and not topology.tabled
+        assert topology.adjacent((0, n - 1)) == ((1, n - 1), (0, n - 2))
+        assert topology.forward_pos((5, n - 1), 1) is None
+        assert topology.forward_pos((5, 5), 2) == (6, 5)
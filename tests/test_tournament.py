@@ -0,0 +1,30 @@
+import os
+import pytest
+from wumpus.tournament import Shard, make_shards, run_tournament, summarize
+
+class TestTournament:
+    def test_make_shards(self):
+        shards = make_shards(['logic'], [4, 5], range(0, 25), 10)
+        assert shards[0] == Shard('logic', 4, 0, 10)
+        assert shards[2] == Shard('logic', 4, 20, 25)
+        assert len(shards) == 6
+        assert shards == make_shards(['logic'], [4, 5], range(0, 25), 10)
+
+    def test_resume_skips_finished_shards(self, tmp_path):
+        out = str(tmp_path)
+        shards = make_shards(['logic', 'random'], [4], range(0, 6), 3)
+        assert run_tournament(shards, out, workers=2, max_steps=50) == 4
+        assert run_tournament(shards, out, workers=2, max_steps=50) == 0
+
+        os.remove(shards[1].path(out))
+        assert run_tournament(shards, out, workers=1, max_steps=50) == 1
+        totals = summarize(out, shards)
+        assert totals[('logic', 4)]['games'] == 6
+        assert totals[('random', 4)]['games'] == 6
+
+    def test_results_are_deterministic(self, tmp_path):
+        shards = make_shards(['random'], [4], range(0, 5), 5)
+        run_tournament(shards, str(tmp_path / 'a'), workers=1, max_steps=50)
+        run_tournament(shards, str(tmp_path / 'b'), workers=2, max_steps=50)
+        first = open(shards[0].path(str(tmp_path / 'a'))).read()
+        assert first == open(shards[0].path(str(tmp_path / 'b'))).read()
@@ -0,0 +1,103 @@
+import pytest
+from wumpus.game_controller import GameController
+from wumpus.policy import RandomPolicy
+from wumpus.trace_log import TraceReader, TraceRecorder
+
+
+def record_games(path, seeds, max_steps=60, index_every=8):
+    results = []
+    with TraceRecorder(path, index_every=index_every) as recorder:
+        for seed in seeds:
+            controller = GameController(5, seed)
+            controller.record_to(recorder)
+            results.append(controller.run_episode(RandomPolicy(seed), max_steps=max_steps))
+    return results
+
+
+def agent_state(controller):
+    agent, kb = controller.agent, controller.agent.kb
+    return (controller.steps, controller.game_state, agent.pos, agent.orientation, agent.score,
+            agent.has_arrow, agent.collected_gold, dict(agent.sensors), set(kb.visited), set(kb.safe),
+            list(kb.safe_log), set(kb.possible_pits), set(kb.possible_wumpus), kb.wumpus_alive)
+
+
+class TestTraceLog:
+    def test_replay_matches_the_recorded_game(self, tmp_path):
+        path = str(tmp_path / 'games.trace')
+        results = record_games(path, range(6))
+        reader = TraceReader(path)
+        assert len(reader) == 6
+        for game, result in enumerate(results):
+            assert reader.game(game) == (5, game)
+            assert reader.outcome(game) == result.outcome
+            steps = list(reader.steps(game))
+            assert len(steps) == result.steps
+            assert sum(s.score_delta for s in steps) == result.score
+            controller = reader.replay(game)
+            assert controller.agent.score == result.score
+            assert controller.game_state == result.outcome
+
+    def test_seek_to_step(self, tmp_path):
+        path = str(tmp_path / 'games.trace')
+        record_games(path, [1], max_steps=50, index_every=4)
+        reader = TraceReader(path)
+        steps = list(reader.steps(0))
+        for k in (0, 3, 4, 5, len(steps) - 1):
+            assert reader.step(0, k) == steps[k]
+        with pytest.raises(IndexError):
+            reader.step(0, len(steps))
+
+        partial = reader.replay(0, stop=5)
+        assert partial.steps == 5
+        assert partial.agent.score == sum(s.score_delta for s in steps[:5])
+
+    def test_replay_resumes_from_checkpoints(self, tmp_path, monkeypatch):
+        path = str(tmp_path / 'games.trace')
+        for seed in range(4):
+            record_games(path, [seed], max_steps=60, index_every=4)
+        reader = TraceReader(path)
+        for game in range(4):
+            total = len(list(reader.steps(game)))
+            for stop in (0, 3, 4, 9, total):
+                full = reader.replay(game, stop, make_controller=GameController)
+                resumed = reader.replay(game, stop)
+                assert agent_state(resumed) == agent_state(full)
+        assert reader.checkpoint(0, 9)[0] == 8 and reader.checkpoint(0, 3) == (0, None)
+
+        stepped = []
+        original = GameController.step
+
+        def step(controller, action):
+            stepped.append(action)
+            return original(controller, action)
+        monkeypatch.setattr(GameController, 'step', step)
+        reader.replay(0, 9)
+        assert len(stepped) == 1  # From the checkpoint at step 8
+
+    def test_seeds_beyond_int64(self, tmp_path):
+        path = str(tmp_path / 'games.trace')
+        seed = 2 ** 63 + 5
+        with TraceRecorder(path) as recorder:
+            GameController(4, seed).record_to(recorder)
+            with pytest.raises(ValueError):
+                recorder.begin(4, 2 ** 64)
+        assert TraceReader(path).game(0) == (4, seed)
+
+    def test_appending_continues_game_ids(self, tmp_path):
+        path = str(tmp_path / 'games.trace')
+        record_games(path, [1])
+        record_games(path, [2, 3])
+        reader = TraceReader(path)
+        assert [reader.game(g)[1] for g in range(len(reader))] == [1, 2, 3]
+
+    def test_divergence_is_reported(self, tmp_path):
+        path = str(tmp_path / 'games.trace')
+        record_games(path, [4], max_steps=30)
+        reader = TraceReader(path)
+        with pytest.raises(ValueError):
+            reader.replay(0, make_controller=lambda n, seed: GameController(n, seed + 1))
+
+    def test_unseeded_games_cannot_be_recorded(self, tmp_path):
+        with TraceRecorder(str(tmp_path / 'games.trace')) as recorder:
+            with pytest.raises(ValueError):
+                GameController(4).record_to(recorder)
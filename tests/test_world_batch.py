@@ -0,0 +1,31 @@
+import numpy as np
+import pytest
+from wumpus.array_world import ArrayWorldManager
+from wumpus.cell import Cell
+from wumpus.world_batch import WorldBatch, world_rng
+
+class TestWorldBatch:
+    def test_shapes(self):
+        batch = WorldBatch(5, base_seed=7, count=3)
+        assert len(batch) == 3
+        for plane in batch.planes.values():
+            assert plane.shape == (3, 5, 5)
+        assert (batch.planes[Cell.WUMPUS].sum(axis=(1, 2)) == 1).all()
+
+    def test_split_invariance(self):
+        whole = WorldBatch(6, base_seed=11, count=8)
+        first = WorldBatch(6, base_seed=11, count=3)
+        rest = WorldBatch(6, base_seed=11, count=5, start=3)
+        for flag, plane in whole.planes.items():
+            assert np.array_equal(plane, np.concatenate([first.planes[flag], rest.planes[flag]]))
+
+    def test_matches_single_world(self):
+        batch = WorldBatch(6, base_seed=5, count=4)
+        single = ArrayWorldManager(6, rng=world_rng(5, 2))
+        for flag in ArrayWorldManager.PLANES:
+            assert np.array_equal(batch.world(2).planes[flag], single.planes[flag])
+
+    def test_start_cell_is_clear(self):
+        batch = WorldBatch(4, base_seed=0, count=50)
+        for flag in (Cell.WUMPUS, Cell.PIT, Cell.GOLD):
+            assert not batch.planes[flag][:, 0, 0].any()
@@ -0,0 +1,42 @@
+import numpy as np
+import pytest
+from wumpus.array_world import ArrayWorldManager
+from wumpus.cell import Cell
+from wumpus.world_spec import WorldSpec, sample_cells
+
+class TestWorldSpec:
+    def test_default_matches_classic_counts(self):
+        spec = WorldSpec()
+        assert spec.pit_count(10) == 2
+        assert spec.excluded_cells(10) == [(0, 0)]
+
+    def test_pit_density_scales_with_area(self):
+        spec = WorldSpec(pit_density=0.1)
+        assert spec.pit_count(10) == round(0.1 * 99)
+        assert WorldSpec(num_pits=3, pit_density=0.5).pit_count(10) == 3
+
+    def test_start_clearance(self):
+        assert set(WorldSpec(start_clearance=1).excluded_cells(4)) == {(0, 0), (0, 1), (1, 0)}
+
+    def test_world_respects_spec(self):
+        spec = WorldSpec(num_pits=5, num_wumpus=2, num_gold=3, start_clearance=2)
+        world = ArrayWorldManager(8, seed=4, spec=spec)
+        assert world.planes[Cell.PIT].sum() == 5
+        assert world.planes[Cell.WUMPUS].sum() == 2
+        assert world.planes[Cell.GOLD].sum() == 3
+        for i, j in spec.excluded_cells(8):
+            for flag in (Cell.PIT, Cell.WUMPUS, Cell.GOLD):
+                assert not world.planes[flag][i, j]
+
+class TestSampleCells:
+    def test_distinct_and_reproducible(self):
+        first = sample_cells(2048, 50, np.random.default_rng(9), [(0, 0)])
+        again = sample_cells(2048, 50, np.random.default_rng(9), [(0, 0)])
+        assert first == again
+        assert len(set(first)) == 50
+        assert (0, 0) not in first
+
+    def test_exhausts_small_grid(self):
+        cells = sample_cells(3, 20, np.random.default_rng(0), [(0, 0), (1, 1)])
+        assert len(cells) == 7
+        assert set(cells) == {(i, j) for i in range(3) for j in range(3)} - {(0, 0), (1, 1)}